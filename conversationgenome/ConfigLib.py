@@ -14,6 +14,20 @@ class c:
             "number_of_task_bundles": 10,
             "number_of_task_per_bundle": 5,
             "minimum_number_of_tasks": 10,
+            # Miner responses of a task formatted/uploaded at once, and the time allowed for all of them
+            "response_concurrency": 6,
+            "response_deadline": 120,
+            # Ready task bundles reserved in the background ahead of forward(). 0 reserves them inline
+            "task_bundle_queue_depth": 0,
+            "task_bundle_queue_ttl": 600,
+            "task_bundle_queue_workers": 2,
+            "task_bundle_queue_wait": 300,
+            # Independent LLM calls made at once while setting up task bundles
+            "setup_llm_concurrency": 8,
+            # Score updates appended to the state log before the next full state snapshot
+            "state_snapshot_every": 500,
+            # Prefer miners that have not been sent a task yet in the current step
+            "exclude_queried_uids": False,
         },
         "system": {
             "mode": 'test',
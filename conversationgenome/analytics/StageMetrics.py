@@ -0,0 +1,290 @@
+import asyncio
+import functools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Optional
+
+import numpy as np
+
+from conversationgenome.ConfigLib import c
+from conversationgenome.mock.MockBt import MockBt
+from conversationgenome.utils.Utils import Utils
+
+bt = None
+try:
+    import bittensor as bt
+except:
+    bt = MockBt()
+
+otel_trace = None
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:
+    otel_trace = None
+
+# Upper bounds of the histogram buckets, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Stages being timed in the current context, so that a call nested in the same stage is not counted twice
+_ACTIVE_STAGES: ContextVar[tuple] = ContextVar("active_stages", default=())
+
+
+class StageHistogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS, window=1000):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.errors = 0
+        self.samples = deque(maxlen=window)
+
+    def observe(self, seconds: float, error: bool = False) -> None:
+        self.count += 1
+        self.sum += seconds
+        if error:
+            self.errors += 1
+        self.samples.append(seconds)
+        for idx, upper_bound in enumerate(self.buckets):
+            if seconds <= upper_bound:
+                self.bucket_counts[idx] += 1
+                break
+
+
+class StageMetrics:
+    """
+    Times the stages of the validator loop (reserve, setup, LLM calls, dispatch, format, score, upload,
+    update_scores, ...) and aggregates the durations into one histogram per stage.
+
+    Use time(stage) as a context manager, or the time_stage() and timed_stage() helpers on the process-wide
+    instance. A stage entered again inside itself (e.g. the async LLM call running the blocking one in a thread)
+    is counted once. Errors raised in a stage are counted too.
+
+    Percentiles come from the last `window` durations of each stage. render_prometheus() returns the histograms
+    in the Prometheus text format, see MetricsServer. If a tracer is given (OpenTelemetry), every stage is also
+    recorded as a span named cgp.<stage>.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, window=1000, tracer=None):
+        self.buckets = tuple(buckets)
+        self.window = window
+        self.tracer = tracer
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float, error: bool = False) -> None:
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = StageHistogram(self.buckets, self.window)
+            histogram.observe(seconds, error)
+
+    @contextmanager
+    def time(self, stage: str, **attributes):
+        active_stages = _ACTIVE_STAGES.get()
+        if stage in active_stages:
+            yield
+            return
+
+        token = _ACTIVE_STAGES.set(active_stages + (stage,))
+        span = self.tracer.start_as_current_span(f"cgp.{stage}", attributes=attributes or None) if self.tracer else None
+        started = time.perf_counter()
+        error = False
+        try:
+            if span is None:
+                yield
+            else:
+                with span:
+                    yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - started, error)
+            _ACTIVE_STAGES.reset(token)
+
+    def stats(self) -> dict:
+        """
+        Returns {stage: {count, errors, p50, p95, mean, total}}, durations in seconds.
+        """
+        out = {}
+        with self._lock:
+            histograms = {stage: (h.count, h.errors, h.sum, list(h.samples)) for stage, h in self.histograms.items()}
+        for stage, (count, errors, total, samples) in sorted(histograms.items()):
+            if not samples:
+                continue
+            values = np.array(samples, dtype=np.float64)
+            out[stage] = {
+                "count": count,
+                "errors": errors,
+                "p50": round(float(np.percentile(values, 50)), 4),
+                "p95": round(float(np.percentile(values, 95)), 4),
+                "mean": round(float(np.mean(values)), 4),
+                "total": round(total, 4),
+            }
+        return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms = {}
+
+    def render_prometheus(self) -> str:
+        lines = [
+            "# HELP cgp_stage_duration_seconds Duration of the validator loop stages.",
+            "# TYPE cgp_stage_duration_seconds histogram",
+        ]
+        error_lines = [
+            "# HELP cgp_stage_errors_total Stage runs that raised an error.",
+            "# TYPE cgp_stage_errors_total counter",
+        ]
+        with self._lock:
+            for stage, histogram in sorted(self.histograms.items()):
+                label = stage.replace("\\", "\\\\").replace('"', '\\"')
+                cumulative = 0
+                for upper_bound, bucket_count in zip(histogram.buckets, histogram.bucket_counts):
+                    cumulative += bucket_count
+                    lines.append(f'cgp_stage_duration_seconds_bucket{{stage="{label}",le="{upper_bound}"}} {cumulative}')
+                lines.append(f'cgp_stage_duration_seconds_bucket{{stage="{label}",le="+Inf"}} {histogram.count}')
+                lines.append(f'cgp_stage_duration_seconds_sum{{stage="{label}"}} {histogram.sum}')
+                lines.append(f'cgp_stage_duration_seconds_count{{stage="{label}"}} {histogram.count}')
+                error_lines.append(f'cgp_stage_errors_total{{stage="{label}"}} {histogram.errors}')
+        return "\n".join(lines + error_lines) + "\n"
+
+
+class MetricsServer:
+    """
+    Serves the stage histograms for Prometheus to scrape on http://<host>:<port>/metrics.
+    """
+
+    def __init__(self, metrics: StageMetrics, host: str = "127.0.0.1", port: int = 9100):
+        self.metrics = metrics
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> "MetricsServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                payload = server.metrics.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+
+_STAGE_METRICS: Optional[StageMetrics] = None
+_STAGE_METRICS_LOCK = threading.Lock()
+_METRICS_SERVER: Optional[MetricsServer] = None
+
+
+def get_stage_metrics() -> Optional[StageMetrics]:
+    """
+    Returns the process-wide stage metrics, or None if they are disabled with STAGE_METRICS_ENABLED=0.
+    Spans are sent to OpenTelemetry with OTEL_TRACING_ENABLED=1, when opentelemetry is installed.
+    """
+    global _STAGE_METRICS
+    if _STAGE_METRICS is not None:
+        return _STAGE_METRICS
+
+    if str(c.get("env", "STAGE_METRICS_ENABLED", "1")).lower() in ("0", "false", "no"):
+        return None
+
+    with _STAGE_METRICS_LOCK:
+        if _STAGE_METRICS is None:
+            tracer = None
+            if str(c.get("env", "OTEL_TRACING_ENABLED", "0")).lower() in ("1", "true", "yes"):
+                if otel_trace is not None:
+                    tracer = otel_trace.get_tracer("conversationgenome")
+                else:
+                    bt.logging.warning("OTEL_TRACING_ENABLED is set but opentelemetry is not installed. Stage spans are not exported.")
+            _STAGE_METRICS = StageMetrics(window=Utils._int(c.get("env", "STAGE_METRICS_WINDOW", 1000), 1000), tracer=tracer)
+        return _STAGE_METRICS
+
+
+def time_stage(stage: str, **attributes):
+    """
+    Context manager timing a stage in the process-wide stage metrics, see StageMetrics.time.
+    """
+    metrics = get_stage_metrics()
+    if metrics is None:
+        return _no_timing()
+    return metrics.time(stage, **attributes)
+
+
+def timed_stage(stage: str):
+    """
+    Decorator timing every call of a sync or async function as a stage in the process-wide stage metrics.
+    """
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with time_stage(stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with time_stage(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def start_metrics_server() -> Optional[MetricsServer]:
+    """
+    Starts the Prometheus endpoint on METRICS_HOST:METRICS_PORT once per process. Returns None if METRICS_PORT
+    is not set or the stage metrics are disabled.
+    """
+    global _METRICS_SERVER
+    if _METRICS_SERVER is not None:
+        return _METRICS_SERVER
+
+    port = Utils._int(c.get("env", "METRICS_PORT", 0), 0)
+    metrics = get_stage_metrics()
+    if port <= 0 or metrics is None:
+        return None
+
+    host = c.get("env", "METRICS_HOST", "127.0.0.1")
+    try:
+        _METRICS_SERVER = MetricsServer(metrics, host=host, port=port).start()
+    except OSError as e:
+        bt.logging.error(f"Could not start the metrics endpoint on {host}:{port}: {e}")
+        return None
+    bt.logging.info(f"Serving stage metrics on http://{host}:{_METRICS_SERVER.port}/metrics")
+    return _METRICS_SERVER
+
+
+@contextmanager
+def _no_timing():
+    yield
@@ -1,11 +1,16 @@
 verbose = False
 
+import asyncio
+import gzip
 import json
 import random
+import threading
+import weakref
 
-import requests
+import httpx
 
 from conversationgenome import __version__ as CGP_VERSION
+from conversationgenome.analytics.StageMetrics import timed_stage
 from conversationgenome.api.models.conversation import Conversation
 from conversationgenome.ConfigLib import c
 from conversationgenome.mock.MockBt import MockBt
@@ -21,10 +26,22 @@ except:
         print("bittensor not installed")
     bt = MockBt()
 
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Shared clients, see ApiLib.get_async_client() and ApiLib.get_client()
+_ASYNC_CLIENTS = weakref.WeakKeyDictionary()
+_CLIENT = None
+_CLIENT_LOCK = threading.Lock()
+
 
 class ApiLib:
     verbose = False
 
+    @timed_stage("reserve")
     async def reserve_task_bundle(self, hotkey, api_key=None) -> TaskBundle:
         headers = {
             "Accept": "application/json",
@@ -33,11 +50,8 @@ class ApiLib:
         }
 
         jsonData = {}
-        postData = None
-        cert = None
         read_host_url = c.get('env', 'CGP_API_READ_HOST', 'https://api.conversations.xyz')
         read_host_port = c.get('env', 'CGP_API_READ_PORT', '443')
-        http_timeout = Utils._float(c.get('env', 'HTTP_TIMEOUT', 60))
         options_str = c.get('env', 'CGP_API_OPTIONS', '')
         url = f"{read_host_url}:{read_host_port}/api/v1/conversation/reserve?cgp_version={CGP_VERSION}"
 
@@ -50,11 +64,14 @@ class ApiLib:
         response = None
 
         try:
-            response = requests.post(url, headers=headers, json=jsonData, data=postData, cert=cert, timeout=http_timeout)
-        except requests.exceptions.Timeout as e:
+            client = self.get_async_client()
+            response = await client.post(url, headers=headers, json=jsonData, timeout=self.get_timeout('CGP_API_RESERVE_TIMEOUT'))
+        except httpx.TimeoutException as e:
             bt.logging.error(f"reserveConversation timeout error: {e}")
+        except httpx.HTTPError as e:
+            bt.logging.error(f"reserveConversation error: {e}")
 
-        if response and response.status_code == 200:
+        if response is not None and response.status_code == 200:
             data = response.json()
             task_bundle: TaskBundle = try_parse_task_bundle(data)
 
@@ -68,31 +85,120 @@ class ApiLib:
         return task_bundle
 
     async def put_task_data(self, id, json_data) -> bool:
-        write_host_url = c.get('env', 'CGP_API_WRITE_HOST', 'https://db.conversations.xyz')
-        write_host_port = c.get('env', 'CGP_API_WRITE_PORT', '443')
-        url = f"{write_host_url}:{write_host_port}/api/v1/conversation/record/{id}"
-
+        url = self.get_write_url(id)
         if self.verbose:
             print(f"PUTTING TO {url}")
 
-        headers = {
-            "Accept": "application/json",
-            "Accept-Language": "en_US",
-        }
+        try:
+            client = self.get_async_client()
+            response = await client.put(url, timeout=self.get_timeout('CGP_API_WRITE_TIMEOUT'), **self._get_write_request(json_data))
+        except Exception as e:
+            bt.logging.error("ERROR: 7283918: put_task_data RESPONSE", e)
+            return False
+
+        return self._check_write_response(response) in (200, 201)
 
-        http_timeout = Utils._float(c.get('env', 'HTTP_TIMEOUT', 60))
+    def get_write_url(self, id=None, path=None) -> str:
+        write_host_url = c.get('env', 'CGP_API_WRITE_HOST', 'https://db.conversations.xyz')
+        write_host_port = c.get('env', 'CGP_API_WRITE_PORT', '443')
+        if path:
+            return f"{write_host_url}:{write_host_port}{path}"
+        return f"{write_host_url}:{write_host_port}/api/v1/conversation/record/{id}"
+
+    def send_task_data(self, id, json_data, compress=False, path=None):
+        """
+        Blocking PUT of one task record (or a batch when path is set), for callers outside the event loop such as
+        the upload queue thread. Returns the HTTP status code, or None when the request failed.
+        compress sends the body gzipped with Content-Encoding: gzip.
+        """
+        url = self.get_write_url(id, path=path)
 
         try:
-            response = requests.put(url, headers=headers, json=json_data, timeout=http_timeout)
-
-            if response.status_code == 200 or response.status_code == 201:
-                if self.verbose:
-                    print("PUT success", response.json())
-            else:
-                bt.logging.error("ERROR: 7283917: put_task_data ERROR", response)
-                return False
+            response = self.get_client().put(url, timeout=self.get_timeout('CGP_API_WRITE_TIMEOUT'), **self._get_write_request(json_data, compress=compress))
         except Exception as e:
             bt.logging.error("ERROR: 7283918: put_task_data RESPONSE", e)
-            return False
+            return None
 
-        return True
+        return self._check_write_response(response)
+
+    ###############################################################################################
+    ######################################## HTTP clients #########################################
+    ###############################################################################################
+    def get_async_client(self) -> httpx.AsyncClient:
+        """
+        Returns the AsyncClient shared by every ApiLib on the running event loop. Connections are kept alive
+        between requests; they belong to the loop that opened them, so each loop gets its own client.
+        """
+        loop = asyncio.get_running_loop()
+        client = _ASYNC_CLIENTS.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=self.get_limits(), timeout=self.get_timeout())
+            _ASYNC_CLIENTS[loop] = client
+        return client
+
+    def get_client(self) -> httpx.Client:
+        global _CLIENT
+        with _CLIENT_LOCK:
+            if _CLIENT is None or _CLIENT.is_closed:
+                _CLIENT = httpx.Client(http2=HTTP2_AVAILABLE, limits=self.get_limits(), timeout=self.get_timeout())
+            return _CLIENT
+
+    def get_limits(self) -> httpx.Limits:
+        """
+        Pool size is HTTP_POOL_SIZE, or enough for every concurrent forward to reserve a bundle and upload its
+        miner responses at the same time.
+        """
+        pool_size = Utils._int(c.get('env', 'HTTP_POOL_SIZE'), None)
+        if not pool_size:
+            forwards = Utils._int(c.get('validator', 'num_concurrent_forwards', 1), 1)
+            response_concurrency = Utils._int(c.get('validator', 'response_concurrency', 6), 6)
+            pool_size = max(1, forwards) * (response_concurrency + 2)
+        keepalive_expiry = Utils._float(c.get('env', 'HTTP_KEEPALIVE_EXPIRY', 30), 30)
+        return httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size, keepalive_expiry=keepalive_expiry)
+
+    def get_timeout(self, key=None) -> httpx.Timeout:
+        """
+        Per-endpoint timeout from the given env key, falling back to HTTP_TIMEOUT.
+        """
+        http_timeout = Utils._float(c.get('env', 'HTTP_TIMEOUT', 60), 60)
+        if key:
+            http_timeout = Utils._float(c.get('env', key, http_timeout), http_timeout)
+        return httpx.Timeout(http_timeout, connect=min(10.0, http_timeout))
+
+    def _get_write_request(self, json_data, compress=False) -> dict:
+        headers = {
+            "Accept": "application/json",
+            "Accept-Language": "en_US",
+            "Content-Type": "application/json",
+        }
+        content = json.dumps(json_data).encode("utf-8")
+        if compress:
+            headers["Content-Encoding"] = "gzip"
+            content = gzip.compress(content)
+        return {"headers": headers, "content": content}
+
+    def _check_write_response(self, response):
+        if response.status_code == 200 or response.status_code == 201:
+            if self.verbose:
+                print("PUT success", response.json())
+        else:
+            bt.logging.error("ERROR: 7283917: put_task_data ERROR", response)
+        return response.status_code
+
+
+async def aclose_api_clients() -> None:
+    """
+    Closes the shared clients and their pooled connections.
+    """
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is not None:
+            _CLIENT.close()
+            _CLIENT = None
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    client = _ASYNC_CLIENTS.pop(loop, None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,227 @@
+import json
+import os
+import queue
+import threading
+import time
+
+from conversationgenome.api.ApiLib import ApiLib
+from conversationgenome.ConfigLib import c
+from conversationgenome.mock.MockBt import MockBt
+from conversationgenome.utils.Utils import Utils
+
+bt = None
+try:
+    import bittensor as bt
+except:
+    bt = MockBt()
+
+DEFAULT_JOURNAL_PATH = os.path.join("~", ".bittensor", "cgp", "upload_journal.jsonl")
+
+
+class TaskUploadQueue:
+    """
+    Uploads put_task records from a background thread so a slow write host does not stall forward().
+
+    Records wait in a bounded in-memory queue. When it is full they are appended to a JSONL journal on disk,
+    which is replayed once the queue drains and on the next start. Failed uploads are retried with exponential
+    backoff. With batch_path set, up to batch_size records are sent per request; otherwise one request per record.
+    """
+
+    def __init__(self, journal_path=None, max_size=1000, batch_size=20, batch_path=None, compress=False, max_retries=4, backoff=1.0, max_backoff=30.0):
+        self.journal_path = os.path.expanduser(journal_path) if journal_path else None
+        self.max_size = max(1, max_size)
+        self.batch_size = max(1, batch_size)
+        self.batch_path = batch_path
+        self.compress = compress
+        self.max_retries = max(0, max_retries)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self._queue = queue.Queue(maxsize=self.max_size)
+        self._journal_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.enqueued = 0
+        self.spilled = 0
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="cgp-task-upload", daemon=True)
+        self._thread.start()
+
+    def enqueue(self, task_bundle_id, data) -> None:
+        record = {"id": task_bundle_id, "data": data}
+        self.start()
+        try:
+            self._queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            self._spill([record])
+
+    def flush(self, timeout=30.0) -> bool:
+        """
+        Waits up to timeout seconds for queued records to upload, then stops the worker.
+        Records still waiting are written to the journal. Returns True if everything was sent.
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and self._thread and self._thread.is_alive():
+            if self._queue.unfinished_tasks == 0 and not self._journal_has_records():
+                break
+            time.sleep(0.05)
+
+        self._stop.set()
+        if self._thread:
+            self._thread.join(max(0.0, deadline - time.monotonic()) + 1.0)
+
+        leftover = []
+        while True:
+            try:
+                leftover.append(self._queue.get_nowait())
+                self._queue.task_done()
+            except queue.Empty:
+                break
+        if leftover:
+            self._spill(leftover)
+            bt.logging.warning(f"Upload queue flush timed out. {len(leftover)} record(s) saved to {self.journal_path} for the next start.")
+            return False
+        return not self._journal_has_records()
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "enqueued": self.enqueued,
+            "spilled": self.spilled,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retries": self.retries,
+        }
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                record = self._queue.get(timeout=0.2)
+            except queue.Empty:
+                self._replay_journal()
+                continue
+
+            batch = [record]
+            while len(batch) < self.batch_size and self.batch_path:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self._send(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _send(self, records) -> None:
+        api = ApiLib()
+        if self.batch_path:
+            groups = [records]
+        else:
+            groups = [[record] for record in records]
+
+        for group in groups:
+            delay = self.backoff
+            for attempt in range(self.max_retries + 1):
+                if self.batch_path:
+                    status_code = api.send_task_data(None, group, compress=self.compress, path=self.batch_path)
+                else:
+                    status_code = api.send_task_data(group[0]["id"], group[0]["data"], compress=self.compress)
+
+                if status_code in (200, 201):
+                    self.sent += len(group)
+                    break
+                # Client errors other than rate limiting will not succeed on retry
+                if status_code is not None and 400 <= status_code < 500 and status_code != 429:
+                    self.failed += len(group)
+                    break
+                if attempt == self.max_retries:
+                    self.failed += len(group)
+                    bt.logging.error(f"Giving up on {len(group)} task upload(s) after {attempt + 1} attempt(s). Last status: {status_code}")
+                    break
+                if self._stop.wait(delay):
+                    # Shutting down mid-backoff, keep the records for the next start
+                    self._spill(group)
+                    break
+                self.retries += 1
+                delay = min(delay * 2, self.max_backoff)
+
+    def _spill(self, records) -> None:
+        if not self.journal_path:
+            self.failed += len(records)
+            bt.logging.error(f"No upload journal configured. Dropping {len(records)} task upload(s).")
+            return
+        with self._journal_lock:
+            os.makedirs(os.path.dirname(self.journal_path) or ".", exist_ok=True)
+            with open(self.journal_path, "a") as f:
+                for record in records:
+                    f.write(json.dumps(record) + "\n")
+        self.spilled += len(records)
+
+    def _journal_has_records(self) -> bool:
+        return bool(self.journal_path) and os.path.isfile(self.journal_path) and os.path.getsize(self.journal_path) > 0
+
+    def _replay_journal(self) -> None:
+        if not self._journal_has_records():
+            return
+        with self._journal_lock:
+            with open(self.journal_path) as f:
+                lines = f.readlines()
+            records = []
+            for line in lines:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    bt.logging.error(f"Skipping unreadable upload journal line in {self.journal_path}")
+            # Move as many records as fit back into the queue, keep the rest on disk
+            remaining = []
+            for record in records:
+                try:
+                    self._queue.put_nowait(record)
+                except queue.Full:
+                    remaining.append(record)
+            with open(self.journal_path, "w") as f:
+                for record in remaining:
+                    f.write(json.dumps(record) + "\n")
+
+
+_TASK_UPLOAD_QUEUE = None
+_TASK_UPLOAD_QUEUE_LOCK = threading.Lock()
+
+
+def get_task_upload_queue():
+    """
+    Returns the process-wide upload queue, or None unless UPLOAD_QUEUE_ENABLED is set.
+    """
+    global _TASK_UPLOAD_QUEUE
+    enabled = str(c.get('env', 'UPLOAD_QUEUE_ENABLED', '0')).lower()
+    if enabled in ('0', 'false', 'no', ''):
+        return None
+
+    with _TASK_UPLOAD_QUEUE_LOCK:
+        if _TASK_UPLOAD_QUEUE is None:
+            _TASK_UPLOAD_QUEUE = TaskUploadQueue(
+                journal_path=c.get('env', 'UPLOAD_QUEUE_JOURNAL_PATH', DEFAULT_JOURNAL_PATH),
+                max_size=Utils._int(c.get('env', 'UPLOAD_QUEUE_SIZE', 1000), 1000),
+                batch_size=Utils._int(c.get('env', 'UPLOAD_BATCH_SIZE', 20), 20),
+                batch_path=c.get('env', 'CGP_API_WRITE_BATCH_PATH'),
+                compress=str(c.get('env', 'CGP_API_WRITE_GZIP', '0')).lower() in ('1', 'true', 'yes'),
+                max_retries=Utils._int(c.get('env', 'UPLOAD_MAX_RETRIES', 4), 4),
+            )
+        return _TASK_UPLOAD_QUEUE
+
+
+def flush_task_upload_queue(timeout=30.0) -> bool:
+    if _TASK_UPLOAD_QUEUE is None:
+        return True
+    return _TASK_UPLOAD_QUEUE.flush(timeout=timeout)
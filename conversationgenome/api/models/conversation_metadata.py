@@ -2,10 +2,12 @@ from typing import Dict, List, Optional, Tuple
 
 from pydantic import BaseModel
 
+from conversationgenome.api.models.tag_vectors import TagVectors
+
 
 class ConversationMetadata(BaseModel):
     tags: List[str]
-    vectors: Dict[str, Dict[str, List[float]]]
+    vectors: TagVectors
     participantProfiles: Optional[List[str]] = None
 
 class ConversationQualityMetadata(BaseModel):
@@ -2,8 +2,10 @@ from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
+from conversationgenome.api.models.tag_vectors import TagVectors
+
 
 class RawMetadata(BaseModel):
     tags: List[str]
     success: bool
-    vectors: Optional[Dict[str, Dict[str, List[float]]]]
\ No newline at end of file
+    vectors: Optional[TagVectors]
\ No newline at end of file
@@ -0,0 +1,182 @@
+import base64
+import binascii
+from collections.abc import Mapping
+from typing import Annotated, Any, Dict, List
+
+import numpy as np
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import core_schema
+
+PACKED_ENCODING = "packed"
+PACKED_DTYPES = {"float32": np.float32, "float16": np.float16}
+
+
+class PackedTagVectors(Mapping):
+    """
+    Tag embeddings stored as one contiguous (tags x dimensions) array plus a tag index.
+    Reads like the usual {tag: {"vectors": [...]}} dict, but rows come back as float32 numpy arrays and the
+    array is only built from the wire bytes the first time a vector is read.
+    """
+
+    def __init__(self, tags: List[str], dimensions: int, dtype: str = "float32", data=None, matrix=None):
+        if dtype not in PACKED_DTYPES:
+            raise ValueError(f"Unsupported vector dtype: {dtype}")
+        self.tags = list(tags)
+        self.dimensions = dimensions
+        self.dtype = dtype
+        self._index = {tag: idx for idx, tag in enumerate(self.tags)}
+        self._data = data
+        self._matrix = matrix
+
+    @classmethod
+    def from_vector_dict(cls, vectors: Dict[str, Dict[str, List[float]]], dtype: str = "float32") -> "PackedTagVectors":
+        if isinstance(vectors, PackedTagVectors):
+            return vectors
+        tags = list(vectors.keys())
+        dimensions = len(vectors[tags[0]]['vectors']) if tags else 0
+        matrix = np.empty((len(tags), dimensions), dtype=PACKED_DTYPES.get(dtype, np.float32))
+        for idx, tag in enumerate(tags):
+            matrix[idx] = vectors[tag]['vectors']
+        return cls(tags, dimensions, dtype=dtype, matrix=matrix)
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "PackedTagVectors":
+        packed = cls(payload['tags'], payload['dimensions'], dtype=payload.get('dtype', "float32"))
+        packed._data = packed._decode(payload['data'])
+        return packed
+
+    @staticmethod
+    def is_payload(value) -> bool:
+        return isinstance(value, dict) and value.get("encoding") == PACKED_ENCODING and isinstance(value.get("data"), (str, bytes))
+
+    @property
+    def matrix(self) -> np.ndarray:
+        if self._matrix is None:
+            matrix = np.frombuffer(self._decode(self._data), dtype=PACKED_DTYPES[self.dtype])
+            self._matrix = matrix.reshape(len(self.tags), self.dimensions)
+            self._data = None
+        return self._matrix
+
+    def _decode(self, data) -> bytes:
+        """
+        Returns the raw array bytes of data, raising ValueError if they do not hold len(tags) x dimensions values.
+        """
+        expected = len(self.tags) * self.dimensions * np.dtype(PACKED_DTYPES[self.dtype]).itemsize
+        if isinstance(data, str):
+            data = data.encode("ascii")
+        # base64 text is decoded, raw bytes are used as-is
+        if len(data) != expected:
+            try:
+                data = base64.b64decode(data, validate=True)
+            except binascii.Error as e:
+                raise ValueError(f"Packed vector data is not valid base64: {e}")
+        if len(data) != expected:
+            raise ValueError(f"Packed vector data has {len(data)} bytes, expected {expected} for {len(self.tags)} tags x {self.dimensions} {self.dtype} dimensions")
+        return data
+
+    def to_payload(self, dtype: str = None, as_bytes: bool = False) -> Dict[str, Any]:
+        dtype = dtype or self.dtype
+        if dtype not in PACKED_DTYPES:
+            raise ValueError(f"Unsupported vector dtype: {dtype}")
+        data = np.ascontiguousarray(self.matrix, dtype=PACKED_DTYPES[dtype]).tobytes()
+        return {
+            "encoding": PACKED_ENCODING,
+            "dtype": dtype,
+            "dimensions": self.dimensions,
+            "tags": self.tags,
+            "data": data if as_bytes else base64.b64encode(data).decode("ascii"),
+        }
+
+    def to_dict(self) -> Dict[str, Dict[str, List[float]]]:
+        matrix = self.matrix.astype(np.float32).tolist()
+        return {tag: {"vectors": matrix[idx]} for idx, tag in enumerate(self.tags)}
+
+    def __getitem__(self, tag):
+        idx = self._index[tag]
+        row = self.matrix[idx]
+        return {"vectors": row if row.dtype == np.float32 else row.astype(np.float32)}
+
+    def __contains__(self, tag):
+        return tag in self._index
+
+    def __iter__(self):
+        return iter(self.tags)
+
+    def __len__(self):
+        return len(self.tags)
+
+    def __eq__(self, other):
+        if isinstance(other, Mapping):
+            return self.to_dict() == (other.to_dict() if isinstance(other, PackedTagVectors) else dict(other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"PackedTagVectors(tags={len(self.tags)}, dimensions={self.dimensions}, dtype={self.dtype})"
+
+
+def pack_tag_vectors(vectors, dtype: str = "float32", as_bytes: bool = False) -> Dict[str, Any]:
+    return PackedTagVectors.from_vector_dict(vectors, dtype=dtype).to_payload(dtype=dtype, as_bytes=as_bytes)
+
+
+def pack_vector_fields(data, dtype: str = "float32"):
+    """
+    Returns a copy of data with every "vectors" tag-vector dict packed, for payloads built outside pydantic.
+    """
+    if isinstance(data, dict):
+        out = {}
+        for key, value in data.items():
+            if key == "vectors" and _is_tag_vector_dict(value):
+                out[key] = pack_tag_vectors(value, dtype=dtype)
+            else:
+                out[key] = pack_vector_fields(value, dtype=dtype)
+        return out
+    if isinstance(data, list):
+        return [pack_vector_fields(value, dtype=dtype) for value in data]
+    return data
+
+
+def _is_tag_vector_dict(value) -> bool:
+    if isinstance(value, PackedTagVectors):
+        return len(value) > 0
+    if not isinstance(value, dict) or not value:
+        return False
+    lengths = set()
+    for entry in value.values():
+        if not isinstance(entry, dict) or 'vectors' not in entry:
+            return False
+        lengths.add(len(entry['vectors']))
+    return len(lengths) == 1
+
+
+class _TagVectorsSchema:
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source, handler: GetCoreSchemaHandler):
+        return _tag_vectors_schema(handler(source))
+
+
+def _tag_vectors_schema(dict_schema):
+    def validate(value, validator):
+        if isinstance(value, PackedTagVectors):
+            return value
+        if PackedTagVectors.is_payload(value):
+            return PackedTagVectors.from_payload(value)
+        return validator(value)
+
+    def serialize(value, serializer, info):
+        # model_dump(context={"vector_encoding": "float16"}) packs the vectors, otherwise plain lists as before
+        encoding = (info.context or {}).get("vector_encoding")
+        if encoding and _is_tag_vector_dict(value):
+            return pack_tag_vectors(value, dtype=encoding)
+        if isinstance(value, PackedTagVectors):
+            return value.to_dict()
+        return serializer(value)
+
+    return core_schema.no_info_wrap_validator_function(
+        validate,
+        dict_schema,
+        serialization=core_schema.wrap_serializer_function_ser_schema(serialize, info_arg=True, schema=dict_schema),
+    )
+
+
+# Field type for tag embeddings: accepts plain dicts, packed payloads and PackedTagVectors
+TagVectors = Annotated[Dict[str, Dict[str, List[float]]], _TagVectorsSchema]
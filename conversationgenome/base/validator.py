@@ -18,7 +18,6 @@
 
 import argparse
 import asyncio
-import copy
 import datetime
 import os
 import threading
@@ -27,11 +26,14 @@ from typing import List
 
 import bittensor as bt
 import numpy as np
-import torch
 
 from conversationgenome.base.neuron import BaseNeuron
+from conversationgenome.ConfigLib import c
 from conversationgenome.mock.mock import MockDendrite
 from conversationgenome.utils.config import add_validator_args
+from conversationgenome.utils.Utils import Utils
+from conversationgenome.validator.StateCheckpoint import StateCheckpoint
+from conversationgenome.validator.StateCheckpoint import load_legacy_state
 from conversationgenome.validator.ValidatorLib import ValidatorLib
 
 
@@ -43,6 +45,14 @@ class BaseValidatorNeuron(BaseNeuron):
     neuron_type: str = "ValidatorNeuron"
 
     first_sync = True
+    # Score updates not yet written to the state checkpoint, see save_state
+    state_checkpoint = None
+    pending_state_ops = None
+    state_snapshot_needed = True
+    # See get_metagraph_fingerprint
+    metagraph_fingerprint = None
+    # See conversationgenome.utils.uids.get_available_uids
+    available_uids_cache = None
 
     @classmethod
     def add_args(cls, parser: argparse.ArgumentParser):
@@ -53,7 +63,7 @@ class BaseValidatorNeuron(BaseNeuron):
         super().__init__(config=config)
 
         # Save a copy of the hotkeys to local memory.
-        self.hotkeys = copy.deepcopy(self.metagraph.hotkeys)
+        self.hotkeys = list(self.metagraph.hotkeys)
 
         # Dendrite lets us send messages to other nodes (axons) in the network.
         if self.config.mock:
@@ -323,66 +333,106 @@ class BaseValidatorNeuron(BaseNeuron):
         """Resyncs the metagraph and updates the hotkeys and moving averages based on the new metagraph."""
         bt.logging.info("resync_metagraph()")
 
-        # Copies state of metagraph before syncing.
-        previous_metagraph = copy.deepcopy(self.metagraph)
+        # Fingerprint of the metagraph before syncing.
+        previous_fingerprint = self.metagraph_fingerprint or self.get_metagraph_fingerprint()
 
         # Sync the metagraph.
         self.metagraph.sync(subtensor=self.subtensor)
+        self.metagraph_fingerprint = self.get_metagraph_fingerprint()
+        self.available_uids_cache = None
 
         # Check if the metagraph axon info has changed.
-        if previous_metagraph.axons == self.metagraph.axons:
+        if previous_fingerprint == self.metagraph_fingerprint:
             return
 
         bt.logging.info("Metagraph updated, re-syncing hotkeys, dendrite pool and moving averages")
+        # Hotkey and size changes are not in the update log, the next checkpoint is a full snapshot
+        self.state_snapshot_needed = True
+
         # Zero out all hotkeys that have been replaced.
-        for uid, hotkey in enumerate(self.hotkeys):
-            if hotkey != self.metagraph.hotkeys[uid]:
-                self.scores[uid] = 0  # hotkey has been replaced
-                self.ema_scores[uid] = 0  # hotkey has been replaced
+        previous_hotkeys = np.asarray(self.hotkeys, dtype=str)
+        hotkeys = np.asarray(self.metagraph.hotkeys, dtype=str)
+        overlap = min(len(previous_hotkeys), len(hotkeys), len(self.scores), len(self.ema_scores))
+        replaced_uids = np.nonzero(previous_hotkeys[:overlap] != hotkeys[:overlap])[0]
+        if replaced_uids.size > 0:
+            bt.logging.info(f"Hotkeys replaced for UIDs {replaced_uids.tolist()}. Resetting their scores.")
+            self.scores[replaced_uids] = 0
+            self.ema_scores[replaced_uids] = 0
 
         # Check to see if the metagraph has changed size.
-        # If so, we need to add new hotkeys and moving averages.
-        if len(self.hotkeys) < len(self.metagraph.hotkeys):
-            # Update the size of the moving average scores.
-            new_moving_average = np.zeros((self.metagraph.n))
-            new_scores = np.zeros((self.metagraph.n))
-            min_len = min(len(self.hotkeys), len(self.scores))
-            new_scores[:min_len] = self.scores[:min_len]
-            new_moving_average = self.ema_scores[:min_len]
-            self.scores = new_scores
-            self.ema_scores = new_moving_average
+        # If so, pad the scores and moving averages for the new UIDs, keeping the history of the existing ones.
+        n = int(self.metagraph.n)
+        if len(self.scores) < n or len(self.ema_scores) < n:
+            self.scores = self._resize_scores(self.scores, n)
+            self.ema_scores = self._resize_scores(self.ema_scores, n)
 
         # Update the hotkeys.
-        self.hotkeys = copy.deepcopy(self.metagraph.hotkeys)
+        self.hotkeys = list(self.metagraph.hotkeys)
+
+    def get_metagraph_fingerprint(self) -> int:
+        """
+        Hash of the axon info of every UID, used to tell whether a metagraph sync changed anything.
+        """
+        return hash(tuple(tuple(vars(axon).values()) for axon in self.metagraph.axons))
+
+    @staticmethod
+    def _resize_scores(values: np.ndarray, n: int) -> np.ndarray:
+        resized = np.full(n, 0.0, dtype=values.dtype)
+        keep = min(n, len(values))
+        resized[:keep] = values[:keep]
+        return resized
 
     def update_scores(self, rewards: np.ndarray, uids: List[int]):
         """
         Performs exponential moving average on the scores based on the rewards received from the miners,
         then normalizes, applies a non-linear transformation, and renormalizes the scores.
         """
+        op = {
+            "op": "update",
+            "uids": [int(uid) for uid in uids],
+            "rewards": [float(reward) for reward in np.asarray(rewards, dtype=np.float32)],
+            "alpha": float(self.config.neuron.moving_average_alpha),
+            "neurons": int(self.metagraph.n),
+            "power": float(self.nonlinear_power),
+        }
+        if self._apply_score_update(op):
+            if self.pending_state_ops is None:
+                self.pending_state_ops = []
+            self.pending_state_ops.append(op)
+
+        bt.logging.debug(f"Updated final scores: {self.scores}")
 
+    def _apply_score_update(self, op) -> bool:
         vl = ValidatorLib()
         updated_scores, updated_ema_scores = vl.update_scores(
-            rewards,
-            uids,
+            op["rewards"],
+            op["uids"],
             self.ema_scores,
             self.scores,
-            self.config.neuron.moving_average_alpha,
+            op["alpha"],
             self.device,
-            self.metagraph.n,
-            self.nonlinear_power,
+            op["neurons"],
+            op["power"],
         )
 
         if updated_scores.size > 0 and updated_ema_scores.size > 0 and not np.isnan(updated_scores).any() and not np.isnan(updated_ema_scores).any():
             self.scores = updated_scores
             self.ema_scores = updated_ema_scores
-        else:
-            bt.logging.error("Error 2378312: Error with Nonlinear transformation and Renormalization in update_scores. self.scores not updated")
+            return True
 
-        bt.logging.debug(f"Updated final scores: {self.scores}")
+        bt.logging.error("Error 2378312: Error with Nonlinear transformation and Renormalization in update_scores. self.scores not updated")
+        return False
+
+    def get_state_checkpoint(self) -> StateCheckpoint:
+        if self.state_checkpoint is None:
+            self.state_checkpoint = StateCheckpoint(self.config.neuron.full_path)
+        return self.state_checkpoint
 
     def save_state(self):
-        """Saves the state of the validator to a file."""
+        """
+        Checkpoints the state of the validator. Score updates since the last save are appended to the update log;
+        a full snapshot is written every validator.state_snapshot_every updates and after the metagraph changed.
+        """
         if self.first_sync:
             bt.logging.info(f"Ignore first sync so it doesn't save over last data.")
             self.first_sync = False
@@ -393,65 +443,58 @@ class BaseValidatorNeuron(BaseNeuron):
             bt.logging.info(f"EMA score and/or Score array is empty or all zeros. Skipping save state.")
             return
 
-        state_path = self.config.neuron.full_path + "/state.npz"
-        bt.logging.info(f"Saving validator state to {state_path}.")
+        checkpoint = self.get_state_checkpoint()
+        ops = self.pending_state_ops or []
+        snapshot_every = max(1, Utils._int(c.get("validator", "state_snapshot_every", 500), 500))
 
-        # Save the state of the validator to file.
-        np.savez(
-            self.config.neuron.full_path + "/state.npz",
-            step=self.step,
-            scores=self.scores,
-            hotkeys=self.hotkeys,
-            ema_scores=self.ema_scores,
-        )
-
-        if os.path.isfile(state_path):
+        try:
+            if self.state_snapshot_needed or not checkpoint.exists() or checkpoint.log_records + len(ops) >= snapshot_every:
+                bt.logging.info(f"Saving validator state snapshot to {checkpoint.snapshot_path}.")
+                checkpoint.write_snapshot(self.step, self.scores, self.ema_scores, self.hotkeys)
+                self.state_snapshot_needed = False
+            else:
+                bt.logging.info(f"Appending {len(ops)} score update(s) to {checkpoint.log_path}.")
+                checkpoint.append(self.step, ops)
+            self.pending_state_ops = []
             bt.logging.info(f"Save state confirmed")
-        else:
-            bt.logging.info(f"Save state failed.")
+        except Exception as e:
+            bt.logging.error(f"Save state failed: {e}")
 
     def load_state(self):
-        """Loads the state of the validator from a file."""
+        """Loads the state of the validator from its checkpoint, or from a legacy state.npz/state.pt file."""
+        checkpoint = self.get_state_checkpoint()
         npz_path = self.config.neuron.full_path + "/state.npz"
         pt_path = self.config.neuron.full_path + "/state.pt"
 
-        if os.path.isfile(npz_path):
-            file_stats = os.stat(npz_path)
-            last_mod_dt = datetime.datetime.fromtimestamp(file_stats.st_mtime)
-            bt.logging.info(f"\n\nLoading state file. File last updated: {last_mod_dt.strftime('%Y-%m-%d %H:%M:%S')}")
-            # Load state from .npz file
-            bt.logging.info(f"Loading validator state from {npz_path}.")
-            state = np.load(npz_path)
-            self.step = state["step"].item()  # Ensure it's a Python scalar
+        state, ops = checkpoint.load()
+        if state is not None:
+            bt.logging.info(f"Loading validator state from {checkpoint.snapshot_path} with {len(ops)} logged score update(s).")
+            self.step = state["step"]
             self.scores = state["scores"]
-            self.hotkeys = state["hotkeys"]
-            if "ema_scores" in state:
-                self.ema_scores = state["ema_scores"]
-            else:
-                bt.logging.info("ema_scores not found in saved state. Initializing with default values.")
-                self.ema_scores = np.zeros_like(self.scores)
-        elif os.path.isfile(pt_path):
-            file_stats = os.stat(pt_path)
+            self.ema_scores = state["ema_scores"]
+            self.hotkeys = np.array(state["hotkeys"])
+            for op in ops:
+                self._apply_score_update(op)
+            self.state_snapshot_needed = False
+        elif os.path.isfile(npz_path) or os.path.isfile(pt_path):
+            legacy_path = npz_path if os.path.isfile(npz_path) else pt_path
+            file_stats = os.stat(legacy_path)
             last_mod_dt = datetime.datetime.fromtimestamp(file_stats.st_mtime)
             bt.logging.info(f"\n\nLoading state file. File last updated: {last_mod_dt.strftime('%Y-%m-%d %H:%M:%S')}")
-            # Load state from .pt file
-            bt.logging.info(f"Loading validator state from {pt_path}.")
-            state = torch.load(pt_path)
-            self.step = int(state["step"])
+            bt.logging.info(f"Loading validator state from {legacy_path}.")
+            state = load_legacy_state(legacy_path)
+            self.step = state["step"]
+            self.scores = state["scores"]
+            self.ema_scores = state["ema_scores"]
             self.hotkeys = np.array(state["hotkeys"])
-            self.scores = state["scores"].cpu().numpy()  # Convert to NumPy array
-
-            if "ema_scores" in state:
-                self.ema_scores = state["ema_scores"].cpu().numpy()  # Convert to NumPy array
-            else:
-                bt.logging.info("ema_scores not found in saved state. Initializing with default values.")
-                self.ema_scores = np.zeros_like(self.scores)
 
-            # Save the state as a .npz file
-            self.save_state()
+            # Convert to the checkpoint format
+            checkpoint.write_snapshot(self.step, self.scores, self.ema_scores, self.hotkeys)
+            self.state_snapshot_needed = False
         else:
             bt.logging.info("No state file found.")
 
+        self.pending_state_ops = []
         try:
             bt.logging.debug(f"Loaded state. Step: {self.step} Num scores: {len(self.scores)} Sum scores: {np.sum(self.scores)} Num hotkeys: {len(self.hotkeys)}")
         except Exception as e:
@@ -1,19 +1,71 @@
 from abc import ABC, abstractmethod
+import asyncio
+from contextvars import ContextVar
 import functools
 import json
 import random
 from typing import List
+import weakref
 
+from conversationgenome.analytics.StageMetrics import timed_stage
 from conversationgenome.api.models.conversation import Conversation
 from conversationgenome.api.models.conversation_metadata import ConversationMetadata, ConversationQualityMetadata
 from conversationgenome.api.models.raw_metadata import RawMetadata
+from conversationgenome.llm.embedding_cache import EmbeddingCache
 from conversationgenome.llm.prompt_manager import prompt_manager
+from conversationgenome.llm.tag_validation_cache import TagValidationCache
 from conversationgenome.utils.Utils import Utils
 
+# Active model overrides keyed by (backend id, attribute). Kept per context so concurrent calls
+# on a shared backend never see each other's override.
+_ATTR_OVERRIDES: ContextVar[dict] = ContextVar("llm_attr_overrides", default={})
+
+# Calls to the provider, timed as stages of the process-wide StageMetrics. Backend overrides are timed too.
+LLM_CALL_STAGES = {
+    "basic_prompt": "llm_prompt",
+    "abasic_prompt": "llm_prompt",
+    "get_vector_embeddings": "llm_embeddings",
+    "aget_vector_embeddings": "llm_embeddings",
+    "get_vector_embeddings_batch": "llm_embeddings",
+    "aget_vector_embeddings_batch": "llm_embeddings",
+}
+
 class LlmLib(ABC):
     client = None
-    model = None
-    embedding_model = None
+    _model = None
+    _embedding_model = None
+    embedding_dimensions = None
+    # Set by providers that want tag vectors memoized, see embedding_cache.get_embedding_cache()
+    embedding_cache: EmbeddingCache | None = None
+    # Set by providers that want validate_tag_set verdicts memoized, see tag_validation_cache.get_tag_validation_cache()
+    tag_validation_cache: TagValidationCache | None = None
+    # Limits used to split get_vector_embeddings_set into batch requests
+    embedding_batch_max_inputs = 2048
+    embedding_batch_max_tokens = 300000
+    # Async clients per event loop, see _get_async_client()
+    _async_clients = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, stage in LLM_CALL_STAGES.items():
+            if name in cls.__dict__:
+                setattr(cls, name, timed_stage(stage)(cls.__dict__[name]))
+
+    @property
+    def model(self):
+        return _ATTR_OVERRIDES.get().get((id(self), "model"), self._model)
+
+    @model.setter
+    def model(self, value):
+        self._model = value
+
+    @property
+    def embedding_model(self):
+        return _ATTR_OVERRIDES.get().get((id(self), "embedding_model"), self._embedding_model)
+
+    @embedding_model.setter
+    def embedding_model(self, value):
+        self._embedding_model = value
 
     ###############################################################################################
     ###################################### Abstract methods #######################################
@@ -33,6 +85,47 @@ class LlmLib(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_vector_embeddings_batch(self, tags: List[str]) -> List[List[float]|None]|None:
+        """
+        Takes a list of strings (tags) and returns their vector embeddings with a single request.
+        The returned list is in the same order as tags. Returns None if the request failed.
+        """
+        pass
+
+    ###############################################################################################
+    ####################################### Async methods #########################################
+    ###############################################################################################
+    # Backends override these with calls on their async client. The defaults run the blocking
+    # call in a worker thread so it never stalls the event loop.
+    @timed_stage("llm_prompt")
+    async def abasic_prompt(self, prompt: str, response_format: str = "text") -> str|None:
+        return await asyncio.to_thread(self.basic_prompt, prompt, response_format)
+
+    @timed_stage("llm_embeddings")
+    async def aget_vector_embeddings(self, tag: str) -> List[float]|None:
+        return await asyncio.to_thread(self.get_vector_embeddings, tag)
+
+    @timed_stage("llm_embeddings")
+    async def aget_vector_embeddings_batch(self, tags: List[str]) -> List[List[float]|None]|None:
+        return await asyncio.to_thread(self.get_vector_embeddings_batch, tags)
+
+    def _get_async_client(self, name: str = "llm"):
+        """
+        Returns the named async client for the running event loop, creating it on first use.
+        Clients keep their connections alive between calls, but pooled connections belong to the loop that opened them.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_clients is None:
+            self._async_clients = weakref.WeakKeyDictionary()
+        loop_clients = self._async_clients.setdefault(loop, {})
+        if name not in loop_clients:
+            loop_clients[name] = self._create_async_client(name)
+        return loop_clients[name]
+
+    def _create_async_client(self, name: str):
+        raise NotImplementedError(f"{type(self).__name__} has no async client '{name}'")
+
     ###############################################################################################
     ###################################### Concrete methods #######################################
     ###############################################################################################
@@ -40,11 +133,48 @@ class LlmLib(ABC):
         """
         Takes a list of strings (tags) and returns a list of vector embeddings.
         """
-        originalTags = tags
-        tags = Utils.get_clean_tag_set(originalTags)
+        tags = Utils.get_clean_tag_set(tags)
+        cached_vectors = self._get_cached_vectors(tags)
+
+        new_vectors = {}
+        for batch in self._get_embedding_batches([tag for tag in tags if tag not in cached_vectors]):
+            new_vectors.update(self._zip_batch_vectors(batch, self.get_vector_embeddings_batch(batch)))
+
+        if self.embedding_cache and new_vectors:
+            self.embedding_cache.put_many(self._get_embedding_namespace(), new_vectors)
+        return self._build_tag_vector_dict(tags, cached_vectors, new_vectors)
+
+    async def aget_vector_embeddings_set(self, tags: List[str]) -> List[List[float]]:
+        """
+        Async variant of get_vector_embeddings_set. Batches are requested concurrently and the disk tier of the
+        embedding cache is accessed in a worker thread.
+        """
+        tags = Utils.get_clean_tag_set(tags)
+        cached_vectors = await self.embedding_cache.aget_many(self._get_embedding_namespace(), tags) if self.embedding_cache else {}
+
+        batches = self._get_embedding_batches([tag for tag in tags if tag not in cached_vectors])
+        batch_results = await asyncio.gather(*[self.aget_vector_embeddings_batch(batch) for batch in batches])
+        new_vectors = {}
+        for batch, batch_vectors in zip(batches, batch_results):
+            new_vectors.update(self._zip_batch_vectors(batch, batch_vectors))
+
+        if self.embedding_cache and new_vectors:
+            await self.embedding_cache.aput_many(self._get_embedding_namespace(), new_vectors)
+        return self._build_tag_vector_dict(tags, cached_vectors, new_vectors)
+
+    def _get_cached_vectors(self, tags: List[str]) -> dict:
+        if not self.embedding_cache:
+            return {}
+        return self.embedding_cache.get_many(self._get_embedding_namespace(), tags)
+
+    def _zip_batch_vectors(self, batch: List[str], batch_vectors) -> dict:
+        batch_vectors = batch_vectors or []
+        return {tag: batch_vectors[idx] if idx < len(batch_vectors) else None for idx, tag in enumerate(batch)}
+
+    def _build_tag_vector_dict(self, tags: List[str], cached_vectors: dict, new_vectors: dict) -> dict:
         tagVectorDict = {}
         for tag in tags:
-            vectors = self.get_vector_embeddings(tag)
+            vectors = cached_vectors.get(tag) or new_vectors.get(tag)
             if not vectors:
                 tagVectorDict[tag] = {"vectors": []}
                 print(f"ERROR -- no vectors for tag: {tag} vector response: {vectors}")
@@ -52,86 +182,143 @@ class LlmLib(ABC):
                 tagVectorDict[tag] = {"vectors": vectors}
         return tagVectorDict
 
-    ###############################################################################################
-    ########################################## Prompts ############################################
-    ###############################################################################################
-    def conversation_to_metadata(self, conversation: Conversation, generateEmbeddings=False) -> RawMetadata|None:
-        convo_xml, participants = Utils.generate_convo_xml(conversation)
+    def _get_embedding_namespace(self) -> tuple:
+        """
+        Identifies the embedding space of this backend for the embedding cache.
+        """
+        return (type(self).__name__, self.embedding_model, self.embedding_dimensions)
 
-        if conversation.input_categories and 'coding' in conversation.input_categories:
-            prompt = prompt_manager.conversation_to_metadata_coding_prompt(convo_xml)
-        else:
-            prompt = prompt_manager.conversation_to_metadata_prompt(convo_xml)
-            
-        response_content = self.basic_prompt(prompt)
+    def _get_embedding_batches(self, tags: List[str]) -> List[List[str]]:
+        """
+        Splits tags into batches that respect embedding_batch_max_inputs and embedding_batch_max_tokens.
+        Token counts are estimated at ~4 characters per token.
+        """
+        batches = []
+        batch = []
+        batch_tokens = 0
+        for tag in tags:
+            tag_tokens = len(tag) // 4 + 1
+            if batch and (len(batch) >= self.embedding_batch_max_inputs or batch_tokens + tag_tokens > self.embedding_batch_max_tokens):
+                batches.append(batch)
+                batch = []
+                batch_tokens = 0
+            batch.append(tag)
+            batch_tokens += tag_tokens
+        if batch:
+            batches.append(batch)
+        return batches
 
+    # Prompt building and response parsing shared by the sync and async prompts below
+    def _parse_tags(self, response_content, empty_message: str = "No tags returned") -> List[str]|None:
         if not isinstance(response_content, str):
             print("Error: Unexpected response format. Content type:", type(response_content))
             return None
-        
         tags = Utils.clean_tags(response_content.split(","))
         if Utils.empty(tags):
-            print("No tags returned")
+            print(empty_message)
+            return None
+        return tags
+
+    def _prompt_to_metadata(self, prompt: str, generateEmbeddings=False, empty_message: str = "No tags returned") -> RawMetadata|None:
+        tags = self._parse_tags(self.basic_prompt(prompt), empty_message)
+        if tags is None:
             return None
-        
+
         vectors = None
         if generateEmbeddings:
             vectors = self.get_vector_embeddings_set(tags)
-
         return RawMetadata(tags=tags, vectors=vectors, success=True)
-    
-
 
-    def raw_transcript_to_named_entities(self, raw_transcript: str, generateEmbeddings=False) -> RawMetadata|None:
-        prompt = prompt_manager.raw_transcript_to_named_entities_prompt(raw_transcript)
-        response_content = self.basic_prompt(prompt)
-        if not isinstance(response_content, str):
-            print("Error: Unexpected response format. Content type:", type(response_content))
-            return None
-        tags = Utils.clean_tags(response_content.split(","))
-        if Utils.empty(tags):
-            print("No tags returned")
+    async def _aprompt_to_metadata(self, prompt: str, generateEmbeddings=False, empty_message: str = "No tags returned") -> RawMetadata|None:
+        tags = self._parse_tags(await self.abasic_prompt(prompt), empty_message)
+        if tags is None:
             return None
-        
+
         vectors = None
         if generateEmbeddings:
-            vectors = self.get_vector_embeddings_set(tags)
+            vectors = await self.aget_vector_embeddings_set(tags)
         return RawMetadata(tags=tags, vectors=vectors, success=True)
 
+    def _get_conversation_to_metadata_prompt(self, conversation: Conversation) -> str:
+        convo_xml, participants = Utils.generate_convo_xml(conversation)
 
-    def raw_webpage_to_named_entities(self, raw_webpage: str, generateEmbeddings=False) -> RawMetadata|None:
-        prompt = prompt_manager.raw_webpage_to_named_entities_prompt(raw_webpage)
-        response_content = self.basic_prompt(prompt)
-        if not isinstance(response_content, str):
-            print("Error: Unexpected response format. Content type:", type(response_content))
+        if conversation.input_categories and 'coding' in conversation.input_categories:
+            return prompt_manager.conversation_to_metadata_coding_prompt(convo_xml)
+        return prompt_manager.conversation_to_metadata_prompt(convo_xml)
+
+    def _parse_conversation_quality(self, response_content) -> ConversationQualityMetadata | None:
+        try:
+            return ConversationQualityMetadata(**json.loads(response_content))
+        except json.JSONDecodeError as e:
+            print("Error parsing LLM reply as ConversationQualityMetadata")
             return None
-        tags = Utils.clean_tags(response_content.split(","))
-        if Utils.empty(tags):
-            print("No tags returned")
+
+    def _get_validate_tags_sample(self, tags: List[str]) -> List[str]:
+        clean_tag_list = Utils.get_clean_tag_set(tags)
+        if len(clean_tag_list) >= 20:
+            random_indices = random.sample(range(len(clean_tag_list)), 20)
+            clean_tag_list = [clean_tag_list[i] for i in random_indices]
+        return clean_tag_list
+
+    def _get_validate_tags_prompt(self, tags: List[str]) -> str:
+        return prompt_manager.validate_tags_prompt([tag[:50] for tag in tags])
+
+    def _parse_valid_tags(self, response_content, tags: List[str]) -> List[str] | None:
+        if not response_content:
+            print(f"EMPTY RESPONSE -- no valid tags: {response_content}")
             return None
-        
-        vectors = None
-        if generateEmbeddings:
-            vectors = self.get_vector_embeddings_set(tags)
-        return RawMetadata(tags=tags, vectors=vectors, success=True)
-    
+
+        content_str = response_content.lower()
+        malformed_pos = content_str.find("malformed")
+        good_keywords_str = content_str[0:malformed_pos].replace("good english keywords:", "").replace("***", "").replace("\n", "").strip()
+        valid_tags = good_keywords_str.split(",")
+        valid_tags = Utils.get_clean_tag_set(valid_tags)
+        return [element for element in valid_tags if element in tags]
+
+    def _get_cached_verdicts(self, tags: List[str]) -> dict:
+        if not self.tag_validation_cache:
+            return {}
+        return self.tag_validation_cache.get_many(self._get_validation_namespace(), tags)
+
+    def _merge_tag_verdicts(self, tags: List[str], sample: List[str], cached_verdicts: dict, unchecked: List[str], response_content) -> List[str] | None:
+        """
+        Combines cached verdicts with the verdicts parsed from the validation response for the unchecked tags.
+        Returns the good tags of the sample that are also in tags, or None if the validation prompt failed.
+        """
+        verdicts = dict(cached_verdicts)
+        if unchecked:
+            good_tags = self._parse_valid_tags(response_content, unchecked)
+            if good_tags is None:
+                return None
+            new_verdicts = {tag: tag in good_tags for tag in unchecked}
+            if self.tag_validation_cache:
+                self.tag_validation_cache.put_many(self._get_validation_namespace(), new_verdicts)
+            verdicts.update(new_verdicts)
+        return [tag for tag in sample if verdicts.get(tag) and tag in tags]
+
+    def _get_validation_namespace(self) -> tuple:
+        """
+        Identifies the model that judged the tags for the tag validation cache.
+        """
+        return (type(self).__name__, self.model)
+
+    ###############################################################################################
+    ########################################## Prompts ############################################
+    ###############################################################################################
+    def conversation_to_metadata(self, conversation: Conversation, generateEmbeddings=False) -> RawMetadata|None:
+        return self._prompt_to_metadata(self._get_conversation_to_metadata_prompt(conversation), generateEmbeddings)
+
+    def raw_transcript_to_named_entities(self, raw_transcript: str, generateEmbeddings=False) -> RawMetadata|None:
+        prompt = prompt_manager.raw_transcript_to_named_entities_prompt(raw_transcript)
+        return self._prompt_to_metadata(prompt, generateEmbeddings)
+
+    def raw_webpage_to_named_entities(self, raw_webpage: str, generateEmbeddings=False) -> RawMetadata|None:
+        prompt = prompt_manager.raw_webpage_to_named_entities_prompt(raw_webpage)
+        return self._prompt_to_metadata(prompt, generateEmbeddings)
 
     def combine_named_entities(self, named_entities:list, generateEmbeddings=False) -> RawMetadata|None:
         prompt = prompt_manager.combine_named_entities_prompt(named_entities)
-        response_content = self.basic_prompt(prompt)
-        if not isinstance(response_content, str):
-            print("Error: Unexpected response format. Content type:", type(response_content))
-            return None
-        tags = Utils.clean_tags(response_content.split(","))
-        if Utils.empty(tags):
-            print("No tags returned")
-            return None
-        
-        vectors = None
-        if generateEmbeddings:
-            vectors = self.get_vector_embeddings_set(tags)
-        return RawMetadata(tags=tags, vectors=vectors, success=True)
-
+        return self._prompt_to_metadata(prompt, generateEmbeddings)
 
     def survey_to_metadata(self, survey_question: str, comment:str) -> RawMetadata|None:
         prompt = prompt_manager.survey_tag_prompt(survey_question, comment)
@@ -150,32 +337,15 @@ class LlmLib(ABC):
     def validate_conversation_quality(self, conversation: Conversation) -> ConversationQualityMetadata | None:
         conversation_xml, _ = Utils.generate_convo_xml(conversation)
         prompt = prompt_manager.conversation_quality_prompt(transcript_text=conversation_xml)
-        response_content = self.basic_prompt(prompt, response_format="json")
-        try:
-            return ConversationQualityMetadata(**json.loads(response_content))
-        except json.JSONDecodeError as e:
-            print("Error parsing LLM reply as ConversationQualityMetadata")
-            return None
-        
+        return self._parse_conversation_quality(self.basic_prompt(prompt, response_format="json"))
+
     def validate_tag_set(self, tags: List[str]) -> List[str] | None:
-        clean_tag_list = Utils.get_clean_tag_set(tags)
-        if len(clean_tag_list) >= 20:
-            random_indices = random.sample(range(len(clean_tag_list)), 20)
-            clean_tag_list = [clean_tag_list[i] for i in random_indices]
-        clean_tag_list = [tag[:50] for tag in clean_tag_list]
-        prompt = prompt_manager.validate_tags_prompt(clean_tag_list)
-        response_content = self.basic_prompt(prompt)
-        if len(response_content) == 0:
-            print(f"EMPTY RESPONSE -- no valid tags: {response_content}")
-            return None
-        
-        content_str = response_content.lower()
-        malformed_pos = content_str.find("malformed")
-        good_keywords_str = content_str[0:malformed_pos].replace("good english keywords:", "").replace("***", "").replace("\n", "").strip()
-        valid_tags = good_keywords_str.split(",")
-        valid_tags = Utils.get_clean_tag_set(valid_tags)
-        return [element for element in valid_tags if element in tags]
-    
+        sample = self._get_validate_tags_sample(tags)
+        cached_verdicts = self._get_cached_verdicts(sample)
+        # Only tags without a cached verdict go to the LLM
+        unchecked = [tag for tag in sample if tag not in cached_verdicts]
+        response_content = self.basic_prompt(self._get_validate_tags_prompt(unchecked)) if unchecked else None
+        return self._merge_tag_verdicts(tags, sample, cached_verdicts, unchecked, response_content)
 
     def validate_named_entities_tag_set(self, tags: List[str]) -> List[str] | None:
         # Only perform a basic filtering for named_entities
@@ -190,103 +360,130 @@ class LlmLib(ABC):
             prompt = prompt_manager.website_to_metadata_coding_prompt(website_content)
         else:
             prompt = prompt_manager.website_to_metadata_prompt(website_content)
-        response_content = self.basic_prompt(prompt)
-        if not isinstance(response_content, str):
-            print("Error: Unexpected response format. Content type:", type(response_content))
-            return None
-        tags = Utils.clean_tags(response_content.split(","))
-        if Utils.empty(tags):
-            print("No tags returned")
-            return None
-        
-        vectors = None
-        if generateEmbeddings:
-            vectors = self.get_vector_embeddings_set(tags)
-        return RawMetadata(tags=tags, vectors=vectors, success=True)
+        return self._prompt_to_metadata(prompt, generateEmbeddings)
 
     def enrichment_to_metadata(self, enrichment_content: str, generateEmbeddings=False, input_categories=None) -> RawMetadata|None:
         if input_categories and 'coding' in input_categories:
             prompt = prompt_manager.enrichment_to_metadata_coding_prompt(enrichment_content)
         else:
             prompt = prompt_manager.enrichment_to_metadata_prompt(enrichment_content)
-        response_content = self.basic_prompt(prompt)
-        if not isinstance(response_content, str):
-            print("Error: Unexpected response format. Content type:", type(response_content))
-            return None
-        tags = Utils.clean_tags(response_content.split(","))
-        if Utils.empty(tags):
-            print("No tags returned")
-            return None
-        
-        vectors = None
-        if generateEmbeddings:
-            vectors = self.get_vector_embeddings_set(tags)
-        return RawMetadata(tags=tags, vectors=vectors, success=True)
+        return self._prompt_to_metadata(prompt, generateEmbeddings)
 
     def enrichment_to_NER(self, enrichment_content: str, generateEmbeddings=False) -> RawMetadata|None:
         """Extract named entities from enrichment content (title/snippet)."""
         prompt = prompt_manager.enrichment_to_named_entities_prompt(enrichment_content)
-        response_content = self.basic_prompt(prompt)
-        if not isinstance(response_content, str):
-            print("Error: Unexpected response format. Content type:", type(response_content))
-            return None
-        tags = Utils.clean_tags(response_content.split(","))
-        if Utils.empty(tags):
-            print("No named entities returned")
-            return None
-        
-        vectors = None
-        if generateEmbeddings:
-            vectors = self.get_vector_embeddings_set(tags)
-        return RawMetadata(tags=tags, vectors=vectors, success=True)
+        return self._prompt_to_metadata(prompt, generateEmbeddings, empty_message="No named entities returned")
 
     def combine_metadata_tags(self, metadata_tags: list, generateEmbeddings=False) -> RawMetadata|None:
         if not metadata_tags:
             return None
         prompt = prompt_manager.combine_named_entities_prompt(metadata_tags)
-        response_content = self.basic_prompt(prompt)
+        return self._prompt_to_metadata(prompt, generateEmbeddings)
+
+    ###############################################################################################
+    ####################################### Async prompts #########################################
+    ###############################################################################################
+    # Same prompts and parsing as above, awaiting abasic_prompt/aget_vector_embeddings_set instead
+    async def aconversation_to_metadata(self, conversation: Conversation, generateEmbeddings=False) -> RawMetadata|None:
+        return await self._aprompt_to_metadata(self._get_conversation_to_metadata_prompt(conversation), generateEmbeddings)
+
+    async def araw_transcript_to_named_entities(self, raw_transcript: str, generateEmbeddings=False) -> RawMetadata|None:
+        prompt = prompt_manager.raw_transcript_to_named_entities_prompt(raw_transcript)
+        return await self._aprompt_to_metadata(prompt, generateEmbeddings)
+
+    async def araw_webpage_to_named_entities(self, raw_webpage: str, generateEmbeddings=False) -> RawMetadata|None:
+        prompt = prompt_manager.raw_webpage_to_named_entities_prompt(raw_webpage)
+        return await self._aprompt_to_metadata(prompt, generateEmbeddings)
+
+    async def acombine_named_entities(self, named_entities:list, generateEmbeddings=False) -> RawMetadata|None:
+        prompt = prompt_manager.combine_named_entities_prompt(named_entities)
+        return await self._aprompt_to_metadata(prompt, generateEmbeddings)
+
+    async def asurvey_to_metadata(self, survey_question: str, comment:str) -> RawMetadata|None:
+        prompt = prompt_manager.survey_tag_prompt(survey_question, comment)
+        response_content = await self.abasic_prompt(prompt)
         if not isinstance(response_content, str):
             print("Error: Unexpected response format. Content type:", type(response_content))
             return None
-        tags = Utils.clean_tags(response_content.split(","))
-        if Utils.empty(tags):
-            print("No tags returned")
+        try:
+            tags = Utils.clean_tags(response_content.split(","))
+            vectors = await self.aget_vector_embeddings_set(tags)
+        except Exception as e:
+            print("Error: Error generating vectors")
             return None
-        
-        vectors = None
-        if generateEmbeddings:
-            vectors = self.get_vector_embeddings_set(tags)
         return RawMetadata(tags=tags, vectors=vectors, success=True)
 
+    async def avalidate_conversation_quality(self, conversation: Conversation) -> ConversationQualityMetadata | None:
+        conversation_xml, _ = Utils.generate_convo_xml(conversation)
+        prompt = prompt_manager.conversation_quality_prompt(transcript_text=conversation_xml)
+        return self._parse_conversation_quality(await self.abasic_prompt(prompt, response_format="json"))
+
+    async def avalidate_tag_set(self, tags: List[str]) -> List[str] | None:
+        sample = self._get_validate_tags_sample(tags)
+        cached_verdicts = self._get_cached_verdicts(sample)
+        unchecked = [tag for tag in sample if tag not in cached_verdicts]
+        response_content = await self.abasic_prompt(self._get_validate_tags_prompt(unchecked)) if unchecked else None
+        return self._merge_tag_verdicts(tags, sample, cached_verdicts, unchecked, response_content)
+
+    async def awebsite_to_metadata(self, website_content: str, generateEmbeddings=False, input_categories=None) -> RawMetadata|None:
+        if input_categories and 'coding' in input_categories:
+            prompt = prompt_manager.website_to_metadata_coding_prompt(website_content)
+        else:
+            prompt = prompt_manager.website_to_metadata_prompt(website_content)
+        return await self._aprompt_to_metadata(prompt, generateEmbeddings)
+
+    async def aenrichment_to_metadata(self, enrichment_content: str, generateEmbeddings=False, input_categories=None) -> RawMetadata|None:
+        if input_categories and 'coding' in input_categories:
+            prompt = prompt_manager.enrichment_to_metadata_coding_prompt(enrichment_content)
+        else:
+            prompt = prompt_manager.enrichment_to_metadata_prompt(enrichment_content)
+        return await self._aprompt_to_metadata(prompt, generateEmbeddings)
+
+    async def aenrichment_to_NER(self, enrichment_content: str, generateEmbeddings=False) -> RawMetadata|None:
+        prompt = prompt_manager.enrichment_to_named_entities_prompt(enrichment_content)
+        return await self._aprompt_to_metadata(prompt, generateEmbeddings, empty_message="No named entities returned")
+
+    async def acombine_metadata_tags(self, metadata_tags: list, generateEmbeddings=False) -> RawMetadata|None:
+        if not metadata_tags:
+            return None
+        prompt = prompt_manager.combine_named_entities_prompt(metadata_tags)
+        return await self._aprompt_to_metadata(prompt, generateEmbeddings)
+
 ###############################################################################################
 ##################################### Override decorators #####################################
 ###############################################################################################
 # Used to override default model/embedding-model for specific prompts/functions
-# Takes a model name as an argument and sets it temporarily
-def model_override(model_name: str):
-    def decorator_model_override(func):
+# Takes a model name as an argument and sets it for the duration of the call. Works on both
+# sync and async methods; the override is only visible to the decorated call.
+def _attr_override(attr: str, value: str):
+    def decorator_attr_override(func):
+        def set_override(self: LlmLib):
+            overrides = dict(_ATTR_OVERRIDES.get())
+            overrides[(id(self), attr)] = value
+            return _ATTR_OVERRIDES.set(overrides)
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self: LlmLib, *args, **kwargs):
+                token = set_override(self)
+                try:
+                    return await func(self, *args, **kwargs)
+                finally:
+                    _ATTR_OVERRIDES.reset(token)
+            return async_wrapper
+
         @functools.wraps(func)
         def wrapper(self: LlmLib, *args, **kwargs):
-            default_model = self.model
-            self.model = model_name
+            token = set_override(self)
             try:
-                res = func(self, *args, **kwargs)
+                return func(self, *args, **kwargs)
             finally:
-                self.model = default_model
-            return res
+                _ATTR_OVERRIDES.reset(token)
         return wrapper
-    return decorator_model_override
+    return decorator_attr_override
+
+def model_override(model_name: str):
+    return _attr_override("model", model_name)
 
 def embedding_model_override(embedding_model_name: str):
-    def decorator_model_override(func):
-        @functools.wraps(func)
-        def wrapper(self: LlmLib, *args, **kwargs):
-            default_model = self.embedding_model
-            self.embedding_model = embedding_model_name
-            try:
-                res = func(self, *args, **kwargs)
-            finally:
-                self.model = default_model
-            return res
-        return wrapper
-    return decorator_model_override
+    return _attr_override("embedding_model", embedding_model_name)
@@ -0,0 +1,243 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from conversationgenome.ConfigLib import c
+from conversationgenome.utils.Utils import Utils
+
+# (provider, embedding model, dimensions)
+EmbeddingNamespace = Tuple[str, Optional[str], Optional[int]]
+
+
+class EmbeddingCache:
+    """
+    Content-addressed cache for tag embeddings.
+
+    Entries are keyed by (provider, embedding model, dimensions, normalized tag). Recently used vectors
+    are kept in an in-memory LRU; all vectors are persisted as float32 blobs in SQLite so they survive
+    restarts. Both tiers are size capped and evict their least recently used entries.
+
+    aget_many() and aput_many() are for the event loop: the memory tier is read and written inline, the SQLite
+    tier in a worker thread. The two tiers have their own locks, so a slow disk access never holds up the memory tier.
+    """
+
+    def __init__(self, path: Optional[str] = None, memory_size: int = 10000, disk_size: int = 200000):
+        self.path = path
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        # _lock guards the memory tier and the counters, _db_lock the SQLite connection
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def normalize_tag(tag: str) -> str:
+        return " ".join(tag.lower().split())
+
+    @staticmethod
+    def make_key(namespace: EmbeddingNamespace, tag: str) -> str:
+        provider, embedding_model, dimensions = namespace
+        return f"{provider}|{embedding_model}|{dimensions}|{EmbeddingCache.normalize_tag(tag)}"
+
+    def get_many(self, namespace: EmbeddingNamespace, tags: List[str]) -> Dict[str, List[float]]:
+        """
+        Returns the cached vectors for tags, keyed by the tag as passed in. Tags that are not cached are omitted.
+        """
+        found, disk_lookups = self._memory_get_many(namespace, tags)
+        if disk_lookups:
+            found.update(self._disk_get_many(disk_lookups))
+        return found
+
+    async def aget_many(self, namespace: EmbeddingNamespace, tags: List[str]) -> Dict[str, List[float]]:
+        """
+        Same as get_many, the disk lookups run in a worker thread.
+        """
+        found, disk_lookups = self._memory_get_many(namespace, tags)
+        if disk_lookups:
+            found.update(await asyncio.to_thread(self._disk_get_many, disk_lookups))
+        return found
+
+    def put_many(self, namespace: EmbeddingNamespace, tag_vectors: Dict[str, List[float]]) -> None:
+        entries = self._memory_put_many(namespace, tag_vectors)
+        if entries:
+            self._disk_put_locked(entries)
+
+    async def aput_many(self, namespace: EmbeddingNamespace, tag_vectors: Dict[str, List[float]]) -> None:
+        """
+        Same as put_many, the disk write runs in a worker thread.
+        """
+        entries = self._memory_put_many(namespace, tag_vectors)
+        if entries and self.path:
+            await asyncio.to_thread(self._disk_put_locked, entries)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        with self._db_lock:
+            db = self._get_db()
+            if db:
+                db.execute("DELETE FROM embeddings")
+                db.commit()
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._db:
+                self._db.close()
+                self._db = None
+
+    def _memory_get_many(self, namespace: EmbeddingNamespace, tags: List[str]) -> Tuple[Dict[str, List[float]], Dict[str, str]]:
+        """
+        Returns the vectors found in memory keyed by tag, and the cache keys of the other tags mapped to their tag.
+        """
+        found = {}
+        disk_lookups = {}
+        with self._lock:
+            for tag in tags:
+                key = self.make_key(namespace, tag)
+                vectors = self._memory.get(key)
+                if vectors is not None:
+                    self._memory.move_to_end(key)
+                    found[tag] = vectors
+                    self.hits += 1
+                else:
+                    disk_lookups[key] = tag
+            if not self.path:
+                self.misses += len(disk_lookups)
+                disk_lookups = {}
+        return found, disk_lookups
+
+    def _disk_get_many(self, disk_lookups: Dict[str, str]) -> Dict[str, List[float]]:
+        with self._db_lock:
+            disk_found = self._disk_get(list(disk_lookups.keys()))
+        found = {}
+        with self._lock:
+            for key, vectors in disk_found.items():
+                found[disk_lookups[key]] = vectors
+                self._memory_put(key, vectors)
+            self.disk_hits += len(disk_found)
+            self.misses += len(disk_lookups) - len(disk_found)
+        return found
+
+    def _memory_put_many(self, namespace: EmbeddingNamespace, tag_vectors: Dict[str, List[float]]) -> Dict[str, List[float]]:
+        entries = {self.make_key(namespace, tag): vectors for tag, vectors in tag_vectors.items() if vectors}
+        if entries:
+            with self._lock:
+                for key, vectors in entries.items():
+                    self._memory_put(key, vectors)
+        return entries
+
+    def _disk_put_locked(self, entries: Dict[str, List[float]]) -> None:
+        with self._db_lock:
+            self._disk_put(entries)
+
+    def _memory_put(self, key: str, vectors: List[float]) -> None:
+        self._memory[key] = vectors
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _get_db(self) -> Optional[sqlite3.Connection]:
+        # The database is opened lazily so constructing a backend never touches the filesystem
+        if self._db is not None or not self.path:
+            return self._db
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_access REAL NOT NULL)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS embeddings_last_access ON embeddings (last_access)")
+            self._db.commit()
+        except Exception as e:
+            print(f"ERROR -- could not open embedding cache at {self.path}: {e}. Using memory only.")
+            self.path = None
+            self._db = None
+        return self._db
+
+    def _disk_get(self, keys: List[str]) -> Dict[str, List[float]]:
+        db = self._get_db()
+        if not db:
+            return {}
+        found = {}
+        try:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = db.execute(f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+            if found:
+                now = time.time()
+                db.executemany("UPDATE embeddings SET last_access = ? WHERE key = ?", [(now, key) for key in found])
+                db.commit()
+        except Exception as e:
+            print(f"ERROR -- embedding cache read failed: {e}")
+        return found
+
+    def _disk_put(self, entries: Dict[str, List[float]]) -> None:
+        db = self._get_db()
+        if not db:
+            return
+        try:
+            now = time.time()
+            db.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_access) VALUES (?, ?, ?)",
+                [(key, np.asarray(vectors, dtype=np.float32).tobytes(), now) for key, vectors in entries.items()],
+            )
+            count = db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            if count > self.disk_size:
+                # Evict a tenth of the capacity at once so we don't prune on every insert
+                overflow = count - self.disk_size + max(1, self.disk_size // 10)
+                db.execute("DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY last_access ASC LIMIT ?)", (overflow,))
+                self.evictions += overflow
+            db.commit()
+        except Exception as e:
+            print(f"ERROR -- embedding cache write failed: {e}")
+
+
+_EMBEDDING_CACHE: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """
+    Returns the process-wide embedding cache, or None if it is disabled with EMBEDDING_CACHE_ENABLED=0.
+    """
+    global _EMBEDDING_CACHE
+    if _EMBEDDING_CACHE is not None:
+        return _EMBEDDING_CACHE
+
+    if str(c.get("env", "EMBEDDING_CACHE_ENABLED", "1")).lower() in ("0", "false", "no"):
+        return None
+
+    path = c.get("env", "EMBEDDING_CACHE_PATH", "~/.bittensor/cgp/embedding_cache.sqlite3")
+    _EMBEDDING_CACHE = EmbeddingCache(
+        path=os.path.expanduser(path) if path else None,
+        memory_size=Utils._int(c.get("env", "EMBEDDING_CACHE_MEMORY_SIZE", 10000), 10000),
+        disk_size=Utils._int(c.get("env", "EMBEDDING_CACHE_DISK_SIZE", 200000), 200000),
+    )
+    return _EMBEDDING_CACHE
@@ -1,8 +1,10 @@
 from typing import List
 
-from anthropic import Anthropic
+from anthropic import Anthropic, AsyncAnthropic
 from conversationgenome.ConfigLib import c
-from conversationgenome.llm.llm_openai import LlmOpenAI
+from conversationgenome.llm.embedding_cache import get_embedding_cache
+from conversationgenome.llm.llm_factory import get_llm_backend
+from conversationgenome.llm.tag_validation_cache import get_tag_validation_cache
 
 from .LlmLib import LlmLib
 
@@ -12,17 +14,16 @@ class LlmAnthropic(LlmLib):
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY environment variable not set. Please set it in the .env file or as an environment variable.")
 
+        self.api_key = api_key
         self.client = Anthropic(api_key=api_key)
         self.model = c.get("env", "ANTHROPIC_MODEL", "claude-3-sonnet-20240229")
+        self.embedding_cache = get_embedding_cache()
+        self.tag_validation_cache = get_tag_validation_cache()
 
     def basic_prompt(self, prompt: str, response_format: str = "text") -> str:
         # Anthropic does not currently support "response_format"        
         try:
-            message = self.client.messages.create(
-                max_tokens=1024,
-                messages=[{"role": "user", "content": prompt}],
-                model=self.model,
-            )
+            message = self.client.messages.create(**self._get_message_params(prompt))
             return message.content[0].text
         except Exception as e:
             print(f"Anthropic Messages Error")
@@ -30,7 +31,43 @@ class LlmAnthropic(LlmLib):
             # print(e)
             return None
 
-    def get_vector_embeddings_set(self, tag: str) -> List[float]:
+    def get_vector_embeddings(self, tag: str) -> List[float]:
         # Anthropic currently does not support generating embeddings. We fallback to openAI for now.
-        llml = LlmOpenAI()
-        return llml.get_vector_embeddings(tag)
+        return self._get_embedding_backend().get_vector_embeddings(tag)
+
+    def get_vector_embeddings_batch(self, tags: List[str]) -> List[List[float]|None]|None:
+        # Anthropic currently does not support generating embeddings. We fallback to openAI for now.
+        return self._get_embedding_backend().get_vector_embeddings_batch(tags)
+
+    async def abasic_prompt(self, prompt: str, response_format: str = "text") -> str:
+        try:
+            message = await self._get_async_client().messages.create(**self._get_message_params(prompt))
+            return message.content[0].text
+        except Exception as e:
+            print(f"Anthropic Messages Error")
+            # Uncomment the line below for debugging purposes
+            # print(e)
+            return None
+
+    async def aget_vector_embeddings(self, tag: str) -> List[float]:
+        return await self._get_embedding_backend().aget_vector_embeddings(tag)
+
+    async def aget_vector_embeddings_batch(self, tags: List[str]) -> List[List[float]|None]|None:
+        return await self._get_embedding_backend().aget_vector_embeddings_batch(tags)
+
+    def _create_async_client(self, name: str):
+        return AsyncAnthropic(api_key=self.api_key)
+
+    def _get_message_params(self, prompt: str) -> dict:
+        return {
+            "max_tokens": 1024,
+            "messages": [{"role": "user", "content": prompt}],
+            "model": self.model,
+        }
+
+    def _get_embedding_backend(self) -> LlmLib:
+        return get_llm_backend("openai")
+
+    def _get_embedding_namespace(self) -> tuple:
+        # The vectors come from the embedding backend, share its cache entries
+        return self._get_embedding_backend()._get_embedding_namespace()
@@ -1,37 +1,41 @@
 import requests
 from typing import List
-from openai import OpenAI
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
 
 from conversationgenome.ConfigLib import c
+from conversationgenome.llm.embedding_cache import get_embedding_cache
 from conversationgenome.llm.LlmLib import LlmLib
+from conversationgenome.llm.tag_validation_cache import get_tag_validation_cache
 
 
 class LlmChutes(LlmLib):
+    base_url = "https://llm.chutes.ai/v1"
+    embedding_batch_max_inputs = 128
+    embedding_batch_max_tokens = 32000
+
     def __init__(self):
         self.api_key = c.get('env', "CHUTES_API_KEY")
         if not self.api_key:
             raise ValueError("CHUTES_API_KEY environment variable not set. Please set it in the .env file or as an environment variable.")
         
         self.client = OpenAI(
-            base_url="https://llm.chutes.ai/v1",
+            base_url=self.base_url,
             api_key=self.api_key
         )
         self.model = c.get('env', "CHUTES_MODEL", "deepseek-ai/DeepSeek-V3")
         self.embedding_url = c.get('env', "CHUTES_EMBEDDING_URL", "https://chutes-qwen-qwen3-embedding-8b.chutes.ai/v1/embeddings")
+        self.embedding_cache = get_embedding_cache()
+        self.tag_validation_cache = get_tag_validation_cache()
 
 
     ###############################################################################################
     ################################## Abstract methods override ##################################
     ###############################################################################################
     def basic_prompt(self, prompt: str, response_format: str = "text") -> str|None:
-        api_format = {"type": "json_object"} if response_format == "json" else None
-        
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                response_format=api_format,
-            )
+            response = self.client.chat.completions.create(**self._get_completion_params(prompt, response_format))
             return response.choices[0].message.content or ""
         except Exception as e:
             print(f"Chutes Completion Error")
@@ -42,10 +46,7 @@ class LlmChutes(LlmLib):
     def get_vector_embeddings(self, tag: str, dimensions=1536) -> List[float]|None:
         tag = tag.replace("\n", " ")
         try:
-            headers = {
-                "Authorization": "Bearer " + self.api_key,
-                "Content-Type": "application/json"
-            }
+            headers = self._get_embedding_headers()
             
             body = {
                 "input": tag,
@@ -69,3 +70,95 @@ class LlmChutes(LlmLib):
             print(f"Chutes Embedding Error")
             # print(e)
             return None
+
+    def get_vector_embeddings_batch(self, tags: List[str], dimensions=1536) -> List[List[float]|None]|None:
+        tags = [tag.replace("\n", " ") for tag in tags]
+        try:
+            body = {
+                "input": tags,
+                "model": None
+            }
+
+            response = requests.post(
+                self.embedding_url,
+                headers=self._get_embedding_headers(),
+                json=body
+            )
+
+            if response.status_code == 200:
+                return self._get_batch_vectors(response.json(), len(tags))
+            else:
+                print(f"Chutes Embedding Error: Status {response.status_code}")
+                # print(response.text)
+                return None
+        except Exception as e:
+            print(f"Chutes Embedding Error")
+            # print(e)
+            return None
+
+
+    ###############################################################################################
+    #################################### Async methods override ###################################
+    ###############################################################################################
+    async def abasic_prompt(self, prompt: str, response_format: str = "text") -> str|None:
+        try:
+            response = await self._get_async_client().chat.completions.create(**self._get_completion_params(prompt, response_format))
+            return response.choices[0].message.content or ""
+        except Exception as e:
+            print(f"Chutes Completion Error")
+            # Uncomment the line below for debugging purposes
+            # print(e)
+            return None
+
+    async def aget_vector_embeddings(self, tag: str, dimensions=1536) -> List[float]|None:
+        vectors = await self.aget_vector_embeddings_batch([tag], dimensions=dimensions)
+        return vectors[0] if vectors else None
+
+    async def aget_vector_embeddings_batch(self, tags: List[str], dimensions=1536) -> List[List[float]|None]|None:
+        tags = [tag.replace("\n", " ") for tag in tags]
+        try:
+            response = await self._get_async_client("embeddings").post(
+                self.embedding_url,
+                headers=self._get_embedding_headers(),
+                json={"input": tags, "model": None}
+            )
+
+            if response.status_code == 200:
+                return self._get_batch_vectors(response.json(), len(tags))
+            else:
+                print(f"Chutes Embedding Error: Status {response.status_code}")
+                # print(response.text)
+                return None
+        except Exception as e:
+            print(f"Chutes Embedding Error")
+            # print(e)
+            return None
+
+    def _create_async_client(self, name: str):
+        if name == "embeddings":
+            return httpx.AsyncClient(timeout=60)
+        return AsyncOpenAI(base_url=self.base_url, api_key=self.api_key)
+
+    def _get_completion_params(self, prompt: str, response_format: str) -> dict:
+        api_format = {"type": "json_object"} if response_format == "json" else None
+        return {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "response_format": api_format,
+        }
+
+    def _get_batch_vectors(self, result: dict, count: int) -> List[List[float]|None]:
+        vectors = [None] * count
+        for position, item in enumerate(result['data']):
+            vectors[item.get('index', position)] = item['embedding']
+        return vectors
+
+    def _get_embedding_namespace(self) -> tuple:
+        # Chutes selects the embedding model by endpoint rather than by model name
+        return (type(self).__name__, self.embedding_url, self.embedding_dimensions)
+
+    def _get_embedding_headers(self) -> dict:
+        return {
+            "Authorization": "Bearer " + self.api_key,
+            "Content-Type": "application/json"
+        }
@@ -1,34 +1,126 @@
+import threading
+import time
+
 from conversationgenome.ConfigLib import c
 from conversationgenome.llm.LlmLib import LlmLib
 
+# Env vars that select the chat model and the embedding model of each provider. Together with the
+# provider they identify a configured backend in the registry.
+PROVIDER_MODEL_KEYS = {
+    "openai": ("OPENAI_MODEL", None),
+    "anthropic": ("ANTHROPIC_MODEL", None),
+    "groq": ("GROQ_MODEL", None),
+    "openrouter": ("OPENROUTER_MODEL", "OPENROUTER_EMBEDDING_MODEL"),
+    "chutes": ("CHUTES_MODEL", "CHUTES_EMBEDDING_URL"),
+    "local_stub": ("LOCAL_STUB_MODEL", None),
+}
+
+
+class LlmBackendRegistry:
+    """
+    Process-wide cache of configured LLM backends, one per (provider, model, embedding model).
+    Reusing a backend reuses its HTTP clients and their keep-alive connections.
+    """
+
+    def __init__(self):
+        self._backends = {}
+        self._stats = {}
+        self._lock = threading.RLock()
+        self.created = 0
+        self.reused = 0
+
+    def get(self, llm_type_override=None) -> LlmLib:
+        provider = self.get_provider(llm_type_override)
+        key = self.get_key(provider)
+        with self._lock:
+            backend = self._backends.get(key)
+            if backend is not None:
+                self.reused += 1
+                self._stats[key]["reuses"] += 1
+                return backend
+
+            backend = self._create_backend(provider)
+            self._backends[key] = backend
+            self._stats[key] = {"created_at": time.time(), "reuses": 0}
+            self.created += 1
+            return backend
+
+    def reload(self, llm_type_override=None) -> None:
+        """
+        Drops cached backends so the next get() builds them from the current configuration.
+        Without an argument every backend is dropped.
+        """
+        with self._lock:
+            for key in list(self._backends.keys()):
+                if llm_type_override is None or key[0] == llm_type_override:
+                    del self._backends[key]
+                    del self._stats[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "created": self.created,
+                "reused": self.reused,
+                "backends": {"|".join(str(part) for part in key): dict(stats) for key, stats in self._stats.items()},
+            }
+
+    def get_provider(self, llm_type_override=None) -> str:
+        if not llm_type_override:
+            llm_type_override = c.get("env", "LLM_TYPE_OVERRIDE")
+        return llm_type_override or "openai"
+
+    def get_key(self, provider: str) -> tuple:
+        if provider not in PROVIDER_MODEL_KEYS:
+            raise ValueError(f"Unsupported LLM_PROVIDER: {provider}")
+        model_key, embedding_model_key = PROVIDER_MODEL_KEYS[provider]
+        model = c.get("env", model_key)
+        embedding_model = c.get("env", embedding_model_key) if embedding_model_key else None
+        return (provider, model, embedding_model)
+
+    def _create_backend(self, provider: str) -> LlmLib:
+        if provider == "openai":
+            from .llm_openai import LlmOpenAI
+            return LlmOpenAI()
+
+        elif provider == "anthropic":
+            from .llm_anthropic import LlmAnthropic
+            return LlmAnthropic()
+
+        elif provider == "groq":
+            from .llm_groq import LlmGroq
+            return LlmGroq()
+
+        elif provider == "openrouter":
+            from .llm_openrouter import LlmOpenRouter
+            return LlmOpenRouter()
+
+        elif provider == "chutes":
+            from .llm_chutes import LlmChutes
+            return LlmChutes()
+
+        elif provider == "local_stub":
+            from .llm_local_stub import LlmLocalStub
+            return LlmLocalStub()
+
+        else:
+            raise ValueError(f"Unsupported LLM_PROVIDER: {provider}")
+
+
+llm_backend_registry = LlmBackendRegistry()
+
 
 def get_llm_backend(llm_type_override=None) -> LlmLib:
     """
-    Factory function to return the specific LLM implementation 
+    Factory function to return the specific LLM implementation
     based on the LLM_PROVIDER environment variable.
+    Backends are cached process-wide, see LlmBackendRegistry.
     """
-    if not llm_type_override:
-        llm_type_override = c.get("env", "LLM_TYPE_OVERRIDE")
-
-    if llm_type_override == "openai" or not llm_type_override:
-        from .llm_openai import LlmOpenAI
-        return LlmOpenAI()
-    
-    elif llm_type_override == "anthropic":
-        from .llm_anthropic import LlmAnthropic
-        return LlmAnthropic()
-    
-    elif llm_type_override == "groq":
-        from .llm_groq import LlmGroq
-        return LlmGroq()
-    
-    elif llm_type_override == "openrouter":
-        from .llm_openrouter import LlmOpenRouter
-        return LlmOpenRouter()
-    
-    elif llm_type_override == "chutes":
-        from .llm_chutes import LlmChutes
-        return LlmChutes()
-    
-    else:
-        raise ValueError(f"Unsupported LLM_PROVIDER: {llm_type_override}")
+    return llm_backend_registry.get(llm_type_override)
+
+
+def reload_llm_backends(llm_type_override=None) -> None:
+    llm_backend_registry.reload(llm_type_override)
+
+
+def get_llm_backend_stats() -> dict:
+    return llm_backend_registry.stats()
@@ -1,9 +1,11 @@
 from typing import List
 
-from groq import Groq
+from groq import AsyncGroq, Groq
 
 from conversationgenome.ConfigLib import c
-from conversationgenome.llm.llm_openai import LlmOpenAI
+from conversationgenome.llm.embedding_cache import get_embedding_cache
+from conversationgenome.llm.llm_factory import get_llm_backend
+from conversationgenome.llm.tag_validation_cache import get_tag_validation_cache
 from .LlmLib import LlmLib
 
 
@@ -12,21 +14,18 @@ class LlmGroq(LlmLib):
         api_key = c.get('env', "GROQ_API_KEY")
         if not api_key:
             raise ValueError("GROQ_API_KEY environment variable not set. Please set it in the .env file or as an environment variable.")
+        self.api_key = api_key
         self.client = Groq(api_key=api_key)
         self.model = c.get("env", "GROQ_MODEL", "llama3-8b-8192")
+        self.embedding_cache = get_embedding_cache()
+        self.tag_validation_cache = get_tag_validation_cache()
 
     ###############################################################################################
     ################################## Abstract methods override ##################################
     ###############################################################################################
     def basic_prompt(self, prompt: str, response_format: str = "text") -> str:
-        # Groq supports the 'json_object' response format on specific models
-        api_format = {"type": "json_object"} if response_format == "json" else None
         try:
-            response = self.client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model=self.model,
-                response_format=api_format
-            )
+            response = self.client.chat.completions.create(**self._get_completion_params(prompt, response_format))
             return response.choices[0].message.content or ""
         except Exception as e:
             print(f"Groq Completion Error")
@@ -34,7 +33,48 @@ class LlmGroq(LlmLib):
             # print(e)
             return None
 
-    def get_vector_embeddings_set(self, tag: str) -> List[float]:
+    def get_vector_embeddings(self, tag: str) -> List[float]:
+        # Groq currently does not support generating embeddings. We fallback to openAI for now.
+        return self._get_embedding_backend().get_vector_embeddings(tag)
+
+    def get_vector_embeddings_batch(self, tags: List[str]) -> List[List[float]|None]|None:
         # Groq currently does not support generating embeddings. We fallback to openAI for now.
-        llml = LlmOpenAI()
-        return llml.get_vector_embeddings(tag)
+        return self._get_embedding_backend().get_vector_embeddings_batch(tags)
+
+    ###############################################################################################
+    #################################### Async methods override ###################################
+    ###############################################################################################
+    async def abasic_prompt(self, prompt: str, response_format: str = "text") -> str:
+        try:
+            response = await self._get_async_client().chat.completions.create(**self._get_completion_params(prompt, response_format))
+            return response.choices[0].message.content or ""
+        except Exception as e:
+            print(f"Groq Completion Error")
+            # Uncomment the line below for debugging purposes
+            # print(e)
+            return None
+
+    async def aget_vector_embeddings(self, tag: str) -> List[float]:
+        return await self._get_embedding_backend().aget_vector_embeddings(tag)
+
+    async def aget_vector_embeddings_batch(self, tags: List[str]) -> List[List[float]|None]|None:
+        return await self._get_embedding_backend().aget_vector_embeddings_batch(tags)
+
+    def _create_async_client(self, name: str):
+        return AsyncGroq(api_key=self.api_key)
+
+    def _get_completion_params(self, prompt: str, response_format: str) -> dict:
+        # Groq supports the 'json_object' response format on specific models
+        api_format = {"type": "json_object"} if response_format == "json" else None
+        return {
+            "messages": [{"role": "user", "content": prompt}],
+            "model": self.model,
+            "response_format": api_format,
+        }
+
+    def _get_embedding_backend(self) -> LlmLib:
+        return get_llm_backend("openai")
+
+    def _get_embedding_namespace(self) -> tuple:
+        # The vectors come from the embedding backend, share its cache entries
+        return self._get_embedding_backend()._get_embedding_namespace()
@@ -0,0 +1,324 @@
+import asyncio
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable
+from typing import List
+
+import numpy as np
+
+from conversationgenome.ConfigLib import c
+from conversationgenome.llm.embedding_cache import get_embedding_cache
+from conversationgenome.llm.LlmLib import LlmLib
+from conversationgenome.llm.tag_validation_cache import get_tag_validation_cache
+from conversationgenome.utils.Utils import Utils
+
+PROMPT_DIR = Path(__file__).parent / "prompts"
+WORD_PATTERN = re.compile(r"[a-z][a-z\-]{2,}")
+STOP_WORDS = {
+    "the", "and", "for", "are", "but", "not", "you", "all", "any", "can", "her", "was", "one", "our", "out", "has",
+    "him", "his", "how", "its", "may", "new", "now", "see", "who", "did", "get", "let", "she", "too", "use", "that",
+    "with", "have", "this", "will", "your", "from", "they", "been", "were", "what", "when", "which", "their", "there",
+    "would", "about", "could", "should", "these", "those", "them", "then", "than", "into", "just", "also", "very",
+    "some", "more", "most", "such", "only", "over", "like", "yes", "well", "really", "think", "know", "going",
+}
+
+
+class LocalStubModel:
+    """
+    Deterministic stand-in for a chat and embedding model, for load tests that should not need API keys.
+
+    Embeddings are unit vectors drawn from a generator seeded with a hash of the seed, model and text, so the same
+    text always gets the same vector, in every process. Completions are built from the prompt: tag prompts get the
+    most frequent words of the content (the words of the prompt templates don't count), the tag validation prompt
+    gets all its keywords back as good, and the conversation quality prompt gets a quality score derived from the hash.
+
+    Each call can be delayed and can fail. Latency is a spec string: "0.2" (seconds), "uniform:0.1:0.5",
+    "normal:0.3:0.1" or "lognormal:0.3:0.5" (median and sigma). Failures happen with probability error_rate.
+    Latency and failures are drawn from their own generator seeded with seed, so a run is reproducible.
+    """
+
+    def __init__(self, model="local-stub", dimensions=1536, latency="0", error_rate=0.0, max_tags=10, seed=0):
+        self.model = model
+        self.dimensions = dimensions
+        self.latency = latency
+        self.error_rate = error_rate
+        self.max_tags = max_tags
+        self.seed = seed
+        self._latency_sampler = parse_latency(latency)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._template_words = get_template_words()
+        self.calls = Counter()
+        self.errors = Counter()
+
+    @classmethod
+    def from_config(cls) -> "LocalStubModel":
+        return cls(
+            model=c.get("env", "LOCAL_STUB_MODEL", "local-stub"),
+            dimensions=Utils._int(c.get("env", "LOCAL_STUB_EMBEDDING_DIMENSIONS", 1536), 1536),
+            latency=c.get("env", "LOCAL_STUB_LATENCY", "0"),
+            error_rate=Utils._float(c.get("env", "LOCAL_STUB_ERROR_RATE", 0), 0),
+            max_tags=Utils._int(c.get("env", "LOCAL_STUB_MAX_TAGS", 10), 10),
+            seed=Utils._int(c.get("env", "LOCAL_STUB_SEED", 0), 0),
+        )
+
+    def next_call(self, kind: str) -> tuple:
+        """
+        Returns (delay in seconds, whether the call fails) for the next call of the given kind.
+        """
+        with self._lock:
+            self.calls[kind] += 1
+            delay = self._latency_sampler(self._random)
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors[kind] += 1
+        return delay, failed
+
+    def embed(self, text: str, dimensions: int = None) -> List[float]:
+        digest = hashlib.sha256(f"{self.seed}|{self.model}|{text}".encode("utf-8")).digest()
+        rng = np.random.default_rng(int.from_bytes(digest[:8], "little"))
+        vector = rng.standard_normal(dimensions or self.dimensions)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def complete(self, prompt: str, response_format: str = "text") -> str:
+        if response_format == "json":
+            digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+            return json.dumps({"quality_score": 5 + digest[0] % 6, "primary_reason": "local stub", "reason_details": None})
+
+        keywords = re.search(r"<keywords>(.*?)</keywords>", prompt, re.S)
+        if keywords:
+            # Sorted, the set order would change with the hash seed of the process
+            tags = sorted(Utils.get_clean_tag_set(keywords.group(1).split(",")))
+            return f"Good English keywords: {', '.join(tags)}\nMalformed keywords: "
+
+        return ", ".join(self.get_tags(prompt))
+
+    def get_tags(self, text: str) -> List[str]:
+        words = [word.strip("-") for word in WORD_PATTERN.findall(text.lower())]
+        words = [word for word in words if len(word) > 2 and word not in STOP_WORDS and word not in self._template_words]
+        counts = Counter(words)
+        # Most frequent first, ties in order of appearance
+        ordered = sorted(dict.fromkeys(words), key=lambda word: -counts[word])
+        return ordered[: self.max_tags] or ["conversation"]
+
+    def stats(self) -> dict:
+        return {"calls": dict(self.calls), "errors": dict(self.errors)}
+
+
+def parse_latency(spec) -> Callable[[random.Random], float]:
+    spec = str(spec or "0").strip()
+    kind, _, params = spec.partition(":") if ":" in spec else ("fixed", "", spec)
+    values = [float(value) for value in params.split(":") if value != ""]
+    if kind == "fixed":
+        return lambda rng: max(0.0, values[0] if values else 0.0)
+    if kind == "uniform":
+        return lambda rng: max(0.0, rng.uniform(values[0], values[1]))
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal":
+        median, sigma = values
+        return lambda rng: rng.lognormvariate(np.log(median), sigma) if median > 0 else 0.0
+    raise ValueError(f"Unknown LOCAL_STUB_LATENCY distribution: {spec}")
+
+
+_TEMPLATE_WORDS = None
+
+
+def get_template_words() -> set:
+    """
+    Words of the prompt templates, so tags come from the content the prompt was rendered with.
+    """
+    global _TEMPLATE_WORDS
+    if _TEMPLATE_WORDS is None:
+        words = set()
+        for path in PROMPT_DIR.glob("*.j2"):
+            words.update(word.strip("-") for word in WORD_PATTERN.findall(path.read_text().lower()))
+        _TEMPLATE_WORDS = words
+    return _TEMPLATE_WORDS
+
+
+class LlmLocalStub(LlmLib):
+    """
+    In-process backend for LLM_TYPE_OVERRIDE=local_stub, see LocalStubModel.
+    A failed call returns None, like the other backends on a provider error.
+    """
+
+    def __init__(self):
+        self.stub = LocalStubModel.from_config()
+        self.model = self.stub.model
+        self.embedding_model = f"{self.stub.model}-embedding"
+        self.embedding_dimensions = self.stub.dimensions
+        self.embedding_cache = get_embedding_cache()
+        self.tag_validation_cache = get_tag_validation_cache()
+
+    ###############################################################################################
+    ################################## Abstract methods override ##################################
+    ###############################################################################################
+    def basic_prompt(self, prompt: str, response_format: str = "text") -> str|None:
+        delay, failed = self.stub.next_call("completion")
+        time.sleep(delay)
+        if failed:
+            print(f"Local stub Completion Error")
+            return None
+        return self.stub.complete(prompt, response_format)
+
+    def get_vector_embeddings(self, tag: str) -> List[float]|None:
+        vectors = self.get_vector_embeddings_batch([tag])
+        return vectors[0] if vectors else None
+
+    def get_vector_embeddings_batch(self, tags: List[str]) -> List[List[float]|None]|None:
+        delay, failed = self.stub.next_call("embedding")
+        time.sleep(delay)
+        if failed:
+            print(f"Local stub Embedding Error")
+            return None
+        return [self.stub.embed(tag) for tag in tags]
+
+    ###############################################################################################
+    #################################### Async methods override ###################################
+    ###############################################################################################
+    async def abasic_prompt(self, prompt: str, response_format: str = "text") -> str|None:
+        delay, failed = self.stub.next_call("completion")
+        await asyncio.sleep(delay)
+        if failed:
+            print(f"Local stub Completion Error")
+            return None
+        return self.stub.complete(prompt, response_format)
+
+    async def aget_vector_embeddings(self, tag: str) -> List[float]|None:
+        vectors = await self.aget_vector_embeddings_batch([tag])
+        return vectors[0] if vectors else None
+
+    async def aget_vector_embeddings_batch(self, tags: List[str]) -> List[List[float]|None]|None:
+        delay, failed = self.stub.next_call("embedding")
+        await asyncio.sleep(delay)
+        if failed:
+            print(f"Local stub Embedding Error")
+            return None
+        return [self.stub.embed(tag) for tag in tags]
+
+
+class LocalStubServer:
+    """
+    Serves a LocalStubModel over the OpenAI wire format: POST /v1/chat/completions, POST /v1/embeddings and
+    GET /v1/models. Point the openai backend at it with OPENAI_BASE_URL=http://<host>:<port>/v1. Failed calls get
+    a 500 with an OpenAI style error body.
+    """
+
+    def __init__(self, stub: LocalStubModel = None, host: str = "127.0.0.1", port: int = 0):
+        self.stub = stub or LocalStubModel.from_config()
+        self.server = ThreadingHTTPServer((host, port), self._make_handler())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def host(self) -> str:
+        return self.server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self.server.server_address[1]
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    def start(self) -> "LocalStubServer":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self.server.serve_forever()
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def chat_completion(self, request: dict) -> tuple:
+        delay, failed = self.stub.next_call("completion")
+        time.sleep(delay)
+        if failed:
+            return 500, _error_body("Local stub completion error")
+
+        prompt = "\n".join(str(message.get("content", "")) for message in request.get("messages", []))
+        response_format = request.get("response_format") or {}
+        content = self.stub.complete(prompt, "json" if response_format.get("type") == "json_object" else "text")
+        return 200, {
+            "id": f"chatcmpl-{hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:24]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model") or self.stub.model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": len(prompt.split()), "completion_tokens": len(content.split()), "total_tokens": len(prompt.split()) + len(content.split())},
+        }
+
+    def embeddings(self, request: dict) -> tuple:
+        delay, failed = self.stub.next_call("embedding")
+        time.sleep(delay)
+        if failed:
+            return 500, _error_body("Local stub embedding error")
+
+        inputs = request.get("input", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        dimensions = request.get("dimensions") or self.stub.dimensions
+        return 200, {
+            "object": "list",
+            "model": request.get("model") or f"{self.stub.model}-embedding",
+            "data": [{"object": "embedding", "index": idx, "embedding": self.stub.embed(text, dimensions)} for idx, text in enumerate(inputs)],
+            "usage": {"prompt_tokens": sum(len(str(text).split()) for text in inputs), "total_tokens": sum(len(str(text).split()) for text in inputs)},
+        }
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.rstrip("/").endswith("/models"):
+                    self._send(200, {"object": "list", "data": [{"id": server.stub.model, "object": "model", "owned_by": "local"}]})
+                else:
+                    self._send(404, _error_body(f"Unknown path {self.path}"))
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    request = json.loads(self.rfile.read(length) or b"{}")
+                except json.JSONDecodeError:
+                    self._send(400, _error_body("Request body is not JSON"))
+                    return
+
+                path = self.path.split("?")[0].rstrip("/")
+                if path.endswith("/chat/completions"):
+                    self._send(*server.chat_completion(request))
+                elif path.endswith("/embeddings"):
+                    self._send(*server.embeddings(request))
+                else:
+                    self._send(404, _error_body(f"Unknown path {self.path}"))
+
+            def _send(self, status_code, body):
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status_code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+
+def _error_body(message: str) -> dict:
+    return {"error": {"message": message, "type": "server_error", "param": None, "code": None}}
@@ -1,8 +1,10 @@
 from typing import List
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from conversationgenome.ConfigLib import c
+from conversationgenome.llm.embedding_cache import get_embedding_cache
 from conversationgenome.llm.LlmLib import LlmLib, model_override
+from conversationgenome.llm.tag_validation_cache import get_tag_validation_cache
 
 
 class LlmOpenAI(LlmLib):
@@ -10,25 +12,21 @@ class LlmOpenAI(LlmLib):
         api_key = c.get('env', "OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable not set. Please set it in the .env file or as an environment variable.")
+        self.api_key = api_key
         self.client = OpenAI(api_key=api_key)
         self.model = c.get('env', "OPENAI_MODEL", "gpt-5.2")
         self.embedding_model = "text-embedding-3-small"
+        self.embedding_dimensions = 1536
+        self.embedding_cache = get_embedding_cache()
+        self.tag_validation_cache = get_tag_validation_cache()
 
 
     ###############################################################################################
     ################################## Abstract methods override ##################################
     ###############################################################################################
     def basic_prompt(self, prompt: str, response_format: str = "text") -> str|None:
-        api_format = {"type": "json_object"} if response_format == "json" else None
-        
-        completion_params = {
-            "model": self.model,
-            "messages": [{"role": "user", "content": prompt}],
-            "response_format": api_format,
-        }
-
         try:
-            response = self.client.chat.completions.create(**completion_params)
+            response = self.client.chat.completions.create(**self._get_completion_params(prompt, response_format))
             return response.choices[0].message.content or ""
         except Exception as e:
             print(f"OpenAI Completion Error")
@@ -52,7 +50,59 @@ class LlmOpenAI(LlmLib):
             # print(e)
             return None
 
-    
+    def get_vector_embeddings_batch(self, tags: List[str], dimensions=1536) -> List[List[float]|None]|None:
+        tags = [tag.replace("\n", " ") for tag in tags]
+        embedding_model = self.embedding_model
+        try:
+            response = self.client.embeddings.create(
+                input=tags,
+                model=embedding_model,
+                dimensions=dimensions
+            )
+            return self._get_batch_vectors(response, len(tags))
+        except Exception as e:
+            print(f"OpenAI Embedding Error")
+            # Uncomment the line below for debugging purposes
+            # print(e)
+            return None
+
+
+    ###############################################################################################
+    #################################### Async methods override ###################################
+    ###############################################################################################
+    async def abasic_prompt(self, prompt: str, response_format: str = "text") -> str|None:
+        try:
+            response = await self._get_async_client().chat.completions.create(**self._get_completion_params(prompt, response_format))
+            return response.choices[0].message.content or ""
+        except Exception as e:
+            print(f"OpenAI Completion Error")
+            # Uncomment the line below for debugging purposes
+            # print(e)
+            return None
+
+    async def aget_vector_embeddings(self, tag: str, dimensions=1536) -> List[float]|None:
+        vectors = await self.aget_vector_embeddings_batch([tag], dimensions=dimensions)
+        return vectors[0] if vectors else None
+
+    async def aget_vector_embeddings_batch(self, tags: List[str], dimensions=1536) -> List[List[float]|None]|None:
+        tags = [tag.replace("\n", " ") for tag in tags]
+        try:
+            response = await self._get_async_client().embeddings.create(
+                input=tags,
+                model=self.embedding_model,
+                dimensions=dimensions
+            )
+            return self._get_batch_vectors(response, len(tags))
+        except Exception as e:
+            print(f"OpenAI Embedding Error")
+            # Uncomment the line below for debugging purposes
+            # print(e)
+            return None
+
+    def _create_async_client(self, name: str):
+        return AsyncOpenAI(api_key=self.api_key)
+
+
     ###############################################################################################
     ################################## Concrete methods override ##################################
     ###############################################################################################
@@ -60,3 +110,20 @@ class LlmOpenAI(LlmLib):
     def validate_conversation_quality(self, conversation):
         return super().validate_conversation_quality(conversation)
 
+    @model_override('gpt-5-mini')
+    async def avalidate_conversation_quality(self, conversation):
+        return await super().avalidate_conversation_quality(conversation)
+
+    def _get_completion_params(self, prompt: str, response_format: str) -> dict:
+        api_format = {"type": "json_object"} if response_format == "json" else None
+        return {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "response_format": api_format,
+        }
+
+    def _get_batch_vectors(self, response, count: int) -> List[List[float]|None]:
+        vectors = [None] * count
+        for item in response.data:
+            vectors[item.index] = item.embedding
+        return vectors
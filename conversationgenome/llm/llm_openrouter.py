@@ -1,43 +1,39 @@
 from typing import List
 import json
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from conversationgenome.ConfigLib import c
+from conversationgenome.llm.embedding_cache import get_embedding_cache
 from conversationgenome.llm.LlmLib import LlmLib, model_override
+from conversationgenome.llm.tag_validation_cache import get_tag_validation_cache
 
 
 class LlmOpenRouter(LlmLib):
+    base_url = "https://openrouter.ai/api/v1"
+
     def __init__(self):
         api_key = c.get('env', "OPENROUTER_API_KEY")
         if not api_key:
             raise ValueError("OPENROUTER_API_KEY environment variable not set. Please set it in the .env file or as an environment variable.")
         
+        self.api_key = api_key
         self.client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
+            base_url=self.base_url,
             api_key=api_key
         )
         self.model = c.get('env', "OPENROUTER_MODEL", "deepseek/deepseek-chat")
         self.provider_preference = c.get('env', "OPENROUTER_PROVIDER_PREFERENCE", "chutes")
         self.embedding_model = c.get('env', "OPENROUTER_EMBEDDING_MODEL", "text-embedding-3-small")
+        self.embedding_cache = get_embedding_cache()
+        self.tag_validation_cache = get_tag_validation_cache()
 
 
     ###############################################################################################
     ################################## Abstract methods override ##################################
     ###############################################################################################
     def basic_prompt(self, prompt: str, response_format: str = "text") -> str|None:
-        api_format = {"type": "json_object"} if response_format == "json" else None
-        
-        extra_body = {}
-        if self.provider_preference:
-            extra_body["provider"] = {"order": [self.provider_preference]}
-
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                response_format=api_format,
-                extra_body=extra_body
-            )
+            response = self.client.chat.completions.create(**self._get_completion_params(prompt, response_format))
             return response.choices[0].message.content or ""
         except Exception as e:
             print(f"OpenRouter Completion Error")
@@ -61,3 +57,73 @@ class LlmOpenRouter(LlmLib):
             # Uncomment the line below for debugging purposes
             # print(e)
             return None
+
+    def get_vector_embeddings_batch(self, tags: List[str], dimensions=1536) -> List[List[float]|None]|None:
+        tags = [tag.replace("\n", " ") for tag in tags]
+        try:
+            response = self.client.embeddings.create(
+                input=tags,
+                model=self.embedding_model,
+                # dimensions=dimensions # Some models don't support dimensions param
+            )
+            return self._get_batch_vectors(response, len(tags))
+        except Exception as e:
+            print(f"OpenRouter Embedding Error")
+            # Uncomment the line below for debugging purposes
+            # print(e)
+            return None
+
+
+    ###############################################################################################
+    #################################### Async methods override ###################################
+    ###############################################################################################
+    async def abasic_prompt(self, prompt: str, response_format: str = "text") -> str|None:
+        try:
+            response = await self._get_async_client().chat.completions.create(**self._get_completion_params(prompt, response_format))
+            return response.choices[0].message.content or ""
+        except Exception as e:
+            print(f"OpenRouter Completion Error")
+            # Uncomment the line below for debugging purposes
+            # print(e)
+            return None
+
+    async def aget_vector_embeddings(self, tag: str, dimensions=1536) -> List[float]|None:
+        vectors = await self.aget_vector_embeddings_batch([tag], dimensions=dimensions)
+        return vectors[0] if vectors else None
+
+    async def aget_vector_embeddings_batch(self, tags: List[str], dimensions=1536) -> List[List[float]|None]|None:
+        tags = [tag.replace("\n", " ") for tag in tags]
+        try:
+            response = await self._get_async_client().embeddings.create(
+                input=tags,
+                model=self.embedding_model,
+            )
+            return self._get_batch_vectors(response, len(tags))
+        except Exception as e:
+            print(f"OpenRouter Embedding Error")
+            # Uncomment the line below for debugging purposes
+            # print(e)
+            return None
+
+    def _create_async_client(self, name: str):
+        return AsyncOpenAI(base_url=self.base_url, api_key=self.api_key)
+
+    def _get_completion_params(self, prompt: str, response_format: str) -> dict:
+        api_format = {"type": "json_object"} if response_format == "json" else None
+
+        extra_body = {}
+        if self.provider_preference:
+            extra_body["provider"] = {"order": [self.provider_preference]}
+
+        return {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "response_format": api_format,
+            "extra_body": extra_body,
+        }
+
+    def _get_batch_vectors(self, response, count: int) -> List[List[float]|None]:
+        vectors = [None] * count
+        for item in response.data:
+            vectors[item.index] = item.embedding
+        return vectors
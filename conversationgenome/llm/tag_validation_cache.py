@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from conversationgenome.ConfigLib import c
+from conversationgenome.utils.Utils import Utils
+
+# (provider, validation model)
+ValidationNamespace = Tuple[str, Optional[str]]
+
+
+class TagValidationCache:
+    """
+    Remembers the good/malformed verdict validate_tag_set got for each tag.
+
+    Entries are keyed by (provider, validation model, cleaned tag) and expire after ttl seconds.
+    The cache is an in-memory LRU capped at max_size entries.
+    """
+
+    def __init__(self, max_size: int = 50000, ttl: float = 86400):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[bool, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+
+    @staticmethod
+    def make_key(namespace: ValidationNamespace, tag: str) -> str:
+        provider, model = namespace
+        return f"{provider}|{model}|{tag}"
+
+    def get_many(self, namespace: ValidationNamespace, tags: List[str]) -> Dict[str, bool]:
+        """
+        Returns {tag: is_good} for the tags with a live verdict. Tags that are not cached are omitted.
+        """
+        found = {}
+        now = time.monotonic()
+        with self._lock:
+            for tag in tags:
+                key = self.make_key(namespace, tag)
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] <= now:
+                    del self._entries[key]
+                    self.expired += 1
+                    entry = None
+                if entry is None:
+                    self.misses += 1
+                    continue
+                self._entries.move_to_end(key)
+                found[tag] = entry[0]
+                self.hits += 1
+        return found
+
+    def put_many(self, namespace: ValidationNamespace, verdicts: Dict[str, bool]) -> None:
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for tag, is_good in verdicts.items():
+                key = self.make_key(namespace, tag)
+                self._entries[key] = (bool(is_good), expires_at)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expired": self.expired,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_TAG_VALIDATION_CACHE: Optional[TagValidationCache] = None
+
+
+def get_tag_validation_cache() -> Optional[TagValidationCache]:
+    """
+    Returns the process-wide tag validation cache, or None if it is disabled with TAG_VALIDATION_CACHE_ENABLED=0.
+    """
+    global _TAG_VALIDATION_CACHE
+    if _TAG_VALIDATION_CACHE is not None:
+        return _TAG_VALIDATION_CACHE
+
+    if str(c.get("env", "TAG_VALIDATION_CACHE_ENABLED", "1")).lower() in ("0", "false", "no"):
+        return None
+
+    _TAG_VALIDATION_CACHE = TagValidationCache(
+        max_size=Utils._int(c.get("env", "TAG_VALIDATION_CACHE_SIZE", 50000), 50000),
+        ttl=Utils._float(c.get("env", "TAG_VALIDATION_CACHE_TTL", 86400), 86400),
+    )
+    return _TAG_VALIDATION_CACHE
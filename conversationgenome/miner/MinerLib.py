@@ -7,8 +7,11 @@ from conversationgenome.api.models.conversation import Conversation
 from conversationgenome.ConfigLib import c
 from conversationgenome.llm.llm_factory import get_llm_backend
 from conversationgenome.miner.default_prompts import get_task_default_prompt
+from conversationgenome.miner.MiningQueue import MiningQueue
+from conversationgenome.miner.MiningResultCache import get_mining_result_cache
 from conversationgenome.mock.MockBt import MockBt
 from conversationgenome.task.Task import Task
+from conversationgenome.utils.Deadline import Deadline
 from conversationgenome.utils.Utils import Utils
 
 bt = None
@@ -28,11 +31,28 @@ elif c.get('env', 'FORCE_LOG') == 'info':
 class MinerLib:
     verbose = False
 
-    async def do_mining(self, task: Task):
+    async def do_mining(self, task: Task, mining_queue: Optional[MiningQueue] = None, priority: float = 0.0, deadline: Optional[Deadline] = None):
+        """
+        Mines the task. Tasks with content mined recently, or being mined right now, are answered from the
+        mining result cache. Otherwise task.mine() runs through mining_queue, if given, with the caller's priority.
+        Tasks that can answer with partial tags stop waiting on the LLM when the deadline is close; those partial
+        results are not cached.
+        """
         print(f"Miner: Received {task.type} task for mining...")
         bt.logging.info(f"Miner: Received {task.type} task for mining...")
 
-        result = await task.mine()
+        deadline = deadline or Deadline()
+        if mining_queue is not None:
+            mine = lambda: mining_queue.run(lambda: task.mine(deadline=deadline), priority=priority, task_type=task.type)
+        else:
+            mine = lambda: task.mine(deadline=deadline)
+
+        result_cache = get_mining_result_cache()
+        if result_cache is not None:
+            result = await result_cache.get_or_mine(task, mine, complete=lambda: not deadline.partial)
+            bt.logging.debug(f"Miner result cache: {result_cache.stats()}")
+        else:
+            result = await mine()
 
         bt.logging.info(f"Miner: Successfully mined {task.type} task. Returning results to validator...")
 
@@ -0,0 +1,170 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable
+from typing import Callable
+from typing import Optional
+
+import numpy as np
+
+from conversationgenome.mock.MockBt import MockBt
+
+bt = None
+try:
+    import bittensor as bt
+except:
+    bt = MockBt()
+
+
+class MiningQueueFull(Exception):
+    """Raised when a request is shed because all workers are busy and the queue is full."""
+
+
+class MiningQueue:
+    """
+    Runs at most `workers` mining jobs at once on the axon event loop. Requests that arrive while every worker is
+    busy wait in a queue ordered by priority (the caller's stake), highest first, then by arrival.
+
+    The queue holds at most `max_queue` requests. When it is full a new request either takes the place of the
+    lowest priority waiting request, if it outranks it, or is shed itself. Shed requests fail fast with
+    MiningQueueFull so the validator is not left waiting for a timeout.
+
+    The blocking LLM calls of the mining tasks run through asyncio.to_thread. If `thread_pool_size` is set, the
+    event loop's default executor is replaced with a pool of that size the first time the queue runs on it.
+
+    Latency (queue wait and mining time) is kept per task type for the last `latency_window` requests.
+    """
+
+    def __init__(self, workers=4, max_queue=16, thread_pool_size=0, latency_window=1000):
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.thread_pool_size = thread_pool_size
+        self.latency_window = latency_window
+
+        self._active = 0
+        self._waiting = []
+        self._counter = itertools.count()
+        self._executor = None
+        self._executor_loop = None
+
+        self.completed = 0
+        self.failed = 0
+        self.shed = 0
+        self.latencies = {}
+
+    async def run(self, job: Callable[[], Awaitable], priority: float = 0.0, task_type: str = "unknown"):
+        """
+        Waits for a free worker, then awaits job() and returns its result. Raises MiningQueueFull if the request is shed.
+        """
+        self._ensure_executor()
+        queued_at = time.monotonic()
+        await self._acquire(priority)
+        started_at = time.monotonic()
+        try:
+            result = await job()
+            self.completed += 1
+            return result
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            finished_at = time.monotonic()
+            self._release()
+            self._record_latency(task_type, started_at - queued_at, finished_at - started_at)
+
+    def size(self) -> int:
+        return sum(1 for _, _, future in self._waiting if not future.done())
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "active": self._active,
+            "queued": self.size(),
+            "completed": self.completed,
+            "failed": self.failed,
+            "shed": self.shed,
+            "latency": self.get_latency_stats(),
+        }
+
+    def get_latency_stats(self) -> dict:
+        """
+        Returns {task_type: {count, wait_p50, wait_p95, mine_p50, mine_p95, mine_mean}} in seconds.
+        """
+        out = {}
+        for task_type, samples in self.latencies.items():
+            if not samples:
+                continue
+            values = np.array(samples, dtype=np.float64)
+            wait, mine = values[:, 0], values[:, 1]
+            out[task_type] = {
+                "count": len(values),
+                "wait_p50": round(float(np.percentile(wait, 50)), 4),
+                "wait_p95": round(float(np.percentile(wait, 95)), 4),
+                "mine_p50": round(float(np.percentile(mine, 50)), 4),
+                "mine_p95": round(float(np.percentile(mine, 95)), 4),
+                "mine_mean": round(float(np.mean(mine)), 4),
+            }
+        return out
+
+    async def _acquire(self, priority: float) -> None:
+        if self._active < self.workers and self.size() == 0:
+            self._active += 1
+            return
+
+        self._drop_done()
+        if len(self._waiting) >= self.max_queue:
+            lowest = max(self._waiting) if self._waiting else None
+            if lowest is None or -lowest[0] >= priority:
+                self.shed += 1
+                raise MiningQueueFull(f"Miner queue full ({self.max_queue} waiting, {self._active} mining)")
+            # The new request outranks the lowest priority one waiting, which is shed instead
+            self._waiting.remove(lowest)
+            heapq.heapify(self._waiting)
+            self.shed += 1
+            lowest[2].set_exception(MiningQueueFull(f"Shed for a higher priority request ({self.max_queue} waiting)"))
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (-priority, next(self._counter), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # A worker may have been handed over just before the cancellation
+            if future.done() and not future.cancelled() and future.exception() is None:
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        while self._waiting:
+            _, _, future = heapq.heappop(self._waiting)
+            if not future.done():
+                # Hand the worker over without decrementing _active
+                future.set_result(None)
+                return
+        self._active -= 1
+
+    def _drop_done(self) -> None:
+        waiting = [entry for entry in self._waiting if not entry[2].done()]
+        if len(waiting) != len(self._waiting):
+            self._waiting = waiting
+            heapq.heapify(self._waiting)
+
+    def _record_latency(self, task_type: str, wait: float, mine: float) -> None:
+        samples = self.latencies.get(task_type)
+        if samples is None:
+            samples = self.latencies[task_type] = deque(maxlen=self.latency_window)
+        samples.append((wait, mine))
+
+    def _ensure_executor(self) -> None:
+        if not self.thread_pool_size:
+            return
+        loop = asyncio.get_running_loop()
+        if self._executor_loop is loop:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.thread_pool_size, thread_name_prefix="cgp-miner")
+        loop.set_default_executor(self._executor)
+        self._executor_loop = loop
+        bt.logging.info(f"Miner LLM calls run on a pool of {self.thread_pool_size} threads.")
@@ -0,0 +1,155 @@
+import asyncio
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable
+from typing import Callable
+from typing import Optional
+from typing import Tuple
+
+from conversationgenome.ConfigLib import c
+from conversationgenome.task.Task import Task
+from conversationgenome.utils.Utils import Utils
+
+# Fields of the task input data that don't change what the task mines
+IGNORED_INPUT_FIELDS = {"window_idx", "participants"}
+
+
+class MiningResultCache:
+    """
+    Remembers what the miner returned for a task, keyed by a hash of the task content: the task type, the prompt
+    templates, the input data (window lines, survey question, ...) and input_categories. Masked tasks carry no
+    GUIDs, and validators send the same window to several miners and repeat bundles, so the same content comes
+    back often.
+
+    Entries expire after ttl seconds and the cache is an in-memory LRU capped at max_size entries. Only results
+    with tags are cached. Identical requests that arrive while the first one is still being mined wait for its
+    result instead of mining it again (single-flight).
+    """
+
+    def __init__(self, max_size: int = 2000, ttl: float = 3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[dict, float]]" = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expired = 0
+
+    @staticmethod
+    def make_key(task: Task) -> str:
+        task_input = task.input
+        data = getattr(task_input, "data", None)
+        payload = {
+            "type": task.type,
+            "prompts": [step.prompt_template for step in task.prompt_chain or []],
+            "data": data.model_dump(exclude=IGNORED_INPUT_FIELDS) if data is not None else None,
+            "input_categories": getattr(task_input, "input_categories", None),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= now:
+                del self._entries[key]
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(entry[0])
+
+    def put(self, key: str, result: dict) -> None:
+        if not isinstance(result, dict) or not result.get("tags"):
+            return
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = (copy.deepcopy(result), expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    async def get_or_mine(self, task: Task, mine: Callable[[], Awaitable[dict]], complete: Optional[Callable[[], bool]] = None) -> dict:
+        """
+        Returns the cached result for the task's content, the result of an identical request already being mined,
+        or awaits mine() and caches what it returns, unless complete() says it is a partial result. Errors are
+        passed on to the waiting requests, not cached.
+        """
+        key = self.make_key(task)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.coalesced += 1
+            return copy.deepcopy(await asyncio.shield(in_flight))
+
+        future = asyncio.get_running_loop().create_future()
+        # Nobody may be waiting on it when it fails
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._in_flight[key] = future
+        try:
+            result = await mine()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            if complete is None or complete():
+                self.put(key, result)
+            future.set_result(result)
+            return result
+        finally:
+            self._in_flight.pop(key, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expired": self.expired,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "in_flight": len(self._in_flight),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_MINING_RESULT_CACHE: Optional[MiningResultCache] = None
+
+
+def get_mining_result_cache() -> Optional[MiningResultCache]:
+    """
+    Returns the process-wide mining result cache, or None if it is disabled with MINER_RESULT_CACHE_ENABLED=0.
+    """
+    global _MINING_RESULT_CACHE
+    if _MINING_RESULT_CACHE is not None:
+        return _MINING_RESULT_CACHE
+
+    if str(c.get("env", "MINER_RESULT_CACHE_ENABLED", "1")).lower() in ("0", "false", "no"):
+        return None
+
+    _MINING_RESULT_CACHE = MiningResultCache(
+        max_size=Utils._int(c.get("env", "MINER_RESULT_CACHE_SIZE", 2000), 2000),
+        ttl=Utils._float(c.get("env", "MINER_RESULT_CACHE_TTL", 3600), 3600),
+    )
+    return _MINING_RESULT_CACHE
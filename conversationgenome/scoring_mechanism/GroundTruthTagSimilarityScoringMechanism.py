@@ -23,16 +23,23 @@ class GroundTruthTagSimilarityScoringMechanism(ScoringMechanism):
         "max_score": 0.1,
     }
 
+    # Score every miner with one similarity matmul (see _evaluate_batch). False falls back to the per-tag loop.
+    vectorized: ClassVar[bool] = True
+    similarity_dtype: ClassVar[type] = np.float32
+
     async def evaluate(self, task_bundle: TaskBundle, miner_responses=None):
-        full_conversation_neighborhood = await self._calculate_semantic_neighborhood(task_bundle.input.metadata)
+        full_conversation_neighborhood, neighborhood_norm = await self._get_semantic_neighborhood(task_bundle)
         num_responses = len(miner_responses)
         zero_score_mask = np.ones(num_responses)
         rank_scores = np.zeros(num_responses)
-        final_scores = []
 
-        for idx, response in enumerate(miner_responses):
-            score_entry = await self._evaluate_single_response(idx, response, task_bundle, full_conversation_neighborhood, zero_score_mask)
-            final_scores.append(score_entry)
+        if self.vectorized:
+            final_scores = await self._evaluate_batch(miner_responses, task_bundle, full_conversation_neighborhood, zero_score_mask, neighborhood_norm)
+        else:
+            final_scores = []
+            for idx, response in enumerate(miner_responses):
+                score_entry = await self._evaluate_single_response(idx, response, task_bundle, full_conversation_neighborhood, zero_score_mask)
+                final_scores.append(score_entry)
 
         bt.logging.debug(f"Complete evaluation. Final scores:\n{pprint.pformat(final_scores, indent=2)}")
 
@@ -45,6 +52,107 @@ class GroundTruthTagSimilarityScoringMechanism(ScoringMechanism):
 
         return (final_scores, rank_scores)
 
+    async def _evaluate_batch(self, miner_responses, task_bundle, full_conversation_neighborhood, zero_score_mask, neighborhood_norm=None):
+        """
+        Same results as _evaluate_single_response for every response, but the tag vectors of all miners are
+        stacked into one matrix and scored against the neighborhood at once. Per-miner statistics are then
+        segment reductions over the flat score array.
+        """
+        full_convo_tags = task_bundle.input.metadata.tags
+        final_scores = []
+        scored = []
+        segments = []
+        # Responses grouped by the validator share their tags and vectors objects, score those once
+        segment_by_result = {}
+        flat_vectors = []
+        flat_unique = []
+        offsets = [0]
+
+        for idx, response in enumerate(miner_responses):
+            try:
+                miner_response = response.cgp_output
+            except Exception:
+                miner_response = response
+
+            uuid = f"uuid-{idx}"
+            hotkey = "hk-uuid"
+            try:
+                uuid = response.axon.uuid
+                hotkey = response.axon.hotkey
+            except Exception:
+                pass
+
+            final_scores.append({"uuid": uuid, "hotkey": hotkey, "adjustedScore": 0.0, "final_miner_score": 0.0})
+            if not miner_response:
+                continue
+
+            miner_result = miner_response[0]
+            if not self._has_enough_tags(miner_result, idx):
+                zero_score_mask[idx] = 0
+                continue
+
+            try:
+                result_key = (id(miner_result["tags"]), id(miner_result["vectors"]))
+                if result_key in segment_by_result:
+                    scored.append((idx, segment_by_result[result_key]))
+                    continue
+                diff, unique_flags, vectors = self._collect_tag_vectors(full_convo_tags, miner_result)
+            except Exception as e:
+                bt.logging.error(f"Error while calculating scores for response {idx}: {e}")
+                bt.logging.debug(print_exception(type(e), e, e.__traceback__))
+                zero_score_mask[idx] = 0
+                continue
+
+            segment_by_result[result_key] = len(segments)
+            scored.append((idx, len(segments)))
+            segments.append((miner_result, diff))
+            flat_vectors.extend(vectors)
+            flat_unique.extend(unique_flags)
+            offsets.append(len(flat_vectors))
+
+        if not scored:
+            return final_scores
+
+        flat_scores = self._score_tag_vectors(full_conversation_neighborhood, flat_vectors, neighborhood_norm)
+        flat_unique = np.array(flat_unique, dtype=bool)
+        offsets = np.array(offsets)
+        all_stats = self._calculate_stats_batch(flat_scores, flat_unique, offsets)
+
+        segment_scores = []
+        for segment, (miner_result, diff) in enumerate(segments):
+            stats = all_stats[segment]
+            adjusted_score = self._calculate_adjusted_score(stats)
+
+            unique_tags = diff['unique_2']
+            total_tag_count = len(diff['both']) + len(unique_tags)
+
+            final_miner_score = await self._calculate_penalty(
+                adjusted_score,
+                total_tag_count,
+                len(unique_tags),
+                stats['min_score'],
+                stats['max_score'],
+            )
+            segment_scores.append((adjusted_score, final_miner_score))
+
+            start, end = offsets[segment], offsets[segment + 1]
+            bt.logging.info(f"Scores num: {end - start} num of Unique tags: {int(flat_unique[start:end].sum())} num of full convo tags: {len(full_convo_tags)}")
+            bt.logging.debug(
+                f"_______ ADJ SCORE: {adjusted_score} ___Num Tags: {len(miner_result['tags'])} Unique Tag Scores: {flat_scores[start:end][flat_unique[start:end]].tolist()} Median score: {stats['median_score']} Mean score: {stats['mean_score']} Top 3 Mean: {stats['top_3_mean']} Min: {stats['min_score']} Max: {stats['max_score']}"
+            )
+
+        for idx, segment in scored:
+            adjusted_score, final_miner_score = segment_scores[segment]
+            final_scores[idx] = {
+                "uid": idx + 1,
+                "uuid": final_scores[idx]["uuid"],
+                "hotkey": final_scores[idx]["hotkey"],
+                "adjustedScore": adjusted_score,
+                "final_miner_score": final_miner_score,
+            }
+
+        return final_scores
+
     async def _evaluate_single_response(self, idx, response, task_bundle, full_conversation_neighborhood, zero_score_mask):
         try:
             miner_response = response.cgp_output
@@ -159,6 +267,15 @@ class GroundTruthTagSimilarityScoringMechanism(ScoringMechanism):
             + (self.scoring_factors['max_score'] * stats['max_score'])
         )
 
+    async def _get_semantic_neighborhood(self, task_bundle):
+        """
+        Returns (neighborhood, norm). Task bundles cache theirs across tasks; anything else is computed from its metadata.
+        """
+        if isinstance(task_bundle, TaskBundle):
+            return task_bundle.get_semantic_neighborhood()
+        neighborhood = await self._calculate_semantic_neighborhood(task_bundle.input.metadata)
+        return neighborhood, (float(np.linalg.norm(neighborhood)) if neighborhood is not None else 0.0)
+
     async def _calculate_semantic_neighborhood(self, conversation_metadata: ConversationMetadata, tag_count_ceiling=None):
         all_vectors = []
         count = 0
@@ -225,6 +342,122 @@ class GroundTruthTagSimilarityScoringMechanism(ScoringMechanism):
 
         return (scores, scores_both, scores_unique, diff)
 
+    def _collect_tag_vectors(self, full_convo_tags, miner_result):
+        """
+        Picks the tags _calc_scores would score and returns (diff, unique flags, vectors).
+        Tags without vectors get None.
+        """
+        tags = miner_result["tags"]
+        tag_vector_dict = miner_result["vectors"]
+
+        # Remove duplicate tags
+        tag_set = list(set(tags))
+        diff = Utils.compare_arrays(full_convo_tags, tag_set)
+
+        # _calc_scores scores indexes 0 to max_scored_tags inclusive
+        if len(tag_set) > self.max_scored_tags + 1:
+            bt.logging.debug(f"WARNING 638871: Total tag count ({len(tag_set)}) is greater than max_scored_tags. Only {self.max_scored_tags} will be scored")
+            tag_set = tag_set[: self.max_scored_tags + 1]
+
+        unique_flags = []
+        vectors = []
+        for tag in tag_set:
+            is_unique = tag in diff['unique_2']
+            unique_flags.append(is_unique)
+            if not tag in tag_vector_dict:
+                bt.logging.error(f"No vectors found for tag '{tag}'. Score of 0. Unique: {is_unique}")
+                vectors.append(None)
+                continue
+            vectors.append(tag_vector_dict[tag]['vectors'])
+
+        return (diff, unique_flags, vectors)
+
+    def _score_tag_vectors(self, neighborhood_vectors, vectors, neighborhood_norm=None):
+        """
+        Cosine similarity of every vector against the neighborhood in one matmul, as float64 scores.
+        Mirrors _score_vector_similarity: missing or unscorable vectors score 0.
+        """
+        scores = np.full(len(vectors), 0.0)
+        if neighborhood_vectors is None:
+            if any(vector is not None for vector in vectors):
+                bt.logging.error("Error generating similarity_score. Setting to zero.")
+            return scores
+
+        neighborhood = np.asarray(neighborhood_vectors, dtype=self.similarity_dtype)
+        dimensions = neighborhood.shape[0]
+        rows = [i for i, vector in enumerate(vectors) if vector is not None and len(vector) == dimensions]
+        if len(rows) < sum(vector is not None for vector in vectors):
+            bt.logging.error("Error generating similarity_score. Setting to zero.")
+        if not rows:
+            return scores
+
+        matrix = np.empty((len(rows), dimensions), dtype=self.similarity_dtype)
+        for row, i in enumerate(rows):
+            matrix[row] = vectors[i]
+        norms = np.linalg.norm(matrix, axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            unit_neighborhood = neighborhood / (np.linalg.norm(neighborhood) if neighborhood_norm is None else neighborhood_norm)
+            similarities = (matrix @ unit_neighborhood) / norms
+
+        # _score_vector_similarity only catches all-zero numpy vectors; zero lists come out as nan like before
+        empty = np.array([isinstance(vectors[i], np.ndarray) for i in rows]) & (norms == 0)
+        if empty.any():
+            bt.logging.error("All empty vectors")
+            similarities[empty] = 0
+
+        scores[rows] = similarities
+        return scores
+
+    def _calculate_stats_batch(self, scores, unique_mask, offsets):
+        """
+        _calculate_stats for many miners at once. Miner i owns scores[offsets[i]:offsets[i + 1]].
+        """
+        num_segments = len(offsets) - 1
+        counts = np.diff(offsets)
+        segment_ids = np.repeat(np.arange(num_segments), counts)
+
+        mean_score = np.full(num_segments, 0.0)
+        median_score = np.full(num_segments, 0.0)
+        min_score = np.full(num_segments, 0.0)
+        max_score = np.full(num_segments, 0.0)
+
+        filled = counts > 0
+        if filled.any():
+            starts = offsets[:-1][filled]
+            filled_counts = counts[filled]
+            mean_score[filled] = np.add.reduceat(scores, starts) / filled_counts
+            min_score[filled] = np.minimum.reduceat(scores, starts)
+            max_score[filled] = np.maximum.reduceat(scores, starts)
+
+            # Sort inside each segment, then average the middle element(s)
+            sorted_scores = scores[np.lexsort((scores, segment_ids))]
+            low = sorted_scores[starts + (filled_counts - 1) // 2]
+            high = sorted_scores[starts + filled_counts // 2]
+            has_nan = np.logical_or.reduceat(np.isnan(scores), starts)
+            median_score[filled] = np.where(has_nan, np.nan, (low + high) / 2)
+
+        # Mean of the 3 highest unique scores, padded with zeros. nan sorts last so it is kept, like np.sort.
+        unique_scores = scores[unique_mask]
+        unique_ids = segment_ids[unique_mask]
+        order = np.lexsort((unique_scores, unique_ids))
+        unique_scores = unique_scores[order]
+        unique_ids = unique_ids[order]
+        unique_ends = np.cumsum(np.bincount(unique_ids, minlength=num_segments))
+        from_end = unique_ends[unique_ids] - 1 - np.arange(len(unique_ids))
+        top = from_end < 3
+        top_3_mean = np.bincount(unique_ids[top], weights=unique_scores[top], minlength=num_segments) / 3
+
+        return [
+            {
+                'top_3_mean': Utils.safe_value(top_3_mean[i]),
+                'median_score': Utils.safe_value(median_score[i]),
+                'mean_score': Utils.safe_value(mean_score[i]),
+                'max_score': Utils.safe_value(max_score[i]),
+                'min_score': Utils.safe_value(min_score[i]),
+            }
+            for i in range(num_segments)
+        ]
+
     async def _calculate_penalty(self, score, num_tags, num_unique_tags, min_score, max_score):
         final_score = score
         num_both_tags = num_tags - num_unique_tags
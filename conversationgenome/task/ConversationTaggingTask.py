@@ -9,6 +9,7 @@ from pydantic import BaseModel
 from conversationgenome.api.models.conversation import Conversation
 from conversationgenome.llm.llm_factory import get_llm_backend
 from conversationgenome.task.Task import Task
+from conversationgenome.utils.Deadline import Deadline
 
 
 class ConversationTaskInputData(BaseModel):
@@ -28,7 +29,7 @@ class ConversationTaggingTask(Task):
     type: Literal["conversation_tagging"] = "conversation_tagging"
     input: Optional[ConversationTaskInput] = None
 
-    async def mine(self) -> dict[str, list]:
+    async def mine(self, deadline: Optional[Deadline] = None) -> dict[str, list]:
         llml = get_llm_backend()
 
         try:
@@ -39,7 +40,7 @@ class ConversationTaggingTask(Task):
                 input_categories=self.input.input_categories
             )
 
-            result = llml.conversation_to_metadata(conversation=conversation, generateEmbeddings=False)
+            result = await llml.aconversation_to_metadata(conversation=conversation, generateEmbeddings=False)
             output = {"tags": result.tags, "vectors": result.vectors}
         except Exception as e:
             bt.logging.error(f"Error during mining: {e}")
@@ -10,6 +10,7 @@ from pydantic import BaseModel
 from conversationgenome.api.models.conversation import Conversation
 from conversationgenome.llm.llm_factory import get_llm_backend
 from conversationgenome.task.Task import Task
+from conversationgenome.utils.Deadline import Deadline
 
 
 class NamedEntitiesExtractionTaskInputData(BaseModel):
@@ -28,7 +29,7 @@ class NamedEntitiesExtractionTask(Task):
     type: Literal["named_entities_extraction"] = "named_entities_extraction"
     input: Optional[NamedEntitiesExtractionTaskInput] = None
 
-    async def mine(self) -> dict[str, list]:
+    async def mine(self, deadline: Optional[Deadline] = None) -> dict[str, list]:
         llml = get_llm_backend()
 
         if not len(self.input.data.window):
@@ -36,25 +37,18 @@ class NamedEntitiesExtractionTask(Task):
             return {"tags": []}
         
         try:
-            all_tags = []
-            # Process each line in the window
-            for idx, (line_idx, content) in enumerate(self.input.data.window):
+            async def mine_line(idx, content):
                 if idx == 0:
                     # First line is always the main transcript content
-                    result = llml.raw_transcript_to_named_entities(content, generateEmbeddings=False)
-                else:
-                    # Subsequent lines are enrichment content
-                    result = llml.enrichment_to_NER(content, generateEmbeddings=False)
+                    return await llml.araw_transcript_to_named_entities(content, generateEmbeddings=False)
+                # Subsequent lines are enrichment content
+                return await llml.aenrichment_to_NER(content, generateEmbeddings=False)
 
-                if result and result.tags:
-                    all_tags.append(result.tags)
+            # The lines are prompted concurrently
+            all_tags = await self.mine_window_lines(mine_line, deadline=deadline)
 
             # Combine all tags from transcript and enrichment content
-            if all_tags:
-                combined_result = llml.combine_named_entities(all_tags, generateEmbeddings=False)
-                output = {"tags": combined_result.tags if combined_result else [], "vectors": combined_result.vectors if combined_result else None}
-            else:
-                output = {"tags": [], "vectors": None}
+            output = await self.combine_window_tags(all_tags, lambda tags: llml.acombine_named_entities(tags, generateEmbeddings=False), deadline=deadline)
 
         except Exception as e:
             bt.logging.error(f"Error during mining: {e}")
@@ -4,6 +4,7 @@ import bittensor as bt
 from pydantic import BaseModel
 from conversationgenome.llm.llm_factory import get_llm_backend
 from conversationgenome.task.Task import Task
+from conversationgenome.utils.Deadline import Deadline
 
 
 class SurveyTaggingTaskInputData(BaseModel):
@@ -19,10 +20,10 @@ class SurveyTaggingTask(Task):
     type: Literal["survey_tagging"] = "survey_tagging"
     input: Optional[SurveyTaggingTaskInput] = None
 
-    async def mine(self) -> dict[str, list]:
+    async def mine(self, deadline: Optional[Deadline] = None) -> dict[str, list]:
         try:
             llml = get_llm_backend()
-            res = llml.survey_to_metadata(self.input.data.survey_question, self.input.data.comment)
+            res = await llml.asurvey_to_metadata(self.input.data.survey_question, self.input.data.comment)
             return {"tags": res.tags, "vectors": res.vectors}
         
         except Exception as e:
@@ -1,15 +1,28 @@
+import asyncio
 from abc import ABC
 from abc import abstractmethod
 from typing import Any
+from typing import Awaitable
+from typing import Callable
 from typing import List
 from typing import Optional
 
 from pydantic import BaseModel
 
+from conversationgenome.ConfigLib import c
+from conversationgenome.mock.MockBt import MockBt
 from conversationgenome.prompt_chain.PromptChainStep import PromptChainStep
 from conversationgenome.scoring_mechanism.example_output_union import ExampleOutputUnion
 from conversationgenome.utils.constants import TaskType
+from conversationgenome.utils.Deadline import Deadline
 from conversationgenome.utils.types import ForceStr
+from conversationgenome.utils.Utils import Utils
+
+bt = None
+try:
+    import bittensor as bt
+except:
+    bt = MockBt()
 
 
 # ---------- Base task ----------
@@ -25,5 +38,65 @@ class Task(BaseModel, ABC):
     example_output: Optional[ExampleOutputUnion] = None
 
     @abstractmethod
-    async def mine(self) -> dict[str, list]:
+    async def mine(self, deadline: Optional[Deadline] = None) -> dict[str, list]:
         pass
+
+    async def mine_window_lines(self, mine_line: Callable[[int, str], Awaitable[Any]], deadline: Optional[Deadline] = None) -> List[List[str]]:
+        """
+        Runs mine_line(idx, content) for every line of the input window at once, at most MINER_LINE_CONCURRENCY
+        at a time, and returns the tags of each line in window order.
+
+        Partial results: a line that fails, takes longer than MINER_LINE_TIMEOUT seconds if set, or is still running
+        MINER_COMBINE_RESERVE seconds before the deadline is left out and the tags of the other lines are returned.
+        If every line timed out, no tags are returned so the miner still answers in time. If every line failed and
+        at least one failure was not a timeout, the first such error is raised.
+        """
+        deadline = deadline or Deadline()
+        window = self.input.data.window or []
+        concurrency = max(1, Utils._int(c.get("env", "MINER_LINE_CONCURRENCY", 4), 4))
+        timeout = Utils._float(c.get("env", "MINER_LINE_TIMEOUT", 0), 0) or None
+        # Time left for the combine step after the lines
+        reserve = Utils._float(c.get("env", "MINER_COMBINE_RESERVE", 3), 3)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_line(idx: int, content: str):
+            async with semaphore:
+                return await deadline.run(mine_line(idx, content), reserve=reserve, timeout=timeout)
+
+        results = await asyncio.gather(*(run_line(idx, content) for idx, (_, content) in enumerate(window)), return_exceptions=True)
+
+        all_tags = []
+        errors = []
+        for idx, result in enumerate(results):
+            if isinstance(result, BaseException):
+                reason = "timed out" if isinstance(result, asyncio.TimeoutError) else f"failed: {result}"
+                bt.logging.warning(f"{self.type}: window line {idx} {reason}, leaving it out")
+                errors.append(result)
+            elif result and result.tags:
+                all_tags.append(result.tags)
+
+        if errors and len(errors) == len(results):
+            failures = [error for error in errors if not isinstance(error, asyncio.TimeoutError)]
+            if failures:
+                raise failures[0]
+        if errors:
+            deadline.partial = True
+        return all_tags
+
+    async def combine_window_tags(self, all_tags: List[List[str]], combine: Callable[[List[List[str]]], Awaitable[Any]], deadline: Optional[Deadline] = None) -> dict[str, list]:
+        """
+        Runs the combine step over the tags of the window lines. If the deadline passes first, the combine call is
+        cancelled and the line tags are returned merged as they are, without vectors.
+        """
+        if not all_tags:
+            return {"tags": [], "vectors": None}
+
+        deadline = deadline or Deadline()
+        try:
+            combined_result = await deadline.run(combine(all_tags))
+        except asyncio.TimeoutError:
+            bt.logging.warning(f"{self.type}: no time left to combine the tags of {len(all_tags)} lines, returning them uncombined")
+            deadline.partial = True
+            return {"tags": list(dict.fromkeys(tag for tags in all_tags for tag in tags)), "vectors": None}
+
+        return {"tags": combined_result.tags if combined_result else [], "vectors": combined_result.vectors if combined_result else None}
@@ -2,6 +2,9 @@ from typing import Any
 
 from conversationgenome import __version__ as CGP_VERSION
 from conversationgenome.api.ApiLib import ApiLib
+from conversationgenome.api.models.tag_vectors import PACKED_DTYPES
+from conversationgenome.api.models.tag_vectors import pack_vector_fields
+from conversationgenome.api.UploadQueue import get_task_upload_queue
 from conversationgenome.ConfigLib import c
 
 
@@ -35,7 +38,18 @@ class TaskLib:
             "batch_number": batch_number,
         }
 
+        # Optional compact float32/float16 encoding of tag embeddings, see PackedTagVectors
+        vector_encoding = c.get("env", "VECTOR_ENCODING")
+        if vector_encoding in PACKED_DTYPES:
+            data = pack_vector_fields(data, dtype=vector_encoding)
+
         output['data'] = data
+
+        upload_queue = get_task_upload_queue()
+        if upload_queue:
+            upload_queue.enqueue(task_bundle_id, output)
+            return True
+
         api = ApiLib()
         result = await api.put_task_data(task_bundle_id, output)
 
@@ -8,6 +8,7 @@ from pydantic import BaseModel
 
 from conversationgenome.llm.llm_factory import get_llm_backend
 from conversationgenome.task.Task import Task
+from conversationgenome.utils.Deadline import Deadline
 
 
 class WebpageMarkdownTaskInputData(BaseModel):
@@ -25,31 +26,23 @@ class WebpageMetadataGenerationTask(Task):
     type: Literal["webpage_metadata_generation"] = "webpage_metadata_generation"
     input: Optional[WebpageMarkdownTaskInput] = None
 
-    async def mine(self) -> dict[str, list]:
+    async def mine(self, deadline: Optional[Deadline] = None) -> dict[str, list]:
         llml = get_llm_backend()
 
         try:
-            all_tags = []
-            
-            # Process each line in the window
-            for idx, (line_idx, content) in enumerate(self.input.data.window):
+            async def mine_line(idx, content):
                 if idx == 0:
                     # First line is always the main webpage content
-                    result = llml.website_to_metadata(content, generateEmbeddings=False, input_categories=self.input.input_categories)
-                else:
-                    # Subsequent lines are enrichment content
-                    result = llml.enrichment_to_metadata(content, generateEmbeddings=False, input_categories=self.input.input_categories)
-                
-                if result and result.tags:
-                    all_tags.append(result.tags)
-            
+                    return await llml.awebsite_to_metadata(content, generateEmbeddings=False, input_categories=self.input.input_categories)
+                # Subsequent lines are enrichment content
+                return await llml.aenrichment_to_metadata(content, generateEmbeddings=False, input_categories=self.input.input_categories)
+
+            # The lines are prompted concurrently
+            all_tags = await self.mine_window_lines(mine_line, deadline=deadline)
+
             # Combine all tags from webpage and enrichment content
-            if all_tags:
-                combined_result = llml.combine_metadata_tags(all_tags, generateEmbeddings=False)
-                output = {"tags": combined_result.tags if combined_result else [], "vectors": combined_result.vectors if combined_result else None}
-            else:
-                output = {"tags": [], "vectors": None}
-                
+            output = await self.combine_window_tags(all_tags, lambda tags: llml.acombine_metadata_tags(tags, generateEmbeddings=False), deadline=deadline)
+
         except Exception as e:
             bt.logging.error(f"Error during mining: {e}")
             raise e
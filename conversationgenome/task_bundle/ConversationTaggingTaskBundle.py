@@ -84,7 +84,7 @@ class ConversationTaggingTaskBundle(TaskBundle):
             participants=self.input.data.participants,
             miner_task_prompt=self.input.data.prompt,
         )
-        result: ConversationQualityMetadata|None = llml.validate_conversation_quality(conversation=conversation)
+        result: ConversationQualityMetadata|None = await llml.avalidate_conversation_quality(conversation=conversation)
         if result:
             # For now, only store quality score, down the line we can expand to store more detailed metadata if we want to use it
             self.input.quality_score = result.quality_score
@@ -134,7 +134,7 @@ class ConversationTaggingTaskBundle(TaskBundle):
         miner_result['original_tags'] = miner_result['tags']
         # Clean and validate tags for duplicates or whitespace matches
         llml = get_llm_backend()
-        miner_result['tags'] = llml.validate_tag_set(miner_result['original_tags'])
+        miner_result['tags'] = await llml.avalidate_tag_set(miner_result['original_tags'])
         miner_result['vectors'] = await self._get_vector_embeddings_set(llml=llml, tags=miner_result['tags'])
         return miner_result
 
@@ -194,7 +194,7 @@ class ConversationTaggingTaskBundle(TaskBundle):
             miner_task_prompt=self.input.data.prompt,
             input_categories=self.input.input_categories
         )
-        result: RawMetadata = llml.conversation_to_metadata(conversation=conversation, generateEmbeddings=True)
+        result: RawMetadata = await llml.aconversation_to_metadata(conversation=conversation, generateEmbeddings=True)
 
         if not result:
             bt.logging.error(f"ERROR:2873226353. No conversation metadata returned. Aborting.")
@@ -211,4 +211,4 @@ class ConversationTaggingTaskBundle(TaskBundle):
         )
 
     async def _get_vector_embeddings_set(self, llml: LlmLib, tags):
-        return llml.get_vector_embeddings_set(tags)
+        return await llml.aget_vector_embeddings_set(tags)
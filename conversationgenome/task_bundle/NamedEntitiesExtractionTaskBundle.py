@@ -17,6 +17,7 @@ import bittensor as bt
 from pydantic import BaseModel
 
 from conversationgenome.api.models.conversation_metadata import ConversationMetadata
+from conversationgenome.api.models.tag_vectors import TagVectors
 
 from conversationgenome.ConfigLib import c
 from conversationgenome.api.models.raw_metadata import RawMetadata
@@ -33,7 +34,7 @@ NAMED_ENTITIES_CATEGORIES = ["people", "organizations", "locations", "laws_statu
 
 class NERMetadata(BaseModel):
     tags: List[str]
-    vectors: Dict[str, Dict[str, List[float]]]
+    vectors: TagVectors
     participantProfiles: Optional[List[str]] = None
 
 
@@ -76,17 +77,16 @@ class NamedEntitiesExtractionTaskBundle(TaskBundle):
         return False
 
     async def setup(self) -> None:
-        self._generate_metadata()
+        await self._generate_metadata()
 
-    def _generate_metadata(self) -> None:
+    async def _generate_metadata(self) -> None:
         bt.logging.info(f"Generating metadata for NER recognition")
         parsed_json = json.loads(self.input.data.lines[0][1])
         llml = get_llm_backend()
 
         # Max 1000 characters
         transcript_text = parsed_json['transcript_text'][:1000]
-        transcript_metadata = llml.raw_transcript_to_named_entities(transcript_text)
-        tags = [transcript_metadata.tags]
+        calls = [llml.araw_transcript_to_named_entities(transcript_text)]
 
         enrichment_lines = []
         if parsed_json.get('enrichment'):
@@ -104,12 +104,14 @@ class NamedEntitiesExtractionTaskBundle(TaskBundle):
                     
                     if enrichment_text.strip():
                         enrichment_lines.append((len(enrichment_lines), enrichment_text))
-                        enrichment_metadata = llml.enrichment_to_NER(enrichment_text)
-                        tags.append(enrichment_metadata.tags)
+                        calls.append(llml.aenrichment_to_NER(enrichment_text))
         else:
             bt.logging.info(f"Generating non-enriched metadata for NER")
 
-        result: RawMetadata = llml.combine_named_entities(tags, generateEmbeddings=True)
+        # The transcript and enrichment calls are independent, run them together
+        tags = [metadata.tags for metadata in await self._gather_llm_calls(calls)]
+
+        result: RawMetadata = await llml.acombine_named_entities(tags, generateEmbeddings=True)
         self.input.metadata = NERMetadata(
             tags=getattr(result, "tags", []),
             vectors=getattr(result, "vectors", {}),
@@ -167,4 +169,4 @@ class NamedEntitiesExtractionTaskBundle(TaskBundle):
         return masked_task
 
     async def _get_vector_embeddings_set(self, llml: LlmLib, tags):
-        return llml.get_vector_embeddings_set(tags)
+        return await llml.aget_vector_embeddings_set(tags)
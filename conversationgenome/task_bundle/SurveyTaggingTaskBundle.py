@@ -5,6 +5,7 @@ import uuid
 import bittensor as bt
 from pydantic import BaseModel
 
+from conversationgenome.api.models.tag_vectors import TagVectors
 from conversationgenome.llm.llm_factory import get_llm_backend
 from conversationgenome.scoring_mechanism.GroundTruthTagSimilarityScoringMechanism import GroundTruthTagSimilarityScoringMechanism
 from conversationgenome.task.Task import Task
@@ -41,7 +42,7 @@ class SurveyMetadata(BaseModel):
     selected_choices: Optional[list[str]] = None
 
     tags: List[str]
-    vectors: Dict[str, Dict[str, List[float]]]
+    vectors: TagVectors
     participantProfiles: Optional[List[str]] = None
 
 class SurveyTaggingInput(BaseModel):
@@ -66,7 +67,7 @@ class SurveyTaggingTaskBundle(TaskBundle):
         llml = get_llm_backend()
         self.input.metadata = SurveyMetadata(
             tags=parsed_json['selected_choices'],
-            vectors= llml.get_vector_embeddings_set(parsed_json['selected_choices']),
+            vectors= await llml.aget_vector_embeddings_set(parsed_json['selected_choices']),
             survey_question = parsed_json['survey_question'],
             comment = parsed_json['comment'],
             possible_choices = parsed_json['possible_choices'],
@@ -100,8 +101,8 @@ class SurveyTaggingTaskBundle(TaskBundle):
     async def format_results(self, miner_result) -> str:
         miner_result['original_tags'] = miner_result['tags']
         llml = get_llm_backend()
-        miner_result['tags'] = llml.validate_tag_set(tags=miner_result['original_tags'])
-        miner_result['vectors'] = llml.get_vector_embeddings_set(tags=miner_result['tags'])
+        miner_result['tags'] = await llml.avalidate_tag_set(tags=miner_result['original_tags'])
+        miner_result['vectors'] = await llml.aget_vector_embeddings_set(tags=miner_result['tags'])
         return miner_result
 
     def generate_result_logs(self, miner_result) -> str:
@@ -1,18 +1,30 @@
+import asyncio
+import weakref
 from abc import ABC
 from abc import abstractmethod
 from copy import deepcopy
 from typing import Any
 from typing import List
 from typing import Optional
+from typing import Tuple
 
+import bittensor as bt
+import numpy as np
 from pydantic import BaseModel
 from pydantic import Field
+from pydantic import PrivateAttr
 
+from conversationgenome.api.models.tag_vectors import PackedTagVectors
+from conversationgenome.ConfigLib import c
 from conversationgenome.prompt_chain.PromptChainStep import PromptChainStep
 from conversationgenome.scoring_mechanism.example_output_union import ExampleOutputUnion
 from conversationgenome.task.Task import Task
 from conversationgenome.utils.constants import TaskType
 from conversationgenome.utils.types import ForceStr
+from conversationgenome.utils.Utils import Utils
+
+# One limit per event loop shared by the setup LLM calls of every bundle, see TaskBundle._gather_llm_calls
+_SETUP_SEMAPHORES = weakref.WeakKeyDictionary()
 
 
 # ---------- Base task bundle ----------
@@ -27,6 +39,8 @@ class TaskBundle(BaseModel, ABC):
     example_output: Optional[ExampleOutputUnion] = None
     errors: List[Any] = Field(default_factory=list)
     warnings: List[Any] = Field(default_factory=list)
+    # (metadata fingerprint, neighborhood, norm), see get_semantic_neighborhood
+    _semantic_neighborhood: Optional[Tuple[Any, Any, float]] = PrivateAttr(default=None)
 
     @abstractmethod
     def is_ready(self) -> bool:
@@ -65,3 +79,63 @@ class TaskBundle(BaseModel, ABC):
         masked_task.input.guid = HIDDEN_GUID
 
         return masked_task
+
+    def get_semantic_neighborhood(self) -> Tuple[Optional[np.ndarray], float]:
+        """
+        Returns the mean of the ground truth tag vectors as a float32 array, and its norm.
+        Computed once per bundle and shared by every task; recomputed if input.metadata or its vectors are replaced.
+        """
+        metadata = getattr(self.input, "metadata", None)
+        vectors = getattr(metadata, "vectors", None)
+        fingerprint = (id(metadata), id(vectors), len(vectors) if vectors is not None else 0)
+        if self._semantic_neighborhood is None or self._semantic_neighborhood[0] != fingerprint:
+            neighborhood, norm = self._build_semantic_neighborhood(vectors)
+            self._semantic_neighborhood = (fingerprint, neighborhood, norm)
+        return self._semantic_neighborhood[1], self._semantic_neighborhood[2]
+
+    def invalidate_semantic_neighborhood(self) -> None:
+        self._semantic_neighborhood = None
+
+    def _build_semantic_neighborhood(self, vectors) -> Tuple[Optional[np.ndarray], float]:
+        if not vectors:
+            return (None, 0.0)
+        if isinstance(vectors, PackedTagVectors):
+            matrix = vectors.matrix
+        else:
+            try:
+                matrix = np.array([val['vectors'] for val in vectors.values()], dtype=np.float32)
+            except ValueError as e:
+                bt.logging.error(f"Ground truth vectors of task bundle {self.guid} have different dimensions: {e}")
+                return (None, 0.0)
+        neighborhood = matrix.mean(axis=0, dtype=np.float64).astype(np.float32)
+        return (neighborhood, float(np.linalg.norm(neighborhood)))
+
+    async def _gather_llm_calls(self, coroutines) -> List[Any]:
+        """
+        Runs independent setup LLM calls concurrently and returns their results in order.
+        At most validator.setup_llm_concurrency calls run at once across all bundles being set up.
+        """
+        semaphore = _get_setup_semaphore()
+
+        async def limited(coroutine):
+            async with semaphore:
+                return await coroutine
+
+        tasks = [asyncio.ensure_future(limited(coroutine)) for coroutine in coroutines]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+
+def _get_setup_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _SETUP_SEMAPHORES.get(loop)
+    if semaphore is None:
+        concurrency = max(1, Utils._int(c.get("validator", "setup_llm_concurrency", 8), 8))
+        semaphore = asyncio.Semaphore(concurrency)
+        _SETUP_SEMAPHORES[loop] = semaphore
+    return semaphore
@@ -1,6 +1,7 @@
 import random
 
 from conversationgenome import __version__ as CGP_VERSION
+from conversationgenome.analytics.StageMetrics import time_stage
 from conversationgenome.api.ApiLib import ApiLib
 from conversationgenome.task_bundle.TaskBundle import TaskBundle
 
@@ -10,6 +11,10 @@ class TaskBundleLib:
         api = ApiLib()
         task_bundle: TaskBundle = await api.reserve_task_bundle(hotkey, api_key=api_key)
         
-        await task_bundle.setup()
+        with time_stage("setup"):
+            await task_bundle.setup()
+        if task_bundle.is_ready():
+            # Scored against by every task of the bundle
+            task_bundle.get_semantic_neighborhood()
 
         return task_bundle
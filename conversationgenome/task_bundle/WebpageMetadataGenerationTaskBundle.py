@@ -115,7 +115,7 @@ class WebpageMetadataGenerationTaskBundle(TaskBundle):
         miner_result['original_tags'] = miner_result['tags']
         # Clean and validate tags for duplicates or whitespace matches
         llml = get_llm_backend()
-        miner_result['tags'] = llml.validate_tag_set(tags=miner_result['original_tags'])
+        miner_result['tags'] = await llml.avalidate_tag_set(tags=miner_result['original_tags'])
         miner_result['vectors'] = await self._get_vector_embeddings_set(llml=llml, tags=miner_result['tags'])
         return miner_result
 
@@ -157,9 +157,8 @@ class WebpageMetadataGenerationTaskBundle(TaskBundle):
         
         # Max 1000 characters from the main website markdown
         website_markdown = parsed_json['website_markdown'][:1000]
-        website_metadata = llml.website_to_metadata(website_markdown, input_categories=self.input.input_categories)
-        tags = [website_metadata.tags]
-        
+        calls = [llml.awebsite_to_metadata(website_markdown, input_categories=self.input.input_categories)]
+
         enrichment_lines = []
         if parsed_json.get('enrichment'):
             bt.logging.info(f"Generating enrichment metadata for webpage")
@@ -176,16 +175,18 @@ class WebpageMetadataGenerationTaskBundle(TaskBundle):
                     
                     if enrichment_text.strip():
                         enrichment_lines.append((len(enrichment_lines), enrichment_text))
-                        enrichment_metadata = llml.enrichment_to_metadata(enrichment_text, input_categories=self.input.input_categories)
-                        tags.append(enrichment_metadata.tags)
+                        calls.append(llml.aenrichment_to_metadata(enrichment_text, input_categories=self.input.input_categories))
         else:
             bt.logging.info(f"Generating non-enriched metadata for webpage")
-        
+
+        # The main page and enrichment calls are independent, run them together
+        tags = [metadata.tags for metadata in await self._gather_llm_calls(calls)]
+
         # Update input data with main website content + selected enrichment results
         self.input.data.lines = [(0, website_markdown)] + enrichment_lines
         
         # Combine all tags from main page and enrichment
-        result: RawMetadata = llml.combine_metadata_tags(tags, generateEmbeddings=True)
+        result: RawMetadata = await llml.acombine_metadata_tags(tags, generateEmbeddings=True)
         
         if not result:
             bt.logging.error(f"ERROR:2873226353. No metadata returned. Aborting.")
@@ -201,4 +202,4 @@ class WebpageMetadataGenerationTaskBundle(TaskBundle):
         )
 
     async def _get_vector_embeddings_set(self, llml: LlmLib, tags):
-        return llml.get_vector_embeddings_set(tags)
+        return await llml.aget_vector_embeddings_set(tags)
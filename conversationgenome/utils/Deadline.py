@@ -0,0 +1,49 @@
+import asyncio
+import time
+from typing import Awaitable
+from typing import Optional
+
+
+class Deadline:
+    """
+    Point in time by which the miner has to answer, taken from the timeout the validator set on the synapse.
+
+    `margin` seconds are kept back for sending the response. Tasks use run() to stop waiting on LLM calls that
+    would overrun, and set `partial` when they answer with less than the full result so it is not cached.
+    """
+
+    def __init__(self, expires_at: Optional[float] = None):
+        self.expires_at = expires_at
+        self.partial = False
+
+    @classmethod
+    def from_timeout(cls, timeout: Optional[float], margin: float = 0.0) -> "Deadline":
+        if not timeout or timeout <= 0:
+            return cls()
+        return cls(time.monotonic() + max(0.0, timeout - margin))
+
+    def remaining(self, reserve: float = 0.0) -> Optional[float]:
+        """
+        Seconds left, less `reserve`, never below 0. None if there is no deadline.
+        """
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic() - reserve)
+
+    def expired(self, reserve: float = 0.0) -> bool:
+        remaining = self.remaining(reserve)
+        return remaining is not None and remaining <= 0
+
+    async def run(self, awaitable: Awaitable, reserve: float = 0.0, timeout: Optional[float] = None):
+        """
+        Awaits `awaitable`, cancelling it and raising asyncio.TimeoutError once the deadline less `reserve` (or
+        `timeout`, if that comes first) has passed.
+        """
+        remaining = self.remaining(reserve)
+        if timeout:
+            remaining = timeout if remaining is None else min(remaining, timeout)
+        if remaining is not None and remaining <= 0:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            raise asyncio.TimeoutError()
+        return await asyncio.wait_for(awaitable, timeout=remaining)
@@ -1,4 +1,3 @@
-import random
 import numpy as np
 from conversationgenome.mock.MockBt import MockBt
 
@@ -36,39 +35,65 @@ def check_uid_availability(
     return True
 
 
+def get_uid_availability(metagraph: "bt.metagraph.Metagraph", vpermit_tao_limit: int) -> np.ndarray:
+    """Availability of every uid at once, with the same rules as check_uid_availability.
+    Args:
+        metagraph (:obj: bt.metagraph.Metagraph): Metagraph object
+        vpermit_tao_limit (int): Validator permit tao limit
+    Returns:
+        mask (np.ndarray): Boolean mask, True for available uids
+    """
+    n = int(metagraph.n)
+    is_serving = np.fromiter((axon.is_serving for axon in metagraph.axons[:n]), dtype=bool, count=n)
+    validator_permit = np.asarray(metagraph.validator_permit, dtype=bool)[:n]
+    stake = np.asarray(metagraph.S, dtype=np.float64)[:n]
+    return is_serving & ~(validator_permit & (stake > vpermit_tao_limit))
+
+
+def get_available_uids(self) -> np.ndarray:
+    """Returns the available uids, computed once per metagraph sync.
+    resync_metagraph clears the cached uids, stake and permits can change without the axons changing.
+    """
+    vpermit_tao_limit = self.config.neuron.vpermit_tao_limit
+    key = (int(self.metagraph.n), vpermit_tao_limit)
+    cached = getattr(self, "available_uids_cache", None)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    available_uids = np.flatnonzero(get_uid_availability(self.metagraph, vpermit_tao_limit))
+    self.available_uids_cache = (key, available_uids)
+    return available_uids
+
+
 def get_random_uids(
     self, k: int, exclude: List[int] = None
 ) -> np.ndarray:
     """Returns k available random uids from the metagraph.
     Args:
         k (int): Number of uids to return.
-        exclude (List[int]): List of uids to exclude from the random sampling.
+        exclude (List[int]): List of uids to exclude from the random sampling, e.g. the uids already queried this step.
     Returns:
         uids (np.ndarray): Randomly sampled available uids.
     Notes:
         If `k` is larger than the number of available `uids`, set `k` to the number of available `uids`.
+        If there are fewer than `k` available uids that are not excluded, excluded uids fill the rest.
     """
-    candidate_uids = []
-    avail_uids = []
-
-    for uid in range(self.metagraph.n.item()):
-        uid_is_available = check_uid_availability(
-            self.metagraph, uid, self.config.neuron.vpermit_tao_limit
-        )
-        uid_is_not_excluded = exclude is None or uid not in exclude
-
-        if uid_is_available:
-            avail_uids.append(uid)
-            if uid_is_not_excluded:
-                candidate_uids.append(uid)
+    avail_uids = get_available_uids(self)
     # If k is larger than the number of available uids, set k to the number of available uids.
     k = min(k, len(avail_uids))
+    if k <= 0:
+        return np.array([], dtype=np.int64)
+
+    if exclude is not None and len(exclude) > 0:
+        is_excluded = np.isin(avail_uids, np.fromiter(exclude, dtype=np.int64))
+        candidate_uids = avail_uids[~is_excluded]
+    else:
+        is_excluded = None
+        candidate_uids = avail_uids
+
     # Check if candidate_uids contain enough for querying, if not grab all avaliable uids
-    available_uids = candidate_uids
     if len(candidate_uids) < k:
-        available_uids += random.sample(
-            [uid for uid in avail_uids if uid not in candidate_uids],
-            k - len(candidate_uids),
-        )
-    uids = np.array(random.sample(available_uids, k))
+        fill_uids = np.random.choice(avail_uids[is_excluded], k - len(candidate_uids), replace=False)
+        candidate_uids = np.concatenate([candidate_uids, fill_uids])
+    uids = np.random.choice(candidate_uids, k, replace=False)
     return uids
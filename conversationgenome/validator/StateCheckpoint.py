@@ -0,0 +1,208 @@
+import json
+import os
+import struct
+
+import numpy as np
+
+from conversationgenome.mock.MockBt import MockBt
+
+bt = None
+try:
+    import bittensor as bt
+except:
+    bt = MockBt()
+
+SNAPSHOT_FILE = "state.ckpt"
+LOG_FILE = "state.log"
+SNAPSHOT_MAGIC = b"CGPCKPT1"
+# Arrays start on an aligned offset so they can be memory mapped
+SNAPSHOT_ALIGNMENT = 64
+
+
+class StateCheckpoint:
+    """
+    Validator state on disk as a full snapshot plus a log of the score updates made since.
+
+    The snapshot holds step, hotkeys, scores and ema_scores. It is written to a temp file, fsynced and renamed
+    over the previous one, so a crash leaves either the old or the new snapshot. Arrays are stored raw after a
+    JSON header and loaded with a copy-on-write memory map.
+
+    Between snapshots every score update is appended to the log as one JSON line (the rewards and UIDs passed to
+    update_scores), so the cost of a checkpoint depends on the number of miners queried, not the size of the
+    metagraph. Records carry a sequence number; the snapshot stores the last one it includes, so a log that was
+    not truncated after a crash is not replayed twice. A torn last line is ignored.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self.log_path = os.path.join(directory, LOG_FILE)
+        self.seq = 0
+        self.log_records = 0
+
+    def exists(self) -> bool:
+        return os.path.isfile(self.snapshot_path)
+
+    def write_snapshot(self, step, scores, ema_scores, hotkeys) -> None:
+        scores = np.ascontiguousarray(scores)
+        ema_scores = np.ascontiguousarray(ema_scores)
+        header = {
+            "version": 1,
+            "step": int(step),
+            "seq": self.seq,
+            "hotkeys": [str(hotkey) for hotkey in hotkeys],
+            "arrays": {},
+        }
+        # Offsets are relative to the end of the header so they don't depend on its length
+        offset = 0
+        for name, array in (("scores", scores), ("ema_scores", ema_scores)):
+            header["arrays"][name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+            offset += _aligned(array.nbytes)
+
+        header_bytes = json.dumps(header).encode("utf-8")
+        data_start = _aligned(len(SNAPSHOT_MAGIC) + 8 + len(header_bytes))
+
+        def write(f):
+            f.write(SNAPSHOT_MAGIC)
+            f.write(struct.pack("<Q", len(header_bytes)))
+            f.write(header_bytes)
+            for name, array in (("scores", scores), ("ema_scores", ema_scores)):
+                f.seek(data_start + header["arrays"][name]["offset"])
+                f.write(array.tobytes())
+
+        _atomic_write(self.snapshot_path, write)
+        # Everything in the log is now part of the snapshot
+        _atomic_write(self.log_path, lambda f: None)
+        self.log_records = 0
+
+    def append(self, step, ops) -> None:
+        """
+        Appends score update ops to the log and fsyncs it. Each op is a dict of JSON-serializable values.
+        """
+        if not ops:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        lines = []
+        for op in ops:
+            self.seq += 1
+            lines.append(json.dumps({"seq": self.seq, "step": int(step), **op}))
+        with open(self.log_path, "a") as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.log_records += len(ops)
+
+    def load(self):
+        """
+        Returns (state, ops) where state has step, hotkeys, scores and ema_scores from the snapshot and ops are
+        the logged updates made after it, in order. Returns (None, []) if there is no readable snapshot.
+        """
+        if not self.exists():
+            return None, []
+        try:
+            state = self._read_snapshot()
+        except Exception as e:
+            bt.logging.error(f"Could not read validator state snapshot {self.snapshot_path}: {e}")
+            return None, []
+
+        ops = [op for op in self._read_log() if op.get("seq", 0) > state["seq"]]
+        self.seq = max([state["seq"]] + [op["seq"] for op in ops])
+        self.log_records = len(ops)
+        if ops:
+            state["step"] = ops[-1].get("step", state["step"])
+        return state, ops
+
+    def _read_snapshot(self) -> dict:
+        with open(self.snapshot_path, "rb") as f:
+            if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                raise ValueError("not a validator state snapshot")
+            (header_length,) = struct.unpack("<Q", f.read(8))
+            header = json.loads(f.read(header_length))
+        data_start = _aligned(len(SNAPSHOT_MAGIC) + 8 + header_length)
+
+        state = {"step": header["step"], "seq": header["seq"], "hotkeys": header["hotkeys"]}
+        for name, spec in header["arrays"].items():
+            shape = tuple(spec["shape"])
+            if int(np.prod(shape)) == 0:
+                state[name] = np.zeros(shape, dtype=np.dtype(spec["dtype"]))
+                continue
+            # Copy-on-write: the arrays can be updated in memory without touching the file
+            state[name] = np.memmap(self.snapshot_path, dtype=np.dtype(spec["dtype"]), mode="c", offset=data_start + spec["offset"], shape=shape).view(np.ndarray)
+        return state
+
+    def _read_log(self) -> list:
+        if not os.path.isfile(self.log_path):
+            return []
+        ops = []
+        with open(self.log_path) as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    bt.logging.warning(f"Ignoring incomplete last record in {self.log_path}")
+                    break
+                try:
+                    ops.append(json.loads(line))
+                except json.JSONDecodeError:
+                    bt.logging.warning(f"Ignoring unreadable record in {self.log_path}")
+        return ops
+
+
+def load_legacy_state(path: str) -> dict:
+    """
+    Reads a state.npz or state.pt file into a dict with step, hotkeys, scores and ema_scores.
+    torch is only imported for .pt files.
+    """
+    if path.endswith(".pt"):
+        import torch
+
+        state = torch.load(path)
+        scores = state["scores"].cpu().numpy()
+        ema_scores = state["ema_scores"].cpu().numpy() if "ema_scores" in state else None
+        step = int(state["step"])
+        hotkeys = list(state["hotkeys"])
+    else:
+        state = np.load(path)
+        scores = state["scores"]
+        ema_scores = state["ema_scores"] if "ema_scores" in state else None
+        step = state["step"].item()
+        hotkeys = state["hotkeys"].tolist()
+
+    if ema_scores is None:
+        bt.logging.info("ema_scores not found in saved state. Initializing with default values.")
+        ema_scores = np.zeros_like(scores)
+    return {"step": step, "hotkeys": hotkeys, "scores": scores, "ema_scores": ema_scores}
+
+
+def convert_legacy_state(path: str, directory: str = None) -> StateCheckpoint:
+    """
+    Writes a checkpoint snapshot from a state.npz or state.pt file, next to it unless directory is given.
+    """
+    state = load_legacy_state(path)
+    checkpoint = StateCheckpoint(directory or os.path.dirname(os.path.abspath(path)))
+    checkpoint.write_snapshot(state["step"], state["scores"], state["ema_scores"], state["hotkeys"])
+    return checkpoint
+
+
+def _aligned(size: int) -> int:
+    return (size + SNAPSHOT_ALIGNMENT - 1) // SNAPSHOT_ALIGNMENT * SNAPSHOT_ALIGNMENT
+
+
+def _atomic_write(path: str, write) -> None:
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    # Make the rename itself durable
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
@@ -0,0 +1,168 @@
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable
+from typing import Callable
+from typing import Optional
+
+from conversationgenome.mock.MockBt import MockBt
+from conversationgenome.task_bundle.TaskBundle import TaskBundle
+
+bt = None
+try:
+    import bittensor as bt
+except:
+    bt = MockBt()
+
+
+class TaskBundleQueue:
+    """
+    Keeps up to `depth` ready task bundles reserved ahead of time. Background workers reserve and set up bundles
+    while the validator is busy querying miners, so forward() does not wait on the API and the LLM for each bundle.
+    Bundles older than `ttl` seconds are dropped instead of served, as their reservation may have lapsed.
+    """
+
+    def __init__(self, reserve: Callable[[], Awaitable[Optional[TaskBundle]]], depth=10, ttl=600, workers=2, retry_delay=5):
+        self.reserve = reserve
+        self.depth = max(1, depth)
+        self.ttl = ttl
+        self.workers = max(1, workers)
+        self.retry_delay = retry_delay
+
+        self._bundles = deque()
+        self._in_flight = 0
+        self._ready = None
+        self._space = None
+        self._tasks = []
+
+        self.reserved = 0
+        self.failed = 0
+        self.not_ready = 0
+        self.expired = 0
+        self.served = 0
+        self.starved = 0
+        self.starved_seconds = 0.0
+
+    def start(self) -> None:
+        if self.is_running():
+            return
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def is_running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    def size(self) -> int:
+        return len(self._bundles)
+
+    async def get(self, timeout=None) -> Optional[TaskBundle]:
+        """
+        Returns the oldest unexpired bundle. When the queue is empty the wait for the workers counts as starvation.
+        Returns None if nothing became ready within `timeout` seconds.
+        """
+        self.start()
+        self._drop_expired()
+        if not self._bundles:
+            self.starved += 1
+            started_at = time.monotonic()
+            deadline = None if timeout is None else started_at + timeout
+            while not self._bundles:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._ready.clear()
+                try:
+                    await asyncio.wait_for(self._ready.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                self._drop_expired()
+            self.starved_seconds += time.monotonic() - started_at
+            if not self._bundles:
+                bt.logging.warning(f"Task bundle queue starved: no bundle ready after {time.monotonic() - started_at:.1f}s.")
+                return None
+
+        reserved_at, task_bundle = self._bundles.popleft()
+        self.served += 1
+        self._space.set()
+        return task_bundle
+
+    def stats(self) -> dict:
+        return {
+            "depth": self.depth,
+            "size": self.size(),
+            "in_flight": self._in_flight,
+            "reserved": self.reserved,
+            "failed": self.failed,
+            "not_ready": self.not_ready,
+            "expired": self.expired,
+            "served": self.served,
+            "starved": self.starved,
+            "starved_seconds": round(self.starved_seconds, 3),
+        }
+
+    async def _worker(self) -> None:
+        while True:
+            try:
+                await self._fill()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Keep prefetching, a worker that dies would leave the queue empty for good
+                bt.logging.error(f"Error in task bundle queue worker: {e}. Retrying in {self.retry_delay}s.")
+                self._space.set()
+                await asyncio.sleep(self.retry_delay)
+
+    async def _fill(self) -> None:
+        """
+        Reserves one bundle and queues it if it is ready. Waits while the queue is full, and for retry_delay seconds
+        after a failed reservation or a bundle that is not ready.
+        """
+        if len(self._bundles) + self._in_flight >= self.depth:
+            self._space.clear()
+            await self._space.wait()
+            return
+
+        self._in_flight += 1
+        try:
+            task_bundle = await self.reserve()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            bt.logging.error(f"Error reserving task bundle for queue: {e}")
+            task_bundle = None
+        finally:
+            self._in_flight -= 1
+
+        if not task_bundle:
+            self.failed += 1
+            self._space.set()
+            await asyncio.sleep(self.retry_delay)
+            return
+
+        if not task_bundle.is_ready():
+            self.not_ready += 1
+            self._space.set()
+            bt.logging.error(f"Task bundle not ready. Skipping.")
+            await asyncio.sleep(self.retry_delay)
+            return
+
+        self.reserved += 1
+        self._bundles.append((time.monotonic(), task_bundle))
+        self._ready.set()
+
+    def _drop_expired(self) -> None:
+        if not self.ttl:
+            return
+        now = time.monotonic()
+        while self._bundles and now - self._bundles[0][0] > self.ttl:
+            self._bundles.popleft()
+            self.expired += 1
+            self._space.set()
@@ -7,6 +7,7 @@ from typing import Optional
 
 import numpy as np
 
+from conversationgenome.analytics.StageMetrics import timed_stage
 from conversationgenome.ConfigLib import c
 from conversationgenome.llm.llm_factory import get_llm_backend
 from conversationgenome.mock.MockBt import MockBt
@@ -32,13 +33,16 @@ class ValidatorLib:
     mode = "test"  # test|local_llm|openai|anthropic
     hotkey = "v1234"
     verbose = False
-    llml = get_llm_backend()
     readyai_api_key = None
 
     def __init__(self):
         super(ValidatorLib, self).__init__()
         self.read_api_key()
 
+    @property
+    def llml(self):
+        return get_llm_backend()
+
     def read_api_key(self):
         fail_message = "WARNING: You have not generated a ReadyAI Conversation Server API key. Starting on October 7th, 2024, you will no longer be able to request conversations from the ReadyAI Conversation server without an API Key. For instructions on how to generate your key, read the documentation in docs/generate-validator-api-key.md"
         fname = "readyai_api_data.json"
@@ -82,6 +86,7 @@ class ValidatorLib:
 
         return raw_task_data
 
+    @timed_stage("upload")
     async def put_task(self, *, hotkey: str, task_bundle_id: str, task_id: str, neuron_type: str, batch_number: int, data: Any) -> None:
         tl = TaskLib()
         await tl.put_task(
@@ -158,14 +163,16 @@ class ValidatorLib:
         return scores, ema_scores
 
     def transposed_cubic_distribution(self, i, num_uids):
+        # i can be a single rank or an array of ranks
         # Calculate the range of x values
         y_min, y_max = 0.001, 0.003
 
         # Normalize i to the range [-1, 1] with the middle index at the inflection point
         x_normalized = (2 * (num_uids - i - 1) / num_uids) - 1
 
-        # Apply the cubic function
-        y_normalized = x_normalized**3
+        # Apply the cubic function. float_power calls the same pow() as Python's ** on floats, so arrays of ranks
+        # get bit-identical results to the scalar version
+        y_normalized = np.float_power(x_normalized, 3)
 
         # Scale y_normalized to the desired range [y_min, y_max]
         y_scaled = y_min + (y_max - y_min) * (y_normalized + 1) / 2
@@ -196,40 +203,26 @@ class ValidatorLib:
 
         distributed_weights = max(0.0, 1.0 - burn_rate)
 
-        # Order the UIDs for weight assignment (based on original scores)
-        ordered_uids = np.argsort(original_scores)[::-1]
-        zero_uids = np.where(original_scores == 0)[0]
-
-        # Determine if there are any ties in original_scores
-        unique_weights, counts = np.unique(original_scores, return_counts=True)
-        ties = unique_weights[counts > 1]
-
-        # If there are ties, randomly shuffle the order of tied UIDs
-        for tie in ties:
-            if tie == 0:
-                continue
-            tied_indices = np.nonzero(original_scores == tie)[0]
-            positions_in_ordered_uids = np.nonzero(np.isin(ordered_uids, tied_indices))[0]
-            shuffled_positions = np.random.permutation(positions_in_ordered_uids)
-            ordered_uids[positions_in_ordered_uids] = ordered_uids[shuffled_positions]
-
-        # Build the list of uids that should receive distributed weights (exclude zeros and burn_uid)
-        ordered_uids_no_zeros = ordered_uids[~np.isin(ordered_uids, zero_uids)]
+        # UIDs that receive distributed weights: everything but zero scores and burn_uid
+        eligible = original_scores != 0
         if burn_uid is not None:
-            ordered_uids_no_zeros = ordered_uids_no_zeros[ordered_uids_no_zeros != burn_uid]
+            eligible[int(burn_uid)] = False
+        eligible_uids = np.nonzero(eligible)[0]
+
+        # Order by score, highest first. Ties are broken by a random secondary key.
+        tie_breaker = np.random.random(len(eligible_uids))
+        ordered_uids_no_zeros = eligible_uids[np.lexsort((tie_breaker, -original_scores[eligible_uids]))]
 
         num_uids = len(ordered_uids_no_zeros)
 
         # If there are non-burn uids to allocate to, compute their base weights
         if num_uids > 0 and distributed_weights > 0:
             temp_weights = np.zeros_like(original_scores, dtype=float)
-            for i, uid in enumerate(ordered_uids_no_zeros):
-                w = self.transposed_cubic_distribution(i, num_uids)
-                if w:
-                    temp_weights[uid] = w
-                else:
-                    bt.logging.error("Error in Weights calculation. Setting this UID to 0")
-                    temp_weights[uid] = 0.0
+            curve = self.transposed_cubic_distribution(np.arange(num_uids), num_uids)
+            if not np.all(np.isfinite(curve)):
+                bt.logging.error("Error in Weights calculation. Setting affected UIDs to 0")
+                curve = np.where(np.isfinite(curve), curve, 0.0)
+            temp_weights[ordered_uids_no_zeros] = curve
 
             sum_temp = float(np.sum(np.abs(temp_weights)))
             if sum_temp > 0:
@@ -258,11 +251,8 @@ class ValidatorLib:
                     if current_burn != burn_rate:
                         # scale factor to map current_burn -> burn_rate while preserving non-burn ratios
                         factor = (1.0 - burn_rate) / others_sum
-                        for i in range(len(raw_weights)):
-                            if i == int(burn_uid):
-                                raw_weights[i] = burn_rate
-                            else:
-                                raw_weights[i] = raw_weights[i] * factor
+                        raw_weights = raw_weights * factor
+                        raw_weights[int(burn_uid)] = burn_rate
                 else:
                     # only burn exists; normalize directly
                     raw_weights[int(burn_uid)] = burn_rate
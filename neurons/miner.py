@@ -20,13 +20,17 @@ import typing
 
 # Bittensor
 import bittensor as bt
+from bittensor.core.errors import PriorityException
 
 from conversationgenome.base.miner import BaseMinerNeuron
 from conversationgenome.ConfigLib import c
 from conversationgenome.miner.MinerLib import MinerLib
+from conversationgenome.miner.MiningQueue import MiningQueue
+from conversationgenome.miner.MiningQueue import MiningQueueFull
 from conversationgenome.protocol import CgSynapse
 from conversationgenome.task import Task
 from conversationgenome.task.task_factory import parse_task
+from conversationgenome.utils.Deadline import Deadline
 from conversationgenome.utils.Utils import Utils
 
 
@@ -37,6 +41,12 @@ class Miner(BaseMinerNeuron):
         super(Miner, self).__init__(config=config)
         c.set("system", "netuid", self.config.netuid)
 
+        self.mining_queue = MiningQueue(
+            workers=Utils._int(c.get("env", "MINER_CONCURRENCY", 4), 4),
+            max_queue=Utils._int(c.get("env", "MINER_QUEUE_SIZE", 16), 16),
+            thread_pool_size=Utils._int(c.get("env", "MINER_THREAD_POOL_SIZE", 0), 0),
+        )
+
     async def forward(self, synapse: CgSynapse) -> CgSynapse:
         """
         Processes the incoming 'CgSynapse' synapse by performing a predefined operation on the input data.
@@ -49,15 +59,24 @@ class Miner(BaseMinerNeuron):
 
         """
         ml = MinerLib()
+        # The validator stops waiting after synapse.timeout, keep some of it for sending the response back
+        deadline = Deadline.from_timeout(synapse.timeout, margin=Utils._float(c.get("env", "MINER_DEADLINE_MARGIN", 1.5), 1.5))
 
         try:
             task: Task = parse_task(synapse.cgp_input[0]["task"])
 
             bt.logging.info(f"Miner received task of type {task.type}")
-            result = await ml.do_mining(task=task)
+            priority = await self.get_queue_priority(synapse)
+            result = await ml.do_mining(task=task, mining_queue=self.mining_queue, priority=priority, deadline=deadline)
+            bt.logging.debug(f"Miner queue: {self.mining_queue.stats()}")
+        except MiningQueueFull as e:
+            bt.logging.warning(f"Shedding {synapse.dendrite.hotkey} request: {e}")
+            raise PriorityException(str(e), synapse=synapse)
         except Exception as e:
-            bt.logging.error(f"Error extracting task from synapse")
-            
+            bt.logging.error(f"Error extracting task from synapse: {e}")
+            # No result to send back, the validator gets an empty response instead of an error
+            return synapse
+
         synapse.cgp_output = [result]
         return synapse
 
@@ -106,6 +125,15 @@ class Miner(BaseMinerNeuron):
         bt.logging.trace(f"Not Blacklisting recognized hotkey {synapse.dendrite.hotkey}")
         return False, "Hotkey recognized!"
 
+    async def get_queue_priority(self, synapse: CgSynapse) -> float:
+        """
+        Stake of the caller for ordering the mining queue, 0 if it is not registered.
+        """
+        try:
+            return await self.priority(synapse)
+        except Exception:
+            return 0.0
+
     async def priority(self, synapse: CgSynapse) -> float:
         """
         This implementation assigns priority to incoming requests based on the calling entity's stake in the metagraph.
@@ -16,6 +16,9 @@
 # DEALINGS IN THE SOFTWARE.
 
 
+import asyncio
+import hashlib
+import json
 import random
 import time
 from typing import List
@@ -23,7 +26,12 @@ from typing import List
 import bittensor as bt
 
 import conversationgenome.utils
+from conversationgenome.analytics.StageMetrics import get_stage_metrics
+from conversationgenome.analytics.StageMetrics import start_metrics_server
+from conversationgenome.analytics.StageMetrics import time_stage
+from conversationgenome.analytics.StageMetrics import timed_stage
 from conversationgenome.analytics.WandbLib import WandbLib
+from conversationgenome.api.UploadQueue import flush_task_upload_queue
 from conversationgenome.api.models.conversation import Conversation
 from conversationgenome.api.models.conversation_metadata import ConversationMetadata
 from conversationgenome.base.validator import BaseValidatorNeuron
@@ -32,11 +40,14 @@ from conversationgenome.task.Task import Task
 from conversationgenome.task_bundle.TaskBundle import TaskBundle
 from conversationgenome.utils.Utils import Utils
 from conversationgenome.validator.evaluator import Evaluator
+from conversationgenome.validator.TaskBundleQueue import TaskBundleQueue
 from conversationgenome.validator.ValidatorLib import ValidatorLib
 
 
 class Validator(BaseValidatorNeuron):
     verbose = False
+    # Result fields format_results fills from the miner's own submission, never copied between grouped responses
+    PER_MINER_RESULT_FIELDS = {"original_tags"}
     """
     Keeping a moving average of the scores of the miners and using them to set weights at the end of each epoch. Additionally, the scores are reset for new hotkeys at the end of each epoch.
     """
@@ -44,13 +55,44 @@ class Validator(BaseValidatorNeuron):
     def __init__(self, config=None):
         super(Validator, self).__init__(config=config)
         c.set("system", "netuid", self.config.netuid)
+        c.set("validator", "num_concurrent_forwards", self.config.neuron.num_concurrent_forwards)
 
         bt.logging.info("load_state()")
         self.load_state()
         self.responses = []
         self.initial_status_codes = {}
         self.final_status_codes = {}
+        self.task_bundle_queue = None
+        start_metrics_server()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        super(Validator, self).__exit__(exc_type, exc_value, traceback)
+        self.stop_task_bundle_queue()
+        # Send task uploads still waiting in the background queue before the process ends
+        flush_task_upload_queue(timeout=Utils._float(c.get("env", "UPLOAD_QUEUE_FLUSH_TIMEOUT", 30), 30))
+
+    def stop_task_bundle_queue(self, timeout=10) -> None:
+        """
+        Cancels the prefetch workers of the task bundle queue on the validator's event loop.
+        """
+        task_bundle_queue = getattr(self, "task_bundle_queue", None)
+        if not task_bundle_queue:
+            return
+        loop = getattr(self, "loop", None)
+        try:
+            if loop is None or loop.is_closed():
+                return
+            if loop.is_running():
+                # The run thread did not stop in time, stop the workers on its loop
+                asyncio.run_coroutine_threadsafe(task_bundle_queue.stop(), loop).result(timeout)
+            else:
+                loop.run_until_complete(task_bundle_queue.stop())
+        except Exception as e:
+            bt.logging.error(f"Error stopping the task bundle queue: {e}")
+        finally:
+            self.task_bundle_queue = None
 
+    @timed_stage("forward")
     async def forward(self, test_mode=False):
         try:
             wl = WandbLib()
@@ -59,6 +101,7 @@ class Validator(BaseValidatorNeuron):
             number_of_task_bundles = c.get("validator", "number_of_task_bundles", 10)
             number_of_task_per_bundle = c.get("validator", "number_of_task_per_bundle", 5)
             minimum_number_of_tasks = c.get("validator", "minimum_number_of_tasks", 10)
+            exclude_queried_uids = c.get("validator", "exclude_queried_uids", False)
 
             # If command line overrides the standard 6 miners, then use that
             if self.config.neuron.sample_size != 6:
@@ -90,7 +133,7 @@ class Validator(BaseValidatorNeuron):
 
             for _ in range(number_of_task_bundles):
                 batch_num = random.randint(100000, 9999999)
-                task_bundle: TaskBundle = await vl.reserve_task_bundle()
+                task_bundle: TaskBundle = await self.get_task_bundle(vl)
 
                 if not task_bundle:
                     continue
@@ -136,6 +179,8 @@ class Validator(BaseValidatorNeuron):
                 bt.logging.error(f"Not enough tasks received from endpoint: {len(selected_tasks)}. Aborting.")
                 return False
 
+            # Miners already sent a task this step, spread the next tasks over other miners first
+            queried_uids = set()
             for task_idx, task in enumerate(selected_tasks):
                 bt.logging.info(f"Looping for piece {task_idx + 1} out of {len(selected_tasks)}")
                 task_bundle_id = task.bundle_guid
@@ -145,7 +190,11 @@ class Validator(BaseValidatorNeuron):
                     bt.logging.error("No task bundle found.")
                     continue
 
-                miner_uids = conversationgenome.utils.uids.get_random_uids(self, k=miner_sample_size)
+                miner_uids = conversationgenome.utils.uids.get_random_uids(
+                    self,
+                    k=miner_sample_size,
+                    exclude=queried_uids if exclude_queried_uids else None,
+                )
 
                 if self.verbose:
                     print(f"miner_uid pool {miner_uids}")
@@ -155,6 +204,7 @@ class Validator(BaseValidatorNeuron):
                     return
 
                 bt.logging.info(f"miner_uid pool {miner_uids}")
+                queried_uids.update(int(uid) for uid in miner_uids)
                 bt.logging.info(f"Sending task of type {task.type} to miners...")
 
                 masked_task = task_bundle.mask_task_for_miner(task)
@@ -162,11 +212,12 @@ class Validator(BaseValidatorNeuron):
                 # Create a synapse to distribute to miners
                 synapse = conversationgenome.protocol.CgSynapse(cgp_input=[{"task": masked_task}])
 
-                responses = await self.dendrite.forward(
-                    axons=[self.metagraph.axons[uid] for uid in miner_uids],
-                    synapse=synapse,
-                    deserialize=False,
-                )
+                with time_stage("dispatch"):
+                    responses = await self.dendrite.forward(
+                        axons=[self.metagraph.axons[uid] for uid in miner_uids],
+                        synapse=synapse,
+                        deserialize=False,
+                    )
 
                 if self.verbose:
                     print("RAW RESPONSES", len(responses))
@@ -191,11 +242,12 @@ class Validator(BaseValidatorNeuron):
                 if uids_to_retry:
                     bt.logging.debug(f"Retrying requests for the following UIDs (same synapse): {uids_to_retry}")
 
-                    retry_responses = await self.dendrite.forward(
-                        axons=[self.metagraph.axons[uid] for uid in uids_to_retry],
-                        synapse=synapse,
-                        deserialize=False,
-                    )
+                    with time_stage("dispatch"):
+                        retry_responses = await self.dendrite.forward(
+                            axons=[self.metagraph.axons[uid] for uid in uids_to_retry],
+                            synapse=synapse,
+                            deserialize=False,
+                        )
 
                     for i, uid in enumerate(uids_to_retry):
                         idx = uid_to_index[uid]
@@ -205,43 +257,19 @@ class Validator(BaseValidatorNeuron):
                         print(f"RETRY RESPONSES (same synapse): {len(retry_responses)}")
                         print(retry_responses)
 
-                for response_idx, response in enumerate(responses):
+                for response in responses:
                     status_code = getattr(response.dendrite, "status_code", None)
                     if status_code is not None:
                         self.final_status_codes[status_code] = self.final_status_codes.get(status_code, 0) + 1
 
-                    if not response.cgp_output:
-                        bt.logging.debug(f"BAD RESPONSE: hotkey: {response.axon.hotkey} - status_code: {getattr(response.dendrite, 'status_code', None)}")
-                        continue
-
-                    try:
-                        miner_response = response.cgp_output
-                    except:
-                        miner_response = response
-
-                    miner_result = miner_response[0]
-                    miner_result = await task_bundle.format_results(miner_result)
-
-                    bt.logging.debug(
-                        f"GOOD RESPONSE: hotkey: {getattr(response.axon, 'hotkey', 'N/A')} "
-                        f"from miner response idx: {response_idx} task id: {task.guid} "
-                        f"{task_bundle.generate_result_logs(miner_result)}"
-                    )
-
-                    # Needs a way to save miner results per task
-                    await vl.put_task(
-                        hotkey=response.axon.hotkey,
-                        task_bundle_id=task_bundle_id,
-                        task_id=task.guid,
-                        neuron_type="miner",
-                        batch_number=batch_num,
-                        data={
-                            "result": miner_result,
-                            "task": task.model_dump(),
-                        },
-                    )
+                grouping = await self.process_miner_responses(vl, task_bundle, task, responses, batch_num)
+                try:
+                    wl.log({"response_grouping_ratio": grouping["grouping_ratio"], "response_groups": grouping["groups"]})
+                except:
+                    pass
 
-                (final_scores, rank_scores) = await task_bundle.evaluate(miner_responses=responses)
+                with time_stage("score"):
+                    (final_scores, rank_scores) = await task_bundle.evaluate(miner_responses=responses)
 
                 if test_mode and responses:
                     print(f"TEST MODE: {len(responses)} responses received for task {task.guid} with {len(final_scores)} final scores")
@@ -274,7 +302,12 @@ class Validator(BaseValidatorNeuron):
                             print("^^^^^^RANK", final_scores, rank_scores, len(final_scores), miner_uids)
 
                     # Update the scores based on the rewards.
-                    self.update_scores(rank_scores, miner_uids)
+                    with time_stage("update_scores"):
+                        self.update_scores(rank_scores, miner_uids)
+
+            stage_metrics = get_stage_metrics()
+            if stage_metrics:
+                bt.logging.debug(f"Stage timings: {stage_metrics.stats()}")
 
             return True
         except Exception as e:
@@ -282,6 +315,141 @@ class Validator(BaseValidatorNeuron):
 
         return False
 
+    async def get_task_bundle(self, vl: ValidatorLib) -> TaskBundle:
+        """
+        Takes the next bundle from the prefetch queue when validator.task_bundle_queue_depth is set,
+        otherwise reserves one directly.
+        """
+        depth = Utils._int(c.get("validator", "task_bundle_queue_depth", 0), 0)
+        if depth <= 0:
+            return await vl.reserve_task_bundle()
+
+        if not getattr(self, "task_bundle_queue", None):
+            self.task_bundle_queue = TaskBundleQueue(
+                ValidatorLib().reserve_task_bundle,
+                depth=depth,
+                ttl=Utils._float(c.get("validator", "task_bundle_queue_ttl", 600), 600),
+                workers=Utils._int(c.get("validator", "task_bundle_queue_workers", 2), 2),
+            )
+
+        task_bundle = await self.task_bundle_queue.get(timeout=Utils._float(c.get("validator", "task_bundle_queue_wait", 300), 300))
+        bt.logging.debug(f"Task bundle queue: {self.task_bundle_queue.stats()}")
+        return task_bundle
+
+    async def process_miner_responses(self, vl: ValidatorLib, task_bundle: TaskBundle, task: Task, responses, batch_number) -> dict:
+        """
+        Formats and uploads the miner responses of a task concurrently, at most validator.response_concurrency at a time.
+        Responses with the same tag set are grouped and formatted once; the formatted result is copied to every
+        response in the group. format_results updates each response in place, so responses stay in miner_uids order
+        for scoring. Responses that fail or are not done within validator.response_deadline seconds are cleared and
+        score zero. Returns the grouping stats of the task.
+        """
+        concurrency = max(1, Utils._int(c.get("validator", "response_concurrency", 6), 6))
+        deadline = Utils._float(c.get("validator", "response_deadline", 120), 120)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def process(group):
+            async with semaphore:
+                await self._process_miner_response_group(vl, task_bundle, task, group, batch_number)
+
+        groups = {}
+        for response_idx, response in enumerate(responses):
+            if not response.cgp_output:
+                bt.logging.debug(f"BAD RESPONSE: hotkey: {response.axon.hotkey} - status_code: {getattr(response.dendrite, 'status_code', None)}")
+                continue
+            key = self.get_response_group_key(response) or f"response-{response_idx}"
+            groups.setdefault(key, []).append((response_idx, response))
+
+        num_responses = sum(len(group) for group in groups.values())
+        grouping = {
+            "responses": num_responses,
+            "groups": len(groups),
+            "grouping_ratio": 1 - len(groups) / num_responses if num_responses else 0.0,
+        }
+        if not groups:
+            return grouping
+        if len(groups) < num_responses:
+            bt.logging.info(f"Grouped {num_responses} miner responses into {len(groups)} distinct tag sets for task id: {task.guid}")
+
+        jobs = {asyncio.ensure_future(process(group)): group for group in groups.values()}
+        done, pending = await asyncio.wait(jobs.keys(), timeout=deadline)
+        for job in pending:
+            job.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        for job, group in jobs.items():
+            for _, response in group:
+                if job in pending:
+                    bt.logging.warning(f"Miner response from hotkey: {getattr(response.axon, 'hotkey', 'N/A')} not processed within {deadline}s for task id: {task.guid}. Discarding.")
+                    response.cgp_output = None
+                elif job.exception():
+                    bt.logging.error(f"Error processing miner response from hotkey: {getattr(response.axon, 'hotkey', 'N/A')} for task id: {task.guid}: {job.exception()}")
+                    response.cgp_output = None
+
+        return grouping
+
+    @staticmethod
+    def get_response_group_key(response) -> str | None:
+        """
+        Hash of the exact response tags, deduplicated and sorted, so the order miners list them in does not matter.
+        Tags are not cleaned: tag validation keeps only exact matches, so "Music" and "music " are not the same
+        result. Returns None if the response has no list of tags.
+        """
+        try:
+            tags = response.cgp_output[0]["tags"]
+            if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+                return None
+            canonical_tags = sorted(set(tags))
+        except Exception:
+            return None
+        return hashlib.sha256(json.dumps(canonical_tags).encode("utf-8")).hexdigest()
+
+    async def _process_miner_response_group(self, vl: ValidatorLib, task_bundle: TaskBundle, task: Task, group, batch_number) -> None:
+        leader_idx, leader = group[0]
+        leader_result = leader.cgp_output[0]
+        original_result = dict(leader_result)
+        with time_stage("format"):
+            formatted_result = await task_bundle.format_results(leader_result)
+        leader.cgp_output[0] = formatted_result
+
+        # Fields format_results added or replaced, shared with the other responses of the group. Each miner keeps
+        # the fields that record what it submitted.
+        formatted_fields = {
+            key: value
+            for key, value in formatted_result.items()
+            if key not in self.PER_MINER_RESULT_FIELDS and (key not in original_result or original_result[key] is not value)
+        }
+        for response_idx, response in group[1:]:
+            miner_result = response.cgp_output[0]
+            if "original_tags" in formatted_result:
+                miner_result["original_tags"] = miner_result.get("tags")
+            miner_result.update(formatted_fields)
+
+        for response_idx, response in group:
+            await self._process_miner_response(vl, task_bundle, task, response_idx, response, batch_number)
+
+    async def _process_miner_response(self, vl: ValidatorLib, task_bundle: TaskBundle, task: Task, response_idx, response, batch_number) -> None:
+        miner_result = response.cgp_output[0]
+
+        bt.logging.debug(
+            f"GOOD RESPONSE: hotkey: {getattr(response.axon, 'hotkey', 'N/A')} "
+            f"from miner response idx: {response_idx} task id: {task.guid} "
+            f"{task_bundle.generate_result_logs(miner_result)}"
+        )
+
+        # Needs a way to save miner results per task
+        await vl.put_task(
+            hotkey=response.axon.hotkey,
+            task_bundle_id=task.bundle_guid,
+            task_id=task.guid,
+            neuron_type="miner",
+            batch_number=batch_number,
+            data={
+                "result": miner_result,
+                "task": task.model_dump(),
+            },
+        )
+
 # The main function parses the configuration and runs the validator.
 if __name__ == "__main__":
     wl = WandbLib()
@@ -0,0 +1,111 @@
+"""
+Compares the vectorized GroundTruthTagSimilarityScoringMechanism.evaluate with the per-tag loop.
+
+    python scripts/benchmarks/benchmark_scoring.py --miners 6 64 256
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import ClassVar
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from conversationgenome.api.models.conversation_metadata import ConversationMetadata
+from conversationgenome.scoring_mechanism.GroundTruthTagSimilarityScoringMechanism import GroundTruthTagSimilarityScoringMechanism
+
+
+class BenchmarkAxon:
+    def __init__(self, idx):
+        self.uuid = f"uuid-{idx}"
+        self.hotkey = f"hk-{idx}"
+
+
+class BenchmarkResponse:
+    def __init__(self, idx, miner_result):
+        self.axon = BenchmarkAxon(idx)
+        self.cgp_output = [miner_result]
+
+
+class BenchmarkInput:
+    def __init__(self, metadata):
+        self.metadata = metadata
+
+
+class BenchmarkTaskBundle:
+    def __init__(self, metadata):
+        self.input = BenchmarkInput(metadata)
+
+
+class LoopScoringMechanism(GroundTruthTagSimilarityScoringMechanism):
+    vectorized: ClassVar[bool] = False
+
+
+class QuietLogging:
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark vectorized miner scoring against the per-tag loop.")
+    parser.add_argument("--miners", type=int, nargs="+", default=[6, 64, 256], help="Miner counts to score (default: %(default)s)")
+    parser.add_argument("--tags", type=int, default=20, help="Tags per miner response (default: %(default)s)")
+    parser.add_argument("--dimensions", type=int, default=1536, help="Embedding dimensions (default: %(default)s)")
+    parser.add_argument("--numpy-vectors", action="store_true", help="Pass tag vectors as numpy arrays instead of JSON lists")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement, best is reported (default: %(default)s)")
+    return parser.parse_args()
+
+
+def build_case(num_miners, num_tags, dimensions, numpy_vectors=False, seed=0):
+    rng = np.random.default_rng(seed)
+    vocabulary = [f"tag{i}" for i in range(num_tags * 4)]
+    vectors = {tag: {"vectors": rng.normal(size=dimensions)} for tag in vocabulary}
+    if not numpy_vectors:
+        vectors = {tag: {"vectors": val["vectors"].tolist()} for tag, val in vectors.items()}
+    ground_truth = vocabulary[:num_tags]
+    metadata = ConversationMetadata(tags=ground_truth, vectors={tag: vectors[tag] for tag in ground_truth})
+
+    responses = []
+    for idx in range(num_miners):
+        tags = list(rng.choice(vocabulary, size=num_tags, replace=False))
+        responses.append(BenchmarkResponse(idx, {"tags": tags, "vectors": {tag: vectors[tag] for tag in tags}}))
+    return BenchmarkTaskBundle(metadata), responses
+
+
+async def measure(scoring_mechanism, task_bundle, responses, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await scoring_mechanism.evaluate(task_bundle, miner_responses=responses)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+async def main():
+    args = parse_arguments()
+
+    import conversationgenome.scoring_mechanism.GroundTruthTagSimilarityScoringMechanism as module
+
+    module.bt.logging = QuietLogging()
+
+    print(f"{'miners':>8} {'loop ms':>10} {'vectorized ms':>14} {'speedup':>8} {'max diff':>10}")
+    for num_miners in args.miners:
+        task_bundle, responses = build_case(num_miners, args.tags, args.dimensions, numpy_vectors=args.numpy_vectors)
+
+        loop_mechanism = LoopScoringMechanism()
+        loop_time, (_, loop_scores) = await measure(loop_mechanism, task_bundle, responses, args.repeat)
+
+        vectorized_mechanism = GroundTruthTagSimilarityScoringMechanism()
+        vectorized_time, (_, vectorized_scores) = await measure(vectorized_mechanism, task_bundle, responses, args.repeat)
+
+        max_diff = float(np.max(np.abs(loop_scores - vectorized_scores))) if num_miners else 0.0
+        print(f"{num_miners:>8} {loop_time * 1000:>10.2f} {vectorized_time * 1000:>14.2f} {loop_time / vectorized_time:>7.1f}x {max_diff:>10.2e}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
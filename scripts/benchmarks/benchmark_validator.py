@@ -0,0 +1,447 @@
+"""
+Measures the throughput of Validator.forward and the latency of each of its stages, end to end, without the network.
+
+The validator reserves conversation bundles from a local stub API (which also takes the uploads), sets them up and
+formats miner responses with the local_stub LLM backend, and sends the tasks through a dendrite that answers like
+miners after a configurable delay. Every combination of --miners-per-task, --bundles and --concurrency is run
+for --steps steps and reported as JSON: tasks/second and p50/p95 per stage (reserve, setup, dispatch, format,
+score, upload, update_scores, forward and the LLM calls), as the validator's StageMetrics time them. Pass a previous report to --baseline to compare two commits.
+
+    python scripts/benchmarks/benchmark_validator.py --miners-per-task 6 32 --bundles 2 --concurrency 1 4 --output bench.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from types import SimpleNamespace
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, ROOT)
+
+STAGES = ["reserve", "setup", "llm_prompt", "llm_embeddings", "dispatch", "format", "score", "upload", "update_scores", "forward"]
+
+WORDS = [
+    "guitar", "barn", "farm", "nashville", "wedding", "movie", "titanic", "babysitting", "mercedes", "ferrari",
+    "hiking", "mountain", "coffee", "espresso", "garden", "tomatoes", "soccer", "stadium", "novel", "library",
+    "painting", "canvas", "museum", "ocean", "surfing", "sailing", "pizza", "bakery", "sourdough", "marathon",
+    "training", "yoga", "meditation", "camping", "tent", "fishing", "river", "kayak", "photography", "camera",
+    "jazz", "piano", "concert", "festival", "vacation", "airport", "passport", "sculpture", "cooking", "recipe",
+    "chocolate", "dessert", "puppy", "kitten", "veterinarian", "college", "chemistry", "biology", "teacher",
+    "homework", "startup", "investor", "software", "robot", "satellite", "telescope", "astronomy", "weather",
+    "snowboard", "skiing", "chess", "tournament", "podcast", "comedy", "theater", "ballet", "tattoo", "fashion",
+]
+FILLER = ["i", "really", "love", "my", "the", "we", "went", "to", "a", "last", "weekend", "with", "friends", "and"]
+
+
+class QuietLogging:
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark Validator.forward end to end against local stubs.")
+    parser.add_argument("--miners-per-task", type=int, nargs="+", default=[6], help="Miners sent each task (default: %(default)s)")
+    parser.add_argument("--bundles", type=int, nargs="+", default=[2], help="Task bundles reserved per forward (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1], help="Concurrent forwards per step (default: %(default)s)")
+    parser.add_argument("--tasks-per-bundle", type=int, default=5, help="Tasks taken from each bundle (default: %(default)s)")
+    parser.add_argument("--steps", type=int, default=3, help="Steps run per configuration (default: %(default)s)")
+    parser.add_argument("--neurons", type=int, default=256, help="Size of the fake metagraph (default: %(default)s)")
+    parser.add_argument("--lines", type=int, default=40, help="Lines per conversation (default: %(default)s)")
+    parser.add_argument("--miner-latency", default="uniform:0.05:0.3", help="Miner response time, a local stub latency spec (default: %(default)s)")
+    parser.add_argument("--miner-timeout-rate", type=float, default=0.0, help="Share of miner responses that time out with 408 (default: %(default)s)")
+    parser.add_argument("--llm-latency", default="0.01", help="Latency of each local stub LLM call (default: %(default)s)")
+    parser.add_argument("--api-latency", default="0.005", help="Latency of each stub API request (default: %(default)s)")
+    parser.add_argument("--dimensions", type=int, default=1536, help="Embedding dimensions (default: %(default)s)")
+    parser.add_argument("--llm-caches", action="store_true", help="Keep the embedding and tag validation caches on (in a temporary directory)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated conversations and latencies (default: %(default)s)")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--baseline", help="JSON report of an earlier run to compare p95 latencies with")
+    parser.add_argument("--verbose", action="store_true", help="Keep the bittensor logging")
+    return parser.parse_args()
+
+
+def configure_environment(args, api_server) -> None:
+    """
+    Points the API, the LLM backend and the caches at local stand-ins. Must run before the conversationgenome
+    modules are imported, ConfigLib loads .env without overriding what is already set.
+    """
+    os.environ["CGP_API_READ_HOST"] = api_server.host
+    os.environ["CGP_API_READ_PORT"] = str(api_server.port)
+    os.environ["CGP_API_WRITE_HOST"] = api_server.host
+    os.environ["CGP_API_WRITE_PORT"] = str(api_server.port)
+    os.environ["LLM_TYPE_OVERRIDE"] = "local_stub"
+    os.environ["LOCAL_STUB_LATENCY"] = args.llm_latency
+    os.environ["LOCAL_STUB_EMBEDDING_DIMENSIONS"] = str(args.dimensions)
+    os.environ["LOCAL_STUB_SEED"] = str(args.seed)
+    os.environ["UPLOAD_QUEUE_ENABLED"] = "0"
+    os.environ["WAND_ENABLED"] = "0"
+    os.environ["STAGE_METRICS_ENABLED"] = "1"
+    # Percentiles over every call of a configuration, not only the last ones
+    os.environ["STAGE_METRICS_WINDOW"] = "1000000"
+    os.environ.pop("METRICS_PORT", None)
+    if args.llm_caches:
+        os.environ["EMBEDDING_CACHE_PATH"] = os.path.join(tempfile.mkdtemp(prefix="cgp-bench-"), "embedding_cache.sqlite3")
+    else:
+        os.environ["EMBEDDING_CACHE_ENABLED"] = "0"
+        os.environ["TAG_VALIDATION_CACHE_ENABLED"] = "0"
+
+
+class BenchmarkApiServer:
+    """
+    Conversation API stand-in: reserve answers with a generated conversation tagging bundle, every other request
+    (the task uploads) with 200.
+    """
+
+    def __init__(self, lines=40, latency="0", seed=0):
+        self.lines = lines
+        self.latency = latency
+        self.requests = defaultdict(int)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._latency_sampler = None
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+
+    @property
+    def host(self) -> str:
+        return "http://127.0.0.1"
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> "BenchmarkApiServer":
+        from conversationgenome.llm.llm_local_stub import parse_latency
+
+        self._latency_sampler = parse_latency(self.latency)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def next_response(self, method, path) -> tuple:
+        with self._lock:
+            delay = self._latency_sampler(self._random) if self._latency_sampler else 0.0
+            self.requests["reserve" if "/reserve" in path else method.lower()] += 1
+            body = self.build_task_bundle() if "/reserve" in path else {}
+        return delay, body
+
+    def build_task_bundle(self) -> dict:
+        topics = self._random.sample(WORDS, 6)
+        lines = []
+        for idx in range(self.lines):
+            words = self._random.sample(FILLER, 5) + self._random.sample(topics, 2) + self._random.sample(WORDS, 1)
+            self._random.shuffle(words)
+            lines.append([idx % 2, " ".join(words)])
+
+        return {
+            "mode": "local",
+            "api_version": 1.4,
+            "type": "conversation_tagging",
+            "scoring_mechanism": "ground_truth_tag_similarity_scoring",
+            "input": {
+                "input_type": "conversation",
+                "guid": str(uuid.UUID(int=self._random.getrandbits(128))),
+                "data": {"participants": ["SPEAKER_1", "SPEAKER_2"], "lines": lines, "total": len(lines)},
+            },
+            "prompt_chain": [
+                {
+                    "step": 0,
+                    "id": "benchmark",
+                    "crc": 0,
+                    "title": "Infer tags from a conversation window",
+                    "name": "infer_tags_from_a_conversation_window",
+                    "description": "Returns tags representing the conversation as a whole from the window received.",
+                    "type": "inference",
+                    "input_path": "conversation",
+                    "prompt_template": "Analyze conversation in terms of topic interests of the participants. Return comma-delimited tags.:\n\n{{ input }}",
+                    "output_variable": "final_output",
+                    "output_type": "List[str]",
+                }
+            ],
+            "example_output": {"tags": ["guitar", "barn", "farm", "nashville"], "type": "List[str]"},
+            "errors": [],
+            "warnings": [],
+            "guid": str(uuid.UUID(int=self._random.getrandbits(128))),
+            "data_type": 1,
+        }
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length", 0))
+                if length:
+                    self.rfile.read(length)
+                delay, body = server.next_response(self.command, self.path)
+                if delay > 0:
+                    time.sleep(delay)
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_POST = _handle
+            do_PUT = _handle
+            do_GET = _handle
+
+        return Handler
+
+
+class BenchmarkDendrite:
+    """
+    Answers like MockDendrite, without a wallet: every axon responds after a delay drawn from `latency`, or times
+    out with 408 at `timeout_rate`. Responses carry the tags of the window, as the local stub model picks them,
+    each miner keeping its own random subset so that responses differ.
+    """
+
+    def __init__(self, latency="0", timeout_rate=0.0, seed=0):
+        from conversationgenome.llm.llm_local_stub import LocalStubModel
+        from conversationgenome.llm.llm_local_stub import parse_latency
+
+        self.stub = LocalStubModel(seed=seed)
+        self.timeout_rate = timeout_rate
+        self.seed = seed
+        self._latency_sampler = parse_latency(latency)
+        self._random = random.Random(seed)
+
+    async def forward(self, axons, synapse, timeout: float = 12, deserialize: bool = True, **kwargs):
+        import bittensor as bt
+
+        task = synapse.cgp_input[0]["task"]
+        window = " ".join(str(line[1]) for line in task.input.data.window or [])
+        tags = self.stub.get_tags(window)
+
+        async def single_axon_response(axon):
+            delay = min(self._latency_sampler(self._random), timeout)
+            timed_out = self._random.random() < self.timeout_rate
+            await asyncio.sleep(timeout if timed_out else delay)
+
+            s = synapse.model_copy()
+            s.axon = bt.TerminalInfo(hotkey=axon.hotkey, ip=axon.ip, port=axon.port)
+            if timed_out:
+                s.cgp_output = None
+                s.dendrite = bt.TerminalInfo(status_code=408, status_message="Timeout", process_time=timeout)
+            else:
+                miner_random = random.Random(f"{self.seed}|{axon.hotkey}|{window}")
+                miner_tags = [tag for tag in tags if miner_random.random() < 0.7] or tags[:1]
+                s.cgp_output = [{"tags": miner_tags}]
+                s.dendrite = bt.TerminalInfo(status_code=200, status_message="OK", process_time=delay)
+            return s.deserialize() if deserialize else s
+
+        return await asyncio.gather(*(single_axon_response(axon) for axon in axons))
+
+
+def build_validator(validator_class, args, dendrite):
+    """
+    Validator with a fake metagraph of `args.neurons` serving miners, built without BaseValidatorNeuron.__init__.
+    """
+    n = args.neurons
+    v = validator_class.__new__(validator_class)
+    v.config = SimpleNamespace(
+        netuid=33,
+        neuron=SimpleNamespace(sample_size=6, vpermit_tao_limit=4096, moving_average_alpha=0.1, num_concurrent_forwards=1),
+    )
+    v.metagraph = SimpleNamespace(
+        n=np.int64(n),
+        axons=[SimpleNamespace(hotkey=f"hk{uid}", ip="127.0.0.1", port=8091 + uid, is_serving=True) for uid in range(n)],
+        hotkeys=[f"hk{uid}" for uid in range(n)],
+        validator_permit=np.zeros(n, dtype=bool),
+        S=np.zeros(n, dtype=np.float32),
+    )
+    v.axon = SimpleNamespace(wallet=SimpleNamespace(hotkey=SimpleNamespace(ss58_address="benchmark-validator")))
+    v.dendrite = dendrite
+    v.device = "cpu"
+    v.nonlinear_power = 3.0
+    v.scores = np.zeros(n, dtype=np.float32)
+    v.ema_scores = np.zeros(n, dtype=np.float32)
+    v.hotkeys = list(v.metagraph.hotkeys)
+    v.responses = []
+    v.initial_status_codes = {}
+    v.final_status_codes = {}
+    v.task_bundle_queue = None
+    return v
+
+
+def summarize_stages(metrics) -> dict:
+    """
+    Returns {stage: {count, p50_ms, p95_ms, mean_ms, total_s}} from the stage metrics.
+    """
+    stats = metrics.stats()
+    out = {}
+    for stage in STAGES + sorted(set(stats) - set(STAGES)):
+        if stage not in stats:
+            continue
+        out[stage] = {
+            "count": stats[stage]["count"],
+            "p50_ms": round(stats[stage]["p50"] * 1000, 3),
+            "p95_ms": round(stats[stage]["p95"] * 1000, 3),
+            "mean_ms": round(stats[stage]["mean"] * 1000, 3),
+            "total_s": stats[stage]["total"],
+        }
+    return out
+
+
+async def run_configuration(validator, metrics, args, miners_per_task, bundles, concurrency) -> dict:
+    from conversationgenome.ConfigLib import c
+    from conversationgenome.llm.embedding_cache import get_embedding_cache
+    from conversationgenome.llm.tag_validation_cache import get_tag_validation_cache
+
+    c.set("validator", "miners_per_task", miners_per_task)
+    c.set("validator", "number_of_task_bundles", bundles)
+    c.set("validator", "number_of_task_per_bundle", args.tasks_per_bundle)
+    c.set("validator", "minimum_number_of_tasks", 1)
+    validator.config.neuron.sample_size = miners_per_task
+    validator.config.neuron.num_concurrent_forwards = concurrency
+    validator.pending_state_ops = None
+    for cache in (get_embedding_cache(), get_tag_validation_cache()):
+        if cache is not None:
+            cache.clear()
+
+    metrics.reset()
+    failed_steps = 0
+    started = time.perf_counter()
+    for _ in range(args.steps):
+        results = await validator.concurrent_forward()
+        failed_steps += sum(1 for result in results if not result)
+    elapsed = time.perf_counter() - started
+
+    stages = summarize_stages(metrics)
+    tasks = stages.get("score", {}).get("count", 0)
+    return {
+        "miners_per_task": miners_per_task,
+        "bundles": bundles,
+        "concurrency": concurrency,
+        "tasks_per_bundle": args.tasks_per_bundle,
+        "steps": args.steps,
+        "failed_forwards": failed_steps,
+        "tasks": tasks,
+        "miner_responses": tasks * min(miners_per_task, args.neurons),
+        "seconds": round(elapsed, 4),
+        "tasks_per_second": round(tasks / elapsed, 3) if elapsed else 0.0,
+        "stages": stages,
+    }
+
+
+def get_git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare_with_baseline(report, baseline_path) -> dict:
+    """
+    Matches the configurations of both reports and returns the throughput and p95 ratios (current / baseline).
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    def key(result):
+        return (result["miners_per_task"], result["bundles"], result["concurrency"])
+
+    baseline_results = {key(result): result for result in baseline.get("results", [])}
+    comparison = []
+    for result in report["results"]:
+        before = baseline_results.get(key(result))
+        if not before:
+            continue
+        entry = {"miners_per_task": result["miners_per_task"], "bundles": result["bundles"], "concurrency": result["concurrency"]}
+        if before["tasks_per_second"]:
+            entry["tasks_per_second_ratio"] = round(result["tasks_per_second"] / before["tasks_per_second"], 3)
+        entry["p95_ratio"] = {
+            stage: round(stats["p95_ms"] / before["stages"][stage]["p95_ms"], 3)
+            for stage, stats in result["stages"].items()
+            if before["stages"].get(stage, {}).get("p95_ms")
+        }
+        comparison.append(entry)
+    return {"baseline_commit": baseline.get("commit"), "results": comparison}
+
+
+async def main():
+    args = parse_arguments()
+
+    api_server = BenchmarkApiServer(lines=args.lines, latency=args.api_latency, seed=args.seed)
+    configure_environment(args, api_server)
+
+    import bittensor as bt
+
+    if not args.verbose:
+        bt.logging = QuietLogging()
+
+    import neurons.validator as validator_module
+    from conversationgenome.analytics.StageMetrics import get_stage_metrics
+
+    api_server.start()
+    dendrite = BenchmarkDendrite(latency=args.miner_latency, timeout_rate=args.miner_timeout_rate, seed=args.seed)
+    validator = build_validator(validator_module.Validator, args, dendrite)
+
+    metrics = get_stage_metrics()
+
+    report = {
+        "commit": get_git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "settings": {
+            "steps": args.steps,
+            "neurons": args.neurons,
+            "lines": args.lines,
+            "miner_latency": args.miner_latency,
+            "miner_timeout_rate": args.miner_timeout_rate,
+            "llm_latency": args.llm_latency,
+            "api_latency": args.api_latency,
+            "dimensions": args.dimensions,
+            "llm_caches": args.llm_caches,
+            "seed": args.seed,
+        },
+        "results": [],
+    }
+    try:
+        for miners_per_task, bundles, concurrency in itertools.product(args.miners_per_task, args.bundles, args.concurrency):
+            result = await run_configuration(validator, metrics, args, miners_per_task, bundles, concurrency)
+            report["results"].append(result)
+            print(
+                f"miners={miners_per_task} bundles={bundles} concurrency={concurrency}: "
+                f"{result['tasks']} tasks, {result['tasks_per_second']} tasks/s",
+                file=sys.stderr,
+            )
+    finally:
+        api_server.stop()
+
+    if args.baseline:
+        report["baseline"] = compare_with_baseline(report, args.baseline)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
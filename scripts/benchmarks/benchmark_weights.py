@@ -0,0 +1,127 @@
+"""
+Compares the array based ValidatorLib.get_raw_weights with the previous per-UID loop.
+
+    python scripts/benchmarks/benchmark_weights.py --uids 256 1024 4096
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import conversationgenome.validator.ValidatorLib as validator_lib_module
+from conversationgenome.validator.ValidatorLib import ValidatorLib
+
+
+class QuietLogging:
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def loop_raw_weights(vl, scores, burn_uid=None, burn_rate=0.0):
+    """
+    get_raw_weights as it was before vectorization: one transposed_cubic_distribution call per UID,
+    an np.isin shuffle per tied score and a per-element burn renormalization.
+    """
+    burn_rate = max(0.0, min(1.0, burn_rate))
+    if burn_uid is not None and not (0 <= int(burn_uid) < scores.shape[0]):
+        burn_uid = None
+
+    original_scores = np.copy(scores)
+    raw_weights = np.zeros_like(original_scores, dtype=float)
+    distributed_weights = max(0.0, 1.0 - burn_rate)
+
+    ordered_uids = np.argsort(original_scores)[::-1]
+    zero_uids = np.where(original_scores == 0)[0]
+    unique_weights, counts = np.unique(original_scores, return_counts=True)
+    for tie in unique_weights[counts > 1]:
+        if tie == 0:
+            continue
+        tied_indices = np.nonzero(original_scores == tie)[0]
+        positions_in_ordered_uids = np.nonzero(np.isin(ordered_uids, tied_indices))[0]
+        shuffled_positions = np.random.permutation(positions_in_ordered_uids)
+        ordered_uids[positions_in_ordered_uids] = ordered_uids[shuffled_positions]
+
+    ordered_uids_no_zeros = ordered_uids[~np.isin(ordered_uids, zero_uids)]
+    if burn_uid is not None:
+        ordered_uids_no_zeros = ordered_uids_no_zeros[ordered_uids_no_zeros != burn_uid]
+
+    num_uids = len(ordered_uids_no_zeros)
+    if num_uids > 0 and distributed_weights > 0:
+        temp_weights = np.zeros_like(original_scores, dtype=float)
+        for i, uid in enumerate(ordered_uids_no_zeros):
+            temp_weights[uid] = vl.transposed_cubic_distribution(i, num_uids)
+        sum_temp = float(np.sum(np.abs(temp_weights)))
+        if sum_temp > 0:
+            raw_weights += temp_weights * (distributed_weights / sum_temp)
+
+    if burn_uid is not None and burn_rate > 0:
+        raw_weights[int(burn_uid)] = burn_rate
+
+    total = float(np.sum(np.abs(raw_weights)))
+    if total > 0:
+        if burn_uid is not None and burn_rate > 0:
+            others_sum = total - abs(raw_weights[int(burn_uid)])
+            if others_sum > 0 and abs(raw_weights[int(burn_uid)]) != burn_rate:
+                factor = (1.0 - burn_rate) / others_sum
+                for i in range(len(raw_weights)):
+                    raw_weights[i] = burn_rate if i == int(burn_uid) else raw_weights[i] * factor
+        else:
+            raw_weights = raw_weights / total
+    return raw_weights
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark get_raw_weights against the per-UID loop.")
+    parser.add_argument("--uids", type=int, nargs="+", default=[256, 1024, 4096], help="Subnet sizes (default: %(default)s)")
+    parser.add_argument("--zero-fraction", type=float, default=0.2, help="Share of UIDs with a zero score (default: %(default)s)")
+    parser.add_argument("--tie-fraction", type=float, default=0.3, help="Share of UIDs sharing a handful of tied scores (default: %(default)s)")
+    parser.add_argument("--burn-rate", type=float, default=0.9, help="Burn rate sent to UID 0, 0 disables burn (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per measurement, best is reported (default: %(default)s)")
+    return parser.parse_args()
+
+
+def build_scores(num_uids, zero_fraction, tie_fraction, seed=0):
+    rng = np.random.default_rng(seed)
+    scores = rng.random(num_uids)
+    tied = rng.choice(num_uids, size=int(num_uids * tie_fraction), replace=False)
+    scores[tied] = rng.choice([0.25, 0.5, 0.75], size=len(tied))
+    scores[rng.choice(num_uids, size=int(num_uids * zero_fraction), replace=False)] = 0.0
+    return scores
+
+
+def measure(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    args = parse_arguments()
+    validator_lib_module.bt.logging = QuietLogging()
+    vl = ValidatorLib()
+    burn_uid = 0 if args.burn_rate > 0 else None
+
+    print(f"{'uids':>8} {'loop ms':>10} {'vectorized ms':>14} {'speedup':>8} {'max diff':>10}")
+    for num_uids in args.uids:
+        scores = build_scores(num_uids, args.zero_fraction, args.tie_fraction)
+
+        loop_time = measure(lambda: loop_raw_weights(vl, scores, burn_uid, args.burn_rate), args.repeat)
+        vectorized_time = measure(lambda: vl.get_raw_weights(scores, burn_uid=burn_uid, burn_rate=args.burn_rate), args.repeat)
+
+        # Ties are ordered randomly, so compare the sorted weights
+        loop_weights = np.sort(loop_raw_weights(vl, scores, burn_uid, args.burn_rate))
+        vectorized_weights = np.sort(vl.get_raw_weights(scores, burn_uid=burn_uid, burn_rate=args.burn_rate))
+        max_diff = float(np.max(np.abs(loop_weights - vectorized_weights)))
+        print(f"{num_uids:>8} {loop_time * 1000:>10.3f} {vectorized_time * 1000:>14.3f} {loop_time / vectorized_time:>7.1f}x {max_diff:>10.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Converts a legacy validator state.npz or state.pt file to the state checkpoint format.
+
+    python scripts/convert_validator_state.py ~/.bittensor/miners/<wallet>/<hotkey>/netuid33/validator/state.npz
+
+The snapshot is written next to the input file unless --output-dir is given. The input file is left in place.
+Validators also convert automatically on start if no checkpoint exists yet.
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from conversationgenome.validator.StateCheckpoint import StateCheckpoint
+from conversationgenome.validator.StateCheckpoint import convert_legacy_state
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Convert a validator state.npz/state.pt file to a state checkpoint.")
+    parser.add_argument("path", help="Path to state.npz or state.pt")
+    parser.add_argument("--output-dir", default=None, help="Directory for state.ckpt (default: the input file's directory)")
+    parser.add_argument("--force", action="store_true", help="Overwrite an existing checkpoint")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    path = os.path.expanduser(args.path)
+    if not os.path.isfile(path):
+        print(f"ERROR -- state file not found: {path}")
+        sys.exit(1)
+
+    output_dir = os.path.expanduser(args.output_dir) if args.output_dir else os.path.dirname(os.path.abspath(path))
+    if StateCheckpoint(output_dir).exists() and not args.force:
+        print(f"ERROR -- a checkpoint already exists in {output_dir}. Use --force to overwrite it.")
+        sys.exit(1)
+
+    checkpoint = convert_legacy_state(path, output_dir)
+    state, _ = checkpoint.load()
+    print(f"Wrote {checkpoint.snapshot_path}: step {state['step']}, {len(state['hotkeys'])} hotkeys, {len(state['scores'])} scores, score sum {float(np.sum(state['scores'])):.6f}")
+
+
+if __name__ == "__main__":
+    main()
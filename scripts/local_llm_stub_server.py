@@ -0,0 +1,61 @@
+"""
+Runs the deterministic local LLM stub as an HTTP server that speaks the OpenAI wire format, for load tests
+without API keys.
+
+    python scripts/local_llm_stub_server.py --port 8089 --latency lognormal:0.4:0.5 --error-rate 0.01
+
+Then point the OpenAI backend at it:
+
+    export OPENAI_API_KEY=local-stub
+    export OPENAI_BASE_URL=http://127.0.0.1:8089/v1
+
+To run the stub in-process instead, set LLM_TYPE_OVERRIDE=local_stub. The options below default to the
+LOCAL_STUB_* environment variables used by the in-process backend.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from conversationgenome.llm.llm_local_stub import LocalStubModel
+from conversationgenome.llm.llm_local_stub import LocalStubServer
+
+
+def parse_arguments() -> argparse.Namespace:
+    defaults = LocalStubModel.from_config()
+    parser = argparse.ArgumentParser(description="Serve the local LLM stub over the OpenAI API format.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=8089, help="Port to listen on (default: %(default)s)")
+    parser.add_argument("--model", default=defaults.model, help="Model name reported in responses (default: %(default)s)")
+    parser.add_argument("--dimensions", type=int, default=defaults.dimensions, help="Embedding size when the request sets none (default: %(default)s)")
+    parser.add_argument("--latency", default=defaults.latency, help="Seconds per call: 0.2, uniform:0.1:0.5, normal:0.3:0.1 or lognormal:0.3:0.5 (default: %(default)s)")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="Share of calls answered with a 500 (default: %(default)s)")
+    parser.add_argument("--max-tags", type=int, default=defaults.max_tags, help="Tags per completion (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Seed for embeddings, latency and errors (default: %(default)s)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    stub = LocalStubModel(
+        model=args.model,
+        dimensions=args.dimensions,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        max_tags=args.max_tags,
+        seed=args.seed,
+    )
+    server = LocalStubServer(stub, host=args.host, port=args.port)
+    print(f"Local LLM stub listening on {server.base_url} (latency {args.latency}, error rate {args.error_rate})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(f"Served: {stub.stats()}")
+
+
+if __name__ == "__main__":
+    main()
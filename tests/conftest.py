@@ -9,6 +9,7 @@ from dotenv import load_dotenv
 from conversationgenome.llm.llm_openai import LlmOpenAI
 import neurons.validator as validator_module
 from tests.mocks.DummyData import DummyData
+from tests.mocks.MockCgpApiServer import MockCgpApiServer
 
 load_dotenv(find_dotenv(usecwd=True), override=False)
 
@@ -68,7 +69,62 @@ def patch_uids(monkeypatch):
     import conversationgenome.utils.uids as uids
 
     assert validator_module.conversationgenome.utils.uids is uids
-    monkeypatch.setattr(uids, "get_random_uids", lambda self, k: [0, 1, 2][:k])
+    monkeypatch.setattr(uids, "get_random_uids", lambda self, k, exclude=None: [0, 1, 2][:k])
+
+
+@pytest.fixture(autouse=True)
+def disable_embedding_cache(monkeypatch):
+    """Keep the on-disk embedding cache out of tests so vectors never leak between them."""
+    import conversationgenome.llm.embedding_cache as embedding_cache
+
+    monkeypatch.setenv("EMBEDDING_CACHE_ENABLED", "0")
+    monkeypatch.setattr(embedding_cache, "_EMBEDDING_CACHE", None)
+
+
+@pytest.fixture(autouse=True)
+def disable_tag_validation_cache(monkeypatch):
+    """Tag verdicts are cached process-wide; keep them from leaking between tests."""
+    import conversationgenome.llm.tag_validation_cache as tag_validation_cache
+
+    monkeypatch.setenv("TAG_VALIDATION_CACHE_ENABLED", "0")
+    monkeypatch.setattr(tag_validation_cache, "_TAG_VALIDATION_CACHE", None)
+
+
+@pytest.fixture(autouse=True)
+def disable_mining_result_cache(monkeypatch):
+    """Mined results are cached process-wide by task content; keep them from leaking between tests."""
+    import conversationgenome.miner.MiningResultCache as mining_result_cache
+
+    monkeypatch.setenv("MINER_RESULT_CACHE_ENABLED", "0")
+    monkeypatch.setattr(mining_result_cache, "_MINING_RESULT_CACHE", None)
+
+
+@pytest.fixture(autouse=True)
+def reset_llm_backends():
+    """Backends are cached process-wide; build them fresh for every test so patched clients don't leak."""
+    from conversationgenome.llm.llm_factory import reload_llm_backends
+
+    reload_llm_backends()
+    yield
+    reload_llm_backends()
+
+
+@pytest.fixture
+def cgp_api_server(monkeypatch):
+    """
+    Local stand-in for the conversation API. Read and write hosts point at it for the duration of the test.
+    """
+    import conversationgenome.api.ApiLib as api_lib
+
+    server = MockCgpApiServer().start()
+    for prefix in ("CGP_API_READ", "CGP_API_WRITE"):
+        monkeypatch.setenv(f"{prefix}_HOST", server.host)
+        monkeypatch.setenv(f"{prefix}_PORT", str(server.port))
+    # Shared clients hold connections to the previous server
+    monkeypatch.setattr(api_lib, "_CLIENT", None)
+    monkeypatch.setattr(api_lib, "_ASYNC_CLIENTS", api_lib.weakref.WeakKeyDictionary())
+    yield server
+    server.stop()
 
 
 @pytest.fixture
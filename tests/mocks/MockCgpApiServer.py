@@ -0,0 +1,86 @@
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+
+class MockCgpApiServer:
+    """
+    Local stand-in for the conversation read/write API. Serves the reserve and record endpoints on 127.0.0.1,
+    records every request and answers with the queued responses (200 and an empty body by default).
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.responses = {}
+        self.connections = set()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def host(self) -> str:
+        return "http://127.0.0.1"
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> "MockCgpApiServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def respond(self, method: str, path_prefix: str, status_code: int = 200, body=None) -> None:
+        """
+        Queues a response for the next request whose method and path match. Unqueued requests get 200.
+        """
+        with self._lock:
+            self.responses.setdefault((method, path_prefix), []).append((status_code, body))
+
+    def _next_response(self, method, path):
+        with self._lock:
+            for (queued_method, path_prefix), queued in self.responses.items():
+                if queued_method == method and path.startswith(path_prefix) and queued:
+                    return queued.pop(0)
+        return (200, {})
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length", 0))
+                raw_body = self.rfile.read(length) if length else b""
+                if self.headers.get("Content-Encoding") == "gzip":
+                    raw_body = gzip.decompress(raw_body)
+                body = json.loads(raw_body) if raw_body else None
+
+                with server._lock:
+                    server.connections.add(self.client_address)
+                    server.requests.append({"method": self.command, "path": self.path, "headers": dict(self.headers), "body": body})
+
+                status_code, response_body = server._next_response(self.command, self.path)
+                payload = json.dumps(response_body).encode("utf-8")
+                self.send_response(status_code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_POST = _handle
+            do_PUT = _handle
+            do_GET = _handle
+
+        return Handler
@@ -108,7 +108,7 @@ async def test_forward_roundtrip_with_real_miner_and_minerlib(monkeypatch, valid
     ]
     uids_to_return = [np.array([m["uid"]]) for m in miners]
     uids_cycle = cycle(uids_to_return)
-    uids_mod.get_random_uids = lambda self, k: next(uids_cycle)
+    uids_mod.get_random_uids = lambda self, k, exclude=None: next(uids_cycle)
 
     async def forward_side_effect(*, axons=None, synapse=None, **_):
         syn_after = await miner.forward(synapse)
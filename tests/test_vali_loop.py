@@ -125,7 +125,7 @@ async def test_forward_with_successful_response(validator_with_mock_metagraph):
     forward_mock = AsyncMock(side_effect=lambda *args, **kwargs: next(response_cycle))
     validator.dendrite.forward = forward_mock 
 
-    uids.get_random_uids = lambda self, k: next(uids_cycle)
+    uids.get_random_uids = lambda self, k, exclude=None: next(uids_cycle)
 
     result = await validator.forward(test_mode=True)
 
@@ -14,19 +14,8 @@ override_env_variables = {"SYSTEM_MODE": "prod", "CGP_API_READ_HOST": "https://f
 
 
 @pytest.mark.asyncio
-@patch("conversationgenome.api.ApiLib.requests.post")
-@patch("conversationgenome.api.ApiLib.c.get")
-async def test_when_reserving_conversation_then_conversation_is_returned(mock_config_get, mock_requests_post):
-    def config_side_effect(section, key, default=None):
-        overrides = override_env_variables
-        return overrides.get(key, default)
-
-    mock_config_get.side_effect = config_side_effect
-
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = DummyData.conversation_tagging_task_bundle()
-    mock_requests_post.return_value = mock_response
+async def test_when_reserving_conversation_then_conversation_is_returned(cgp_api_server):
+    cgp_api_server.respond("POST", "/api/v1/conversation/reserve", body=DummyData.conversation_tagging_task_bundle_json())
 
     api = ApiLib()
     task_bundle = await api.reserve_task_bundle(hotkey=hotkey, api_key=api_key)
@@ -36,23 +25,67 @@ async def test_when_reserving_conversation_then_conversation_is_returned(mock_co
 
 
 @pytest.mark.asyncio
-@patch("conversationgenome.api.ApiLib.requests.post")
-@patch("conversationgenome.api.ApiLib.c.get")
-async def test_when_reserving_conversation_then_endpoint_is_called_properly(mock_config_get, mock_requests_post):
-    def config_side_effect(section, key, default=None):
-        overrides = override_env_variables
-        return overrides.get(key, default)
+async def test_when_reserving_conversation_then_endpoint_is_called_properly(cgp_api_server):
+    cgp_api_server.respond("POST", "/api/v1/conversation/reserve", body=DummyData.conversation_tagging_task_bundle_json())
+
+    api = ApiLib()
+    await api.reserve_task_bundle(hotkey=hotkey, api_key=api_key)
+
+    request = cgp_api_server.requests[0]
+    assert request["path"].startswith("/api/v1/conversation/reserve?cgp_version=")
+    assert request["headers"]["Authorization"] == f"Bearer {api_key}"
 
-    mock_config_get.side_effect = config_side_effect
 
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = DummyData.conversation_tagging_task_json()
-    mock_requests_post.return_value = mock_response
+@pytest.mark.asyncio
+async def test_when_reserve_fails_then_none_is_returned(cgp_api_server):
+    cgp_api_server.respond("POST", "/api/v1/conversation/reserve", status_code=503)
+
+    assert await ApiLib().reserve_task_bundle(hotkey=hotkey, api_key=api_key) is None
+
+
+@pytest.mark.asyncio
+async def test_requests_reuse_pooled_connections(cgp_api_server):
+    api = ApiLib()
+
+    assert await api.put_task_data("bundle-1", {"task_id": 1}) is True
+    assert await ApiLib().put_task_data("bundle-2", {"task_id": 2}) is True
+
+    assert [request["path"] for request in cgp_api_server.requests] == ["/api/v1/conversation/record/bundle-1", "/api/v1/conversation/record/bundle-2"]
+    assert cgp_api_server.requests[1]["body"] == {"task_id": 2}
+    assert len(cgp_api_server.connections) == 1
+
+
+@pytest.mark.asyncio
+async def test_put_task_data_returns_false_on_error_status(cgp_api_server):
+    cgp_api_server.respond("PUT", "/api/v1/conversation/record/", status_code=500)
+
+    assert await ApiLib().put_task_data("bundle-1", {"task_id": 1}) is False
+
+
+def test_send_task_data_gzips_the_body_when_compressing(cgp_api_server):
+    cgp_api_server.respond("PUT", "/api/v1/conversation/record/", status_code=201)
+
+    status_code = ApiLib().send_task_data("bundle-1", {"task_id": 1}, compress=True)
+
+    assert status_code == 201
+    request = cgp_api_server.requests[0]
+    assert request["path"] == "/api/v1/conversation/record/bundle-1"
+    assert request["headers"]["Content-Encoding"] == "gzip"
+    assert request["body"] == {"task_id": 1}
+
+
+@patch("conversationgenome.api.ApiLib.c.get")
+def test_pool_size_follows_concurrent_forwards_and_endpoint_timeouts(mock_config_get):
+    values = {
+        ("validator", "num_concurrent_forwards"): 3,
+        ("validator", "response_concurrency"): 6,
+        ("env", "HTTP_TIMEOUT"): 60,
+        ("env", "CGP_API_RESERVE_TIMEOUT"): 15,
+    }
+    mock_config_get.side_effect = lambda section, key, default=None: values.get((section, key), default)
 
     api = ApiLib()
-    task_bundle = await api.reserve_task_bundle(hotkey=hotkey, api_key=api_key)
 
-    args, kwargs = mock_requests_post.call_args
-    assert "https://fake.api:443/api/v1/conversation/reserve" in args[0]
-    assert kwargs["headers"]["Authorization"] == f"Bearer {api_key}"
+    assert api.get_limits().max_connections == 24
+    assert api.get_timeout("CGP_API_RESERVE_TIMEOUT").read == 15
+    assert api.get_timeout("CGP_API_WRITE_TIMEOUT").read == 60
@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+from conversationgenome.llm.embedding_cache import EmbeddingCache
+from conversationgenome.llm.embedding_cache import get_embedding_cache
+
+NAMESPACE = ("LlmOpenAI", "text-embedding-3-small", 1536)
+
+
+def test_get_many_counts_hits_and_misses():
+    cache = EmbeddingCache()
+    cache.put_many(NAMESPACE, {"music": [0.5, 0.25]})
+
+    found = cache.get_many(NAMESPACE, ["music", "travel"])
+
+    assert found == {"music": [0.5, 0.25]}
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_keys_are_normalized_and_namespaced():
+    cache = EmbeddingCache()
+    cache.put_many(NAMESPACE, {"Live  Music": [1.0]})
+
+    assert cache.get_many(NAMESPACE, ["live music"]) == {"live music": [1.0]}
+    assert cache.get_many(("LlmOpenAI", "text-embedding-3-large", 3072), ["live music"]) == {}
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = EmbeddingCache(memory_size=2)
+    cache.put_many(NAMESPACE, {"a": [1.0], "b": [2.0]})
+    cache.get_many(NAMESPACE, ["a"])
+    cache.put_many(NAMESPACE, {"c": [3.0]})
+
+    assert set(cache.get_many(NAMESPACE, ["a", "b", "c"]).keys()) == {"a", "c"}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_disk_tier_persists_across_instances(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite3")
+    cache = EmbeddingCache(path=path)
+    cache.put_many(NAMESPACE, {"music": [0.5, 0.25]})
+    cache.close()
+
+    reopened = EmbeddingCache(path=path)
+    assert reopened.get_many(NAMESPACE, ["music"]) == {"music": [0.5, 0.25]}
+    assert reopened.stats()["disk_hits"] == 1
+    reopened.close()
+
+
+def test_disk_tier_is_size_capped(tmp_path):
+    cache = EmbeddingCache(path=str(tmp_path / "embeddings.sqlite3"), memory_size=1, disk_size=10)
+    for i in range(25):
+        cache.put_many(NAMESPACE, {f"tag{i}": [float(i)]})
+
+    count = cache._get_db().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+    assert count <= 10
+    assert cache.get_many(NAMESPACE, ["tag24"]) == {"tag24": [24.0]}
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_async_disk_access_runs_off_the_event_loop(tmp_path, monkeypatch):
+    path = str(tmp_path / "embeddings.sqlite3")
+    cache = EmbeddingCache(path=path, memory_size=1)
+    disk_threads = []
+    disk_get, disk_put = cache._disk_get, cache._disk_put
+    monkeypatch.setattr(cache, "_disk_get", lambda keys: disk_threads.append(threading.get_ident()) or disk_get(keys))
+    monkeypatch.setattr(cache, "_disk_put", lambda entries: disk_threads.append(threading.get_ident()) or disk_put(entries))
+
+    await cache.aput_many(NAMESPACE, {"music": [0.5], "travel": [0.25]})
+    # Only "travel" is still in memory, "music" comes from disk
+    assert await cache.aget_many(NAMESPACE, ["music", "travel"]) == {"music": [0.5], "travel": [0.25]}
+
+    assert len(disk_threads) == 2
+    assert threading.get_ident() not in disk_threads
+    assert cache.stats()["hits"] == 1 and cache.stats()["disk_hits"] == 1
+    cache.close()
+
+
+def test_get_embedding_cache_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("EMBEDDING_CACHE_ENABLED", "0")
+    assert get_embedding_cache() is None
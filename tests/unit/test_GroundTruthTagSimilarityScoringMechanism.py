@@ -336,3 +336,136 @@ async def test_calculate_penalty_unique_tags_less_than_3():
     score = await mechanism._calculate_penalty(base_score, num_tags=5, num_unique_tags=2, min_score=0.5, max_score=0.5)
     expected = base_score * PENALTIES["num_unique_tags"]["less_than_3"]["penalty"]
     assert score == expected or pytest.approx(score) == expected
+
+
+def _random_scoring_case(num_miners, seed=0, dimensions=32):
+    rng = np.random.default_rng(seed)
+    vocabulary = [f"tag{i}" for i in range(60)]
+    vectors = {tag: {'vectors': rng.normal(size=dimensions).tolist()} for tag in vocabulary}
+    ground_truth = vocabulary[:15]
+    metadata = DummyMetadata(ground_truth, {tag: vectors[tag] for tag in ground_truth})
+
+    responses = []
+    for idx in range(num_miners):
+        tags = list(rng.choice(vocabulary, size=int(rng.integers(1, 30)), replace=True))
+        tag_vectors = {tag: vectors[tag] for tag in tags}
+        if idx % 5 == 1 and tags:
+            # Missing vectors score 0
+            tag_vectors.pop(tags[0])
+        if idx % 7 == 3:
+            responses.append(DummyResponse(None, DummyAxon(f'uuid-{idx}', f'hk-{idx}')))
+            continue
+        responses.append(DummyResponse([{'tags': tags, 'vectors': tag_vectors}], DummyAxon(f'uuid-{idx}', f'hk-{idx}')))
+
+    return DummyTaskBundle(metadata), responses
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("num_miners", [6, 64])
+async def test_vectorized_evaluate_matches_per_tag_loop(monkeypatch, num_miners):
+    monkeypatch.setattr("conversationgenome.scoring_mechanism.GroundTruthTagSimilarityScoringMechanism.bt.logging", DummyLogging)
+    monkeypatch.setattr(GroundTruthTagSimilarityScoringMechanism, "max_scored_tags", 20)
+    task_bundle, responses = _random_scoring_case(num_miners)
+
+    scoring_mechanism = GroundTruthTagSimilarityScoringMechanism()
+    final_scores, rank_scores = await scoring_mechanism.evaluate(task_bundle, miner_responses=responses)
+
+    monkeypatch.setattr(GroundTruthTagSimilarityScoringMechanism, "vectorized", False)
+    expected_final_scores, expected_rank_scores = await scoring_mechanism.evaluate(task_bundle, miner_responses=responses)
+
+    assert np.allclose(rank_scores, expected_rank_scores, atol=1e-6)
+    assert [score['hotkey'] for score in final_scores] == [score['hotkey'] for score in expected_final_scores]
+    assert np.allclose(
+        [score['adjustedScore'] for score in final_scores],
+        [score['adjustedScore'] for score in expected_final_scores],
+        atol=1e-6,
+    )
+
+
+def test_calculate_stats_batch_matches_calculate_stats():
+    scoring_mechanism = GroundTruthTagSimilarityScoringMechanism()
+    segments = [
+        ([0.1, 0.5, 0.3, 0.9], [False, True, True, True]),
+        ([], []),
+        ([0.2, 0.4], [False, False]),
+        ([0.7, np.nan, 0.1], [True, True, False]),
+        ([0.6], [True]),
+    ]
+    scores = np.array([score for segment_scores, _ in segments for score in segment_scores])
+    unique_mask = np.array([flag for _, flags in segments for flag in flags], dtype=bool)
+    offsets = np.cumsum([0] + [len(segment_scores) for segment_scores, _ in segments])
+
+    all_stats = scoring_mechanism._calculate_stats_batch(scores, unique_mask, offsets)
+
+    for (segment_scores, flags), stats in zip(segments, all_stats):
+        segment_unique = [score for score, flag in zip(segment_scores, flags) if flag]
+        expected = scoring_mechanism._calculate_stats(segment_scores, segment_unique)
+        for key, value in expected.items():
+            assert stats[key] == pytest.approx(value), key
+
+
+def test_score_tag_vectors_handles_missing_and_mismatched_vectors():
+    scoring_mechanism = GroundTruthTagSimilarityScoringMechanism()
+    neighborhood = np.array([1.0, 0.0, 0.0])
+
+    scores = scoring_mechanism._score_tag_vectors(neighborhood, [[1.0, 0.0, 0.0], None, [0.0, 1.0], np.zeros(3), [1.0, 1.0, 0.0]])
+
+    assert scores[0] == pytest.approx(1.0)
+    assert scores[1] == 0
+    assert scores[2] == 0
+    assert scores[3] == 0
+    assert scores[4] == pytest.approx(1 / np.sqrt(2), rel=1e-6)
+
+
+@pytest.mark.asyncio
+async def test_vectorized_evaluate_scores_shared_results_once(monkeypatch):
+    monkeypatch.setattr("conversationgenome.scoring_mechanism.GroundTruthTagSimilarityScoringMechanism.bt.logging", DummyLogging)
+    task_bundle, responses = _random_scoring_case(4, seed=3)
+    responses = [response for response in responses if response.cgp_output]
+    # Grouped responses share the formatted tags and vectors of their group leader
+    shared_result = responses[0].cgp_output[0]
+    responses.append(DummyResponse([dict(shared_result)], DummyAxon('uuid-copy', 'hk-copy')))
+
+    scoring_mechanism = GroundTruthTagSimilarityScoringMechanism()
+    collected = []
+    original_collect = scoring_mechanism._collect_tag_vectors
+
+    def collect_tag_vectors(full_convo_tags, miner_result):
+        collected.append(miner_result)
+        return original_collect(full_convo_tags, miner_result)
+
+    monkeypatch.setattr(scoring_mechanism, "_collect_tag_vectors", collect_tag_vectors)
+    final_scores, rank_scores = await scoring_mechanism.evaluate(task_bundle, miner_responses=responses)
+
+    assert len(collected) == len(responses) - 1
+    assert final_scores[-1]['hotkey'] == 'hk-copy'
+    assert final_scores[-1]['final_miner_score'] == final_scores[0]['final_miner_score']
+    assert rank_scores[-1] == rank_scores[0]
+
+
+@pytest.mark.asyncio
+async def test_evaluate_reuses_the_task_bundle_neighborhood(monkeypatch):
+    from tests.mocks.DummyData import DummyData
+
+    monkeypatch.setattr("conversationgenome.scoring_mechanism.GroundTruthTagSimilarityScoringMechanism.bt.logging", DummyLogging)
+    task_bundle = DummyData.setup_conversation_tagging_task_bundle()
+    metadata = task_bundle.input.metadata
+    builds = []
+    original_build = task_bundle._build_semantic_neighborhood
+
+    def build_semantic_neighborhood(vectors):
+        builds.append(vectors)
+        return original_build(vectors)
+
+    monkeypatch.setattr(task_bundle, "_build_semantic_neighborhood", build_semantic_neighborhood)
+    tags = ["risk", "fraud", "audit", "compliance"]
+    vectors = {tag: {'vectors': [0.1 * (idx + 1), 0.2, 0.3]} for idx, tag in enumerate(tags)}
+    responses = [DummyResponse([{'tags': tags, 'vectors': vectors}], DummyAxon('uuid-0', 'hk-0'))]
+
+    scoring_mechanism = GroundTruthTagSimilarityScoringMechanism()
+    first_scores, _ = await scoring_mechanism.evaluate(task_bundle, miner_responses=responses)
+    second_scores, _ = await scoring_mechanism.evaluate(task_bundle, miner_responses=responses)
+
+    assert len(builds) == 1
+    assert first_scores[0]['adjustedScore'] > 0
+    assert first_scores == second_scores
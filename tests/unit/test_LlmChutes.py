@@ -36,6 +36,25 @@ def test_llm_chutes_basic_prompt(mock_config):
         args, kwargs = mock_client.chat.completions.create.call_args
         assert kwargs['model'] == 'test_chutes_model'
 
+def test_llm_chutes_embeddings_batch_is_single_request(mock_config):
+    with patch('conversationgenome.llm.llm_chutes.OpenAI'), \
+         patch('conversationgenome.llm.llm_chutes.requests.post') as mock_post:
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.json.return_value = {
+            "data": [
+                {"index": 1, "embedding": [0.2]},
+                {"index": 0, "embedding": [0.1]},
+            ]
+        }
+
+        llm = LlmChutes()
+        vectors = llm.get_vector_embeddings_batch(["tag one", "tag\ntwo"])
+
+        assert vectors == [[0.1], [0.2]]
+        mock_post.assert_called_once()
+        args, kwargs = mock_post.call_args
+        assert kwargs['json']['input'] == ["tag one", "tag two"]
+
 def test_llm_factory_chutes_registration():
     with patch('conversationgenome.llm.llm_factory.c') as mock_c:
         mock_c.get.return_value = "chutes"
@@ -0,0 +1,46 @@
+import pytest
+
+from conversationgenome.llm.llm_factory import get_llm_backend
+from conversationgenome.llm.llm_factory import get_llm_backend_stats
+from conversationgenome.llm.llm_factory import reload_llm_backends
+from conversationgenome.llm.llm_openai import LlmOpenAI
+
+
+@pytest.fixture
+def openai_env(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "fake-api-key-for-unit-tests")
+    monkeypatch.setenv("OPENAI_MODEL", "gpt-test")
+    monkeypatch.delenv("LLM_TYPE_OVERRIDE", raising=False)
+
+
+def test_get_llm_backend_reuses_configured_backend(openai_env):
+    first = get_llm_backend()
+    second = get_llm_backend("openai")
+
+    assert isinstance(first, LlmOpenAI)
+    assert first is second
+    stats = get_llm_backend_stats()
+    assert stats["reused"] >= 1
+    assert stats["backends"]["openai|gpt-test|None"]["reuses"] == 1
+
+
+def test_get_llm_backend_builds_new_backend_when_model_changes(openai_env, monkeypatch):
+    first = get_llm_backend()
+    monkeypatch.setenv("OPENAI_MODEL", "gpt-other")
+    second = get_llm_backend()
+
+    assert first is not second
+    assert second.model == "gpt-other"
+
+
+def test_reload_llm_backends_drops_cached_backends(openai_env):
+    first = get_llm_backend()
+    reload_llm_backends("openai")
+
+    assert get_llm_backend() is not first
+    assert "openai|gpt-test|None" in get_llm_backend_stats()["backends"]
+
+
+def test_get_llm_backend_rejects_unknown_provider():
+    with pytest.raises(ValueError):
+        get_llm_backend("unknown")
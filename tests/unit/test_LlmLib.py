@@ -1,6 +1,9 @@
+import asyncio
 import pytest
 from unittest.mock import MagicMock, patch
-from conversationgenome.llm.LlmLib import LlmLib
+from conversationgenome.llm.LlmLib import LlmLib, model_override
+from conversationgenome.llm.embedding_cache import EmbeddingCache
+from conversationgenome.llm.tag_validation_cache import TagValidationCache
 from conversationgenome.api.models.conversation import Conversation
 from conversationgenome.api.models.raw_metadata import RawMetadata
 from conversationgenome.api.models.conversation_metadata import ConversationQualityMetadata
@@ -19,6 +22,9 @@ class MockLlmLib(LlmLib):
     def get_vector_embeddings(self, tag: str) -> list[float]:
         return self.embedding_responses.get(tag, [0.1, 0.2, 0.3])
 
+    def get_vector_embeddings_batch(self, tags: list[str]) -> list[list[float]]:
+        return [self.get_vector_embeddings(tag) for tag in tags]
+
 
 @pytest.fixture
 def mock_llm():
@@ -37,6 +43,70 @@ def test_get_vector_embeddings_set(mock_llm):
         assert result == expected
 
 
+def test_get_vector_embeddings_set_uses_one_batch_request(mock_llm):
+    with patch.object(mock_llm, 'get_vector_embeddings_batch', wraps=mock_llm.get_vector_embeddings_batch) as mock_batch, \
+         patch.object(mock_llm, 'get_vector_embeddings') as mock_single:
+        mock_single.side_effect = lambda tag: [1.0]
+        result = mock_llm.get_vector_embeddings_set(['music', 'travel', 'cooking'])
+
+        mock_batch.assert_called_once()
+        assert sorted(mock_batch.call_args.args[0]) == ['cooking', 'music', 'travel']
+        assert set(result.keys()) == {'music', 'travel', 'cooking'}
+
+
+def test_get_vector_embeddings_set_marks_failed_batch_as_empty(mock_llm):
+    with patch.object(mock_llm, 'get_vector_embeddings_batch', return_value=None):
+        result = mock_llm.get_vector_embeddings_set(['music', 'travel'])
+
+        assert result == {'music': {'vectors': []}, 'travel': {'vectors': []}}
+
+
+def test_get_vector_embeddings_set_only_embeds_uncached_tags(mock_llm):
+    mock_llm.embedding_cache = EmbeddingCache()
+    mock_llm.embedding_cache.put_many(mock_llm._get_embedding_namespace(), {'music': [9.0, 9.0]})
+    with patch.object(mock_llm, 'get_vector_embeddings_batch', wraps=mock_llm.get_vector_embeddings_batch) as mock_batch:
+        result = mock_llm.get_vector_embeddings_set(['music', 'travel'])
+
+        mock_batch.assert_called_once_with(['travel'])
+        assert result['music'] == {'vectors': [9.0, 9.0]}
+        assert result['travel'] == {'vectors': [0.1, 0.2, 0.3]}
+
+        mock_llm.get_vector_embeddings_set(['music', 'travel'])
+        assert mock_batch.call_count == 1
+
+
+def test_backends_without_embeddings_share_the_cache_entries_of_their_embedding_backend(monkeypatch):
+    from conversationgenome.llm.llm_anthropic import LlmAnthropic
+    from conversationgenome.llm.llm_groq import LlmGroq
+    from conversationgenome.llm.llm_openai import LlmOpenAI
+
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "fake-anthropic-key")
+    monkeypatch.setenv("GROQ_API_KEY", "fake-groq-key")
+    cache = EmbeddingCache()
+    openai_llm = LlmOpenAI()
+    openai_llm.embedding_cache = cache
+    openai_llm.embedding_cache.put_many(openai_llm._get_embedding_namespace(), {'music': [9.0, 9.0]})
+
+    for llm in (LlmAnthropic(), LlmGroq()):
+        llm.embedding_cache = cache
+        monkeypatch.setattr(llm, '_get_embedding_backend', lambda: openai_llm)
+        with patch.object(openai_llm, 'get_vector_embeddings_batch') as mock_batch:
+            result = llm.get_vector_embeddings_set(['music'])
+
+        mock_batch.assert_not_called()
+        assert llm._get_embedding_namespace() == ("LlmOpenAI", "text-embedding-3-small", 1536)
+        assert result == {'music': {'vectors': [9.0, 9.0]}}
+
+
+def test_get_embedding_batches_respects_input_and_token_limits(mock_llm):
+    mock_llm.embedding_batch_max_inputs = 2
+    assert mock_llm._get_embedding_batches(['aaa', 'bbb', 'ccc']) == [['aaa', 'bbb'], ['ccc']]
+
+    mock_llm.embedding_batch_max_inputs = 100
+    mock_llm.embedding_batch_max_tokens = 5
+    assert mock_llm._get_embedding_batches(['a' * 8, 'b' * 8, 'c' * 8]) == [['a' * 8], ['b' * 8], ['c' * 8]]
+
+
 def test_conversation_to_metadata(mock_llm):
     with patch.object(Utils, 'generate_convo_xml') as mock_xml, \
          patch('conversationgenome.llm.prompt_manager.prompt_manager.conversation_to_metadata_prompt') as mock_prompt_mgr, \
@@ -186,6 +256,58 @@ def test_validate_tag_set_empty_response(mock_llm):
         assert result is None
 
 
+def test_validate_tag_set_only_sends_unseen_tags_to_the_llm(mock_llm):
+    mock_llm.tag_validation_cache = TagValidationCache()
+    prompts = []
+
+    def basic_prompt(prompt, response_format="text"):
+        prompts.append(prompt)
+        return "good english keywords: music, travel, hiking\nmalformed keywords: musictravl"
+
+    with patch.object(mock_llm, 'basic_prompt', side_effect=basic_prompt):
+        first = mock_llm.validate_tag_set(["music", "travel", "musictravl"])
+        second = mock_llm.validate_tag_set(["travel", "musictravl", "hiking"])
+
+    assert sorted(first) == ["music", "travel"]
+    assert sorted(second) == ["hiking", "travel"]
+    assert len(prompts) == 2
+    assert "hiking" in prompts[1] and "travel" not in prompts[1] and "musictravl" not in prompts[1]
+
+
+@pytest.mark.asyncio
+async def test_avalidate_tag_set_skips_the_llm_when_every_verdict_is_cached(mock_llm):
+    mock_llm.tag_validation_cache = TagValidationCache()
+    mock_llm.tag_validation_cache.put_many(mock_llm._get_validation_namespace(), {"music": True, "musictravl": False})
+
+    with patch.object(mock_llm, 'basic_prompt') as mock_prompt:
+        result = await mock_llm.avalidate_tag_set(["music", "musictravl"])
+
+    assert result == ["music"]
+    mock_prompt.assert_not_called()
+
+
+def test_validate_tag_set_does_not_cache_failed_validations(mock_llm):
+    mock_llm.tag_validation_cache = TagValidationCache()
+
+    with patch.object(mock_llm, 'basic_prompt', return_value=None):
+        assert mock_llm.validate_tag_set(["music", "travel"]) is None
+
+    assert mock_llm.tag_validation_cache.stats()["entries"] == 0
+
+
+def test_tag_validation_cache_expires_and_evicts_entries():
+    cache = TagValidationCache(max_size=2, ttl=60)
+    namespace = ("MockLlmLib", "model-a")
+    cache.put_many(namespace, {"music": True, "travel": True, "hiking": False})
+
+    assert cache.get_many(namespace, ["music", "travel", "hiking"]) == {"travel": True, "hiking": False}
+    assert cache.get_many(("MockLlmLib", "model-b"), ["travel"]) == {}
+
+    with patch("conversationgenome.llm.tag_validation_cache.time.monotonic", return_value=10**9):
+        assert cache.get_many(namespace, ["travel"]) == {}
+    assert cache.stats()["expired"] == 1
+
+
 def test_validate_named_entities_tag_set(mock_llm):
     with patch.object(Utils, 'get_clean_tag_set') as mock_clean_set:
         mock_clean_set.return_value = ["entity1", "entity2"]
@@ -224,3 +346,62 @@ def test_conversation_to_metadata_coding(mock_llm):
         assert isinstance(result, RawMetadata)
         assert result.tags == ["python", "machine learning", "pytorch"]
         mock_prompt_mgr.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_aconversation_to_metadata_with_embeddings(mock_llm):
+    with patch.object(Utils, 'generate_convo_xml') as mock_xml, \
+         patch('conversationgenome.llm.prompt_manager.prompt_manager.conversation_to_metadata_prompt') as mock_prompt_mgr:
+
+        mock_xml.return_value = ("<xml>", ["p1", "p2"])
+        mock_prompt_mgr.return_value = "prompt"
+        mock_llm.basic_prompt_responses = {"prompt": "tag1,tag2"}
+        mock_llm.embedding_responses = {'tag1': [1.0], 'tag2': [2.0]}
+
+        conversation = MagicMock(spec=Conversation)
+        conversation.input_categories = None
+        result = await mock_llm.aconversation_to_metadata(conversation, generateEmbeddings=True)
+
+        assert result.tags == ["tag1", "tag2"]
+        assert result.vectors == {'tag1': {'vectors': [1.0]}, 'tag2': {'vectors': [2.0]}}
+
+
+@pytest.mark.asyncio
+async def test_aget_vector_embeddings_set_requests_batches_concurrently(mock_llm):
+    mock_llm.embedding_batch_max_inputs = 1
+    in_flight = []
+    max_in_flight = []
+
+    async def slow_batch(tags):
+        in_flight.append(tags)
+        max_in_flight.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(tags)
+        return [[float(len(tags[0]))]]
+
+    with patch.object(mock_llm, 'aget_vector_embeddings_batch', side_effect=slow_batch):
+        result = await mock_llm.aget_vector_embeddings_set(['music', 'travel', 'cooking'])
+
+    assert max(max_in_flight) == 3
+    assert result == {'music': {'vectors': [5.0]}, 'travel': {'vectors': [6.0]}, 'cooking': {'vectors': [7.0]}}
+
+
+@pytest.mark.asyncio
+async def test_model_override_is_scoped_to_the_decorated_call(mock_llm):
+    mock_llm.model = "default-model"
+    seen_models = {}
+
+    async def fake_prompt(prompt, response_format="text"):
+        await asyncio.sleep(0.01)
+        seen_models[prompt] = mock_llm.model
+        return ""
+
+    @model_override("override-model")
+    async def overridden(self):
+        return await self.abasic_prompt("overridden")
+
+    with patch.object(mock_llm, 'abasic_prompt', side_effect=fake_prompt):
+        await asyncio.gather(overridden(mock_llm), mock_llm.abasic_prompt("plain"))
+
+    assert seen_models == {"overridden": "override-model", "plain": "default-model"}
+    assert mock_llm.model == "default-model"
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from conversationgenome.api.models.conversation import Conversation
+from conversationgenome.llm.llm_factory import get_llm_backend
+from conversationgenome.llm.llm_local_stub import LlmLocalStub
+from conversationgenome.llm.llm_local_stub import LocalStubModel
+from conversationgenome.llm.llm_local_stub import LocalStubServer
+from conversationgenome.llm.llm_local_stub import parse_latency
+from conversationgenome.llm.llm_openai import LlmOpenAI
+
+
+@pytest.fixture
+def local_stub_env(monkeypatch):
+    monkeypatch.setenv("LLM_TYPE_OVERRIDE", "local_stub")
+    monkeypatch.setenv("LOCAL_STUB_EMBEDDING_DIMENSIONS", "16")
+
+
+def test_local_stub_is_selected_by_llm_type_override(local_stub_env):
+    llml = get_llm_backend()
+
+    assert isinstance(llml, LlmLocalStub)
+    assert llml.embedding_dimensions == 16
+
+
+@pytest.mark.asyncio
+async def test_local_stub_tags_and_embeddings_are_deterministic(local_stub_env):
+    llml = get_llm_backend()
+    conversation = Conversation(guid="1", lines=[[0, "I grow tomatoes and basil in my garden"], [1, "Tomatoes need a lot of sun, basil too"]])
+
+    result = await llml.aconversation_to_metadata(conversation, generateEmbeddings=True)
+
+    assert result.tags[:2] == ["tomatoes", "basil"]
+    vector = result.vectors["tomatoes"]["vectors"]
+    assert len(vector) == 16
+    assert np.isclose(np.linalg.norm(vector), 1.0)
+    assert vector == LocalStubModel(dimensions=16).embed("tomatoes")
+    assert llml.conversation_to_metadata(conversation).tags == result.tags
+
+    assert await llml.avalidate_tag_set(["tomatoes", "basil"]) is not None
+    quality = await llml.avalidate_conversation_quality(conversation)
+    assert 5 <= quality.quality_score <= 10
+
+
+def test_local_stub_latency_and_errors_follow_the_configured_distribution():
+    stub = LocalStubModel(latency="uniform:0.1:0.2", error_rate=0.25, seed=4)
+    calls = [stub.next_call("completion") for _ in range(400)]
+
+    assert all(0.1 <= delay <= 0.2 for delay, _ in calls)
+    assert 60 < sum(failed for _, failed in calls) < 140
+    # Same seed, same sequence
+    same_seed = LocalStubModel(latency="uniform:0.1:0.2", error_rate=0.25, seed=4)
+    assert calls == [same_seed.next_call("completion") for _ in range(400)]
+    assert parse_latency("0.5")(None) == 0.5
+    with pytest.raises(ValueError):
+        parse_latency("gamma:1:2")
+
+
+def test_local_stub_server_speaks_the_openai_wire_format(monkeypatch):
+    server = LocalStubServer(LocalStubModel(dimensions=8)).start()
+    try:
+        monkeypatch.setenv("OPENAI_API_KEY", "local-stub")
+        monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+        llml = LlmOpenAI()
+
+        assert llml.basic_prompt("<keywords>\nsun,garden\n</keywords>").startswith("Good English keywords: garden, sun")
+        vectors = llml.get_vector_embeddings_batch(["sun", "garden"], dimensions=8)
+        assert vectors == [server.stub.embed("sun", 8), server.stub.embed("garden", 8)]
+        assert server.stub.stats()["calls"] == {"completion": 1, "embedding": 1}
+    finally:
+        server.stop()
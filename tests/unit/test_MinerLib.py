@@ -5,6 +5,7 @@ from pydantic import ValidationError
 import conversationgenome.task.ConversationTaggingTask as ctt
 from conversationgenome.api.models.conversation_metadata import ConversationMetadata
 from conversationgenome.miner.MinerLib import MinerLib
+from conversationgenome.llm.LlmLib import LlmLib
 from tests.mocks.DummyData import DummyData
 
 lines = [(0, "hello"), (1, "world")]
@@ -16,11 +17,11 @@ vectors = {"apple": {"vector": [0.1]}, "banana": {"vector": [0.2]}}
 
 @pytest.mark.asyncio
 async def test_given_proper_inputs_then_conversation_metadata_is_returned():
-    mock_llml = MagicMock()
+    mock_llml = MagicMock(spec=LlmLib)
     mock_result = Mock()
     mock_result.tags = tags
     mock_result.vectors = vectors
-    mock_llml.conversation_to_metadata = Mock(return_value=mock_result)
+    mock_llml.aconversation_to_metadata = AsyncMock(return_value=mock_result)
     with patch("conversationgenome.task.ConversationTaggingTask.get_llm_backend", return_value=mock_llml):
         miner = MinerLib()
         task = DummyData.conversation_tagging_task()
@@ -52,3 +53,61 @@ async def test_given_task_with_invalid_types_then_throw_validation_error():
     # Provide invalid types for fields
     with pytest.raises(ValidationError):
         await miner.do_mining(task=ctt.ConversationTaggingTask(conversation="not_a_list", prompt=123))
+
+
+@pytest.mark.asyncio
+async def test_repeated_task_content_is_mined_once(monkeypatch):
+    import asyncio
+
+    import conversationgenome.miner.MiningResultCache as mining_result_cache
+
+    cache = mining_result_cache.MiningResultCache()
+    monkeypatch.setattr(mining_result_cache, "_MINING_RESULT_CACHE", cache)
+    mined = []
+
+    async def slow_mine(task, deadline=None):
+        mined.append(task.guid)
+        await asyncio.sleep(0.01)
+        return {"tags": list(tags), "vectors": None}
+
+    monkeypatch.setattr(ctt.ConversationTaggingTask, "mine", slow_mine)
+    first, second, later = (DummyData.conversation_tagging_task() for _ in range(3))
+    later.input.data.window_idx = 7
+
+    miner = MinerLib()
+    results = await asyncio.gather(miner.do_mining(task=first), miner.do_mining(task=second))
+    results.append(await miner.do_mining(task=later))
+
+    assert mined == [first.guid]
+    assert all(result["tags"] == tags for result in results)
+    assert cache.stats()["coalesced"] == 1
+    assert cache.stats()["hits"] == 1
+
+    # Different window lines are mined again
+    other = DummyData.conversation_tagging_task()
+    other.input.data.window = [(0, "something else")]
+    await miner.do_mining(task=other)
+    assert mined == [first.guid, other.guid]
+
+
+@pytest.mark.asyncio
+async def test_failed_mining_is_shared_with_waiting_requests_but_not_cached(monkeypatch):
+    import asyncio
+
+    from conversationgenome.miner.MiningResultCache import MiningResultCache
+
+    cache = MiningResultCache()
+    calls = []
+
+    async def failing_mine():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("llm down")
+
+    task = DummyData.conversation_tagging_task()
+    results = await asyncio.gather(cache.get_or_mine(task, failing_mine), cache.get_or_mine(task, failing_mine), return_exceptions=True)
+
+    assert len(calls) == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["in_flight"] == 0
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from conversationgenome.miner.MiningQueue import MiningQueue
+from conversationgenome.miner.MiningQueue import MiningQueueFull
+
+
+def _job(order, name, release=None, result=None):
+    async def job():
+        order.append(name)
+        if release is not None:
+            await release.wait()
+        return result if result is not None else name
+
+    return job
+
+
+@pytest.mark.asyncio
+async def test_queue_limits_concurrency_and_serves_highest_stake_first():
+    queue = MiningQueue(workers=1, max_queue=5)
+    release = asyncio.Event()
+    order = []
+
+    first = asyncio.ensure_future(queue.run(_job(order, "first", release), priority=0))
+    await asyncio.sleep(0)
+    waiting = [asyncio.ensure_future(queue.run(_job(order, name), priority=stake)) for name, stake in (("low", 1), ("high", 100), ("mid", 10))]
+    await asyncio.sleep(0.01)
+
+    assert order == ["first"]
+    assert queue.stats()["queued"] == 3
+
+    release.set()
+    assert await asyncio.gather(first, *waiting) == ["first", "low", "high", "mid"]
+    assert order == ["first", "high", "mid", "low"]
+    assert queue.stats()["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_sheds_the_lowest_priority_request():
+    queue = MiningQueue(workers=1, max_queue=1)
+    release = asyncio.Event()
+    order = []
+
+    busy = asyncio.ensure_future(queue.run(_job(order, "busy", release), priority=50))
+    await asyncio.sleep(0)
+    low = asyncio.ensure_future(queue.run(_job(order, "low"), priority=1))
+    await asyncio.sleep(0)
+
+    # Does not outrank the waiting request
+    with pytest.raises(MiningQueueFull):
+        await queue.run(_job(order, "lower"), priority=1)
+
+    high = asyncio.ensure_future(queue.run(_job(order, "high"), priority=9))
+    await asyncio.sleep(0)
+    with pytest.raises(MiningQueueFull):
+        await low
+
+    release.set()
+    assert await high == "high"
+    assert await busy == "busy"
+    assert queue.stats()["shed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_latency_is_tracked_per_task_type_and_failures_release_the_worker():
+    queue = MiningQueue(workers=1, max_queue=2)
+
+    async def fail():
+        raise ValueError("llm down")
+
+    with pytest.raises(ValueError):
+        await queue.run(fail, task_type="survey_tagging")
+    await queue.run(_job([], "ok"), task_type="conversation_tagging")
+
+    latency = queue.get_latency_stats()
+    assert latency["survey_tagging"]["count"] == 1
+    assert latency["conversation_tagging"]["count"] == 1
+    assert queue.stats()["failed"] == 1
+    assert queue.stats()["completed"] == 1
+    assert queue.stats()["active"] == 0
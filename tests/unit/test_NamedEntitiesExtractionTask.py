@@ -4,6 +4,7 @@ from unittest.mock import patch
 import pytest
 
 from conversationgenome.task.NamedEntitiesExtrationTask import NamedEntitiesExtractionTask, NamedEntitiesExtractionTaskInput, NamedEntitiesExtractionTaskInputData
+from conversationgenome.llm.LlmLib import LlmLib
 from tests.mocks.DummyData import DummyData
 
 
@@ -28,21 +29,21 @@ async def test_mine_returns_expected_tags():
     )
 
     # Mock the LLM backend
-    mock_llml = MagicMock()
+    mock_llml = MagicMock(spec=LlmLib)
     mock_result = Mock()
     mock_result.tags = ["John Smith", "Apple Inc", "New York"]
-    mock_llml.raw_transcript_to_named_entities = Mock(return_value=mock_result)
-    mock_llml.enrichment_to_NER = Mock(return_value=mock_result)
-    mock_llml.combine_named_entities = Mock(return_value=mock_result)
+    mock_llml.araw_transcript_to_named_entities = AsyncMock(return_value=mock_result)
+    mock_llml.aenrichment_to_NER = AsyncMock(return_value=mock_result)
+    mock_llml.acombine_named_entities = AsyncMock(return_value=mock_result)
 
     with patch("conversationgenome.task.NamedEntitiesExtrationTask.get_llm_backend", return_value=mock_llml):
         result = await task.mine()
 
         assert result["tags"] == ["John Smith", "Apple Inc", "New York"]
         # Verify the transcript was constructed correctly
-        mock_llml.raw_transcript_to_named_entities.assert_called_once_with("John Smith works at Apple Inc.", generateEmbeddings=False)
-        mock_llml.enrichment_to_NER.assert_called_once_with("He lives in New York.", generateEmbeddings=False)
-        mock_llml.combine_named_entities.assert_called_once()
+        mock_llml.araw_transcript_to_named_entities.assert_called_once_with("John Smith works at Apple Inc.", generateEmbeddings=False)
+        mock_llml.aenrichment_to_NER.assert_called_once_with("He lives in New York.", generateEmbeddings=False)
+        mock_llml.acombine_named_entities.assert_called_once()
 
 @pytest.mark.asyncio
 async def test_mine_handles_empty_tags():
@@ -63,12 +64,12 @@ async def test_mine_handles_empty_tags():
         )
     )
 
-    mock_llml = MagicMock()
+    mock_llml = MagicMock(spec=LlmLib)
     mock_result = Mock()
     mock_result.tags = []
-    mock_llml.raw_transcript_to_named_entities = Mock(return_value=mock_result)
-    mock_llml.enrichment_to_NER = Mock(return_value=mock_result)
-    mock_llml.combine_named_entities = Mock(return_value=mock_result)
+    mock_llml.araw_transcript_to_named_entities = AsyncMock(return_value=mock_result)
+    mock_llml.aenrichment_to_NER = AsyncMock(return_value=mock_result)
+    mock_llml.acombine_named_entities = AsyncMock(return_value=mock_result)
 
     with patch("conversationgenome.task.NamedEntitiesExtrationTask.get_llm_backend", return_value=mock_llml):
         result = await task.mine()
@@ -95,8 +96,8 @@ async def test_mine_handles_none_result():
         )
     )
 
-    mock_llml = MagicMock()
-    mock_llml.raw_transcript_to_named_entities = Mock(return_value=None)
+    mock_llml = MagicMock(spec=LlmLib)
+    mock_llml.araw_transcript_to_named_entities = AsyncMock(return_value=None)
 
     with patch("conversationgenome.task.NamedEntitiesExtrationTask.get_llm_backend", return_value=mock_llml):
         await task.mine()
@@ -121,8 +122,8 @@ async def test_mine_handles_exception_from_llm():
         )
     )
 
-    mock_llml = MagicMock()
-    mock_llml.raw_transcript_to_named_entities = Mock(side_effect=Exception("LLM Error"))
+    mock_llml = MagicMock(spec=LlmLib)
+    mock_llml.araw_transcript_to_named_entities = AsyncMock(side_effect=Exception("LLM Error"))
 
     with patch("conversationgenome.task.NamedEntitiesExtrationTask.get_llm_backend", return_value=mock_llml):
         with pytest.raises(Exception, match="LLM Error"):
@@ -148,12 +149,12 @@ async def test_mine_handles_empty_window():
         )
     )
 
-    mock_llml = MagicMock()
+    mock_llml = MagicMock(spec=LlmLib)
     mock_result = Mock()
     mock_result.tags = []
-    mock_llml.raw_transcript_to_named_entities = Mock(return_value=mock_result)
-    mock_llml.enrichment_to_NER = Mock(return_value=mock_result)
-    mock_llml.combine_named_entities = Mock(return_value=mock_result)
+    mock_llml.araw_transcript_to_named_entities = AsyncMock(return_value=mock_result)
+    mock_llml.aenrichment_to_NER = AsyncMock(return_value=mock_result)
+    mock_llml.acombine_named_entities = AsyncMock(return_value=mock_result)
 
     with patch("conversationgenome.task.NamedEntitiesExtrationTask.get_llm_backend", return_value=mock_llml):
         result = await task.mine()
@@ -183,12 +184,12 @@ async def test_mine_constructs_transcript_correctly():
         )
     )
 
-    mock_llml = MagicMock()
+    mock_llml = MagicMock(spec=LlmLib)
     mock_result = Mock()
     mock_result.tags = ["entity1", "entity2"]
-    mock_llml.raw_transcript_to_named_entities = Mock(return_value=mock_result)
-    mock_llml.enrichment_to_NER = Mock(return_value=mock_result)
-    mock_llml.combine_named_entities = Mock(return_value=mock_result)
+    mock_llml.araw_transcript_to_named_entities = AsyncMock(return_value=mock_result)
+    mock_llml.aenrichment_to_NER = AsyncMock(return_value=mock_result)
+    mock_llml.acombine_named_entities = AsyncMock(return_value=mock_result)
 
     with patch("conversationgenome.task.NamedEntitiesExtrationTask.get_llm_backend", return_value=mock_llml):
         result = await task.mine()
@@ -197,6 +198,48 @@ async def test_mine_constructs_transcript_correctly():
         # Verify the transcript is joined with '/n' separator
         expected_transcript = "First line of text."
         expected_webpages = [call("Second line with entities.", generateEmbeddings=False), call("Third line here.", generateEmbeddings=False)]
-        mock_llml.raw_transcript_to_named_entities.assert_called_once_with(expected_transcript, generateEmbeddings=False)
-        mock_llml.enrichment_to_NER.assert_has_calls(expected_webpages)
-        mock_llml.combine_named_entities.assert_called_once()
\ No newline at end of file
+        mock_llml.araw_transcript_to_named_entities.assert_called_once_with(expected_transcript, generateEmbeddings=False)
+        mock_llml.aenrichment_to_NER.assert_has_calls(expected_webpages)
+        mock_llml.acombine_named_entities.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_mine_prompts_lines_concurrently_and_drops_lines_that_time_out(monkeypatch):
+    import asyncio
+
+    monkeypatch.setenv("MINER_LINE_TIMEOUT", "0.2")
+    task = NamedEntitiesExtractionTask(
+        mode="local",
+        guid="test-guid",
+        type="named_entities_extraction",
+        input=NamedEntitiesExtractionTaskInput(
+            guid="input-guid",
+            input_type="document",
+            data=NamedEntitiesExtractionTaskInputData(window=[(0, "Transcript."), (0, "fast"), (0, "slow"), (0, "broken")]),
+        ),
+    )
+    running = []
+    max_running = []
+
+    async def enrichment_to_NER(content, generateEmbeddings=False):
+        running.append(content)
+        max_running.append(len(running))
+        try:
+            if content == "broken":
+                raise RuntimeError("bad response")
+            await asyncio.sleep(1 if content == "slow" else 0.01)
+            return Mock(tags=[content])
+        finally:
+            running.remove(content)
+
+    mock_llml = MagicMock(spec=LlmLib)
+    mock_llml.araw_transcript_to_named_entities = AsyncMock(return_value=Mock(tags=["transcript"]))
+    mock_llml.aenrichment_to_NER = enrichment_to_NER
+    mock_llml.acombine_named_entities = AsyncMock(side_effect=lambda all_tags, generateEmbeddings=False: Mock(tags=sum(all_tags, []), vectors=None))
+
+    with patch("conversationgenome.task.NamedEntitiesExtrationTask.get_llm_backend", return_value=mock_llml):
+        result = await task.mine()
+
+    assert max(max_running) == 3
+    # The slow and broken lines are left out, the order of the others is kept
+    mock_llml.acombine_named_entities.assert_awaited_once_with([["transcript"], ["fast"]], generateEmbeddings=False)
+    assert result["tags"] == ["transcript", "fast"]
@@ -2,6 +2,7 @@ from unittest.mock import AsyncMock, Mock, patch, mock_open
 import json
 import pytest
 from conversationgenome.task_bundle.NamedEntitiesExtractionTaskBundle import NamedEntitiesExtractionTaskBundle
+from conversationgenome.llm.LlmLib import LlmLib
 from tests.mocks.DummyData import DummyData
 
 def test_is_ready_false_when_no_metadata():
@@ -43,7 +44,7 @@ async def test_format_results_validates_and_embeds_tags():
     bundle = DummyData.setup_named_entities_extraction_task_bundle()
     miner_result = {"tags": ["entity1", "entity2"]}
     with patch('conversationgenome.llm.llm_factory.get_llm_backend') as mock_llm_factory:
-        mock_llm = Mock()
+        mock_llm = Mock(spec=LlmLib)
         mock_llm.validate_named_entities_tag_set.return_value = ["entity1", "entity2"]
         mock_llm_factory.return_value = mock_llm
         with patch.object(bundle, '_get_vector_embeddings_set', AsyncMock(return_value={"entity1": [0.1], "entity2": [0.2]})):
@@ -84,7 +85,7 @@ def test_mask_task_for_miner_sets_window_idx():
 @pytest.mark.asyncio
 async def test_get_vector_embeddings_set_calls_llm():
     bundle = DummyData.setup_named_entities_extraction_task_bundle()
-    mock_llm = Mock()
-    mock_llm.get_vector_embeddings_set.return_value = {"tag": [0.1]}
+    mock_llm = Mock(spec=LlmLib)
+    mock_llm.aget_vector_embeddings_set.return_value = {"tag": [0.1]}
     result = await bundle._get_vector_embeddings_set(llml=mock_llm, tags=["tag"])
     assert result == {"tag": [0.1]}
\ No newline at end of file
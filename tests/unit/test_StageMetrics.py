@@ -0,0 +1,101 @@
+from contextlib import contextmanager
+
+import httpx
+import pytest
+
+import conversationgenome.analytics.StageMetrics as stage_metrics_module
+from conversationgenome.analytics.StageMetrics import MetricsServer
+from conversationgenome.analytics.StageMetrics import StageMetrics
+from conversationgenome.analytics.StageMetrics import time_stage
+from conversationgenome.analytics.StageMetrics import timed_stage
+from conversationgenome.llm.LlmLib import LlmLib
+
+
+class _SyncLlm(LlmLib):
+    def basic_prompt(self, prompt, response_format="text"):
+        return "tomatoes, basil"
+
+    def get_vector_embeddings(self, tag):
+        return [1.0, 0.0]
+
+    def get_vector_embeddings_batch(self, tags):
+        return [self.get_vector_embeddings(tag) for tag in tags]
+
+
+class _RecordingTracer:
+    def __init__(self):
+        self.spans = []
+
+    @contextmanager
+    def start_as_current_span(self, name, attributes=None):
+        self.spans.append((name, attributes))
+        yield
+
+
+@pytest.fixture
+def stage_metrics(monkeypatch):
+    metrics = StageMetrics(window=100)
+    monkeypatch.setattr(stage_metrics_module, "_STAGE_METRICS", metrics)
+    return metrics
+
+
+@pytest.mark.asyncio
+async def test_stages_are_timed_once_and_errors_counted(stage_metrics):
+    @timed_stage("upload")
+    async def upload(fail=False):
+        with time_stage("upload"):
+            if fail:
+                raise ValueError("upload failed")
+
+    await upload()
+    with pytest.raises(ValueError):
+        await upload(fail=True)
+
+    llml = _SyncLlm()
+    # The default async methods run the blocking ones in a thread, the nested call is the same stage
+    assert await llml.abasic_prompt("prompt") == "tomatoes, basil"
+    assert await llml.aget_vector_embeddings_batch(["a", "b"]) == [[1.0, 0.0], [1.0, 0.0]]
+
+    stats = stage_metrics.stats()
+    assert stats["upload"]["count"] == 2 and stats["upload"]["errors"] == 1
+    assert stats["llm_prompt"]["count"] == 1
+    assert stats["llm_embeddings"]["count"] == 1
+    assert stats["upload"]["p50"] <= stats["upload"]["p95"]
+
+
+def test_histograms_are_served_in_the_prometheus_format():
+    metrics = StageMetrics(buckets=(0.1, 1.0))
+    metrics.observe("dispatch", 0.05)
+    metrics.observe("dispatch", 0.5)
+    metrics.observe("dispatch", 3.0, error=True)
+
+    server = MetricsServer(metrics, port=0).start()
+    try:
+        response = httpx.get(f"http://127.0.0.1:{server.port}/metrics")
+        assert httpx.get(f"http://127.0.0.1:{server.port}/other").status_code == 404
+    finally:
+        server.stop()
+
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert "# TYPE cgp_stage_duration_seconds histogram" in lines
+    assert 'cgp_stage_duration_seconds_bucket{stage="dispatch",le="0.1"} 1' in lines
+    assert 'cgp_stage_duration_seconds_bucket{stage="dispatch",le="1.0"} 2' in lines
+    assert 'cgp_stage_duration_seconds_bucket{stage="dispatch",le="+Inf"} 3' in lines
+    assert 'cgp_stage_duration_seconds_count{stage="dispatch"} 3' in lines
+    assert 'cgp_stage_errors_total{stage="dispatch"} 1' in lines
+
+
+def test_stages_are_recorded_as_spans_and_can_be_disabled(monkeypatch):
+    tracer = _RecordingTracer()
+    metrics = StageMetrics(tracer=tracer)
+    with metrics.time("reserve", task_type="conversation_tagging"):
+        with metrics.time("setup"):
+            pass
+    assert tracer.spans == [("cgp.reserve", {"task_type": "conversation_tagging"}), ("cgp.setup", None)]
+
+    monkeypatch.setenv("STAGE_METRICS_ENABLED", "0")
+    monkeypatch.setattr(stage_metrics_module, "_STAGE_METRICS", None)
+    with time_stage("reserve"):
+        pass
+    assert stage_metrics_module.get_stage_metrics() is None
@@ -0,0 +1,113 @@
+import os
+from types import SimpleNamespace
+
+import numpy as np
+
+from conversationgenome.base.validator import BaseValidatorNeuron
+from conversationgenome.validator.StateCheckpoint import StateCheckpoint
+from conversationgenome.validator.StateCheckpoint import convert_legacy_state
+
+
+class _StateValidator(BaseValidatorNeuron):
+    async def forward(self):
+        pass
+
+
+def _validator(path, n=8):
+    v = _StateValidator.__new__(_StateValidator)
+    v.config = SimpleNamespace(neuron=SimpleNamespace(full_path=str(path), moving_average_alpha=0.1))
+    v.metagraph = SimpleNamespace(n=n)
+    v.device = "cpu"
+    v.nonlinear_power = 3.0
+    v.first_sync = False
+    v.step = 0
+    v.scores = np.zeros(n, dtype=np.float32)
+    v.ema_scores = np.zeros(n, dtype=np.float32)
+    v.hotkeys = np.array([f"hk{uid}" for uid in range(n)])
+    return v
+
+
+def test_snapshot_round_trips_through_mmap(tmp_path):
+    checkpoint = StateCheckpoint(str(tmp_path))
+    scores = np.linspace(0, 1, 300, dtype=np.float32)
+    ema_scores = np.linspace(1, 2, 300)
+
+    checkpoint.write_snapshot(12, scores, ema_scores, [f"hk{uid}" for uid in range(300)])
+    state, ops = StateCheckpoint(str(tmp_path)).load()
+
+    assert ops == []
+    assert state["step"] == 12
+    assert state["hotkeys"][299] == "hk299"
+    assert np.array_equal(state["scores"], scores) and state["scores"].dtype == np.float32
+    assert np.array_equal(state["ema_scores"], ema_scores) and state["ema_scores"].dtype == np.float64
+    # Copy-on-write: changing the loaded arrays does not change the file
+    state["scores"][0] = 5
+    assert StateCheckpoint(str(tmp_path)).load()[0]["scores"][0] == 0
+    assert not os.path.exists(checkpoint.snapshot_path + ".tmp")
+
+
+def test_validator_appends_updates_between_snapshots_and_replays_them(tmp_path):
+    v = _validator(tmp_path)
+    v.update_scores(np.array([0.9, 0.4]), [1, 2])
+    v.step = 1
+    v.save_state()
+    assert v.get_state_checkpoint().log_records == 0
+
+    v.update_scores(np.array([0.7, 0.2, 0.5]), [3, 1, 6])
+    v.update_scores(np.array([0.0, 0.8]), [2, 5])
+    v.step = 2
+    v.save_state()
+
+    checkpoint = v.get_state_checkpoint()
+    assert checkpoint.log_records == 2
+    with open(checkpoint.log_path) as f:
+        assert len(f.readlines()) == 2
+
+    restored = _validator(tmp_path)
+    restored.load_state()
+
+    assert restored.step == 2
+    assert np.array_equal(restored.scores, v.scores)
+    assert np.array_equal(restored.ema_scores, v.ema_scores)
+    assert list(restored.hotkeys) == list(v.hotkeys)
+
+
+def test_torn_log_records_and_records_in_the_snapshot_are_not_replayed(tmp_path):
+    v = _validator(tmp_path)
+    v.update_scores(np.array([0.9]), [1])
+    v.save_state()
+    v.update_scores(np.array([0.6]), [4])
+    v.save_state()
+    log_path = v.get_state_checkpoint().log_path
+    with open(log_path) as f:
+        logged = f.read()
+
+    # Crash after the next snapshot was renamed but before the log was truncated
+    v.state_snapshot_needed = True
+    v.update_scores(np.array([0.3]), [2])
+    v.save_state()
+    with open(log_path, "w") as f:
+        f.write(logged + '{"seq": 99, "op": "upd')
+
+    restored = _validator(tmp_path)
+    restored.load_state()
+
+    assert np.array_equal(restored.ema_scores, v.ema_scores)
+    assert np.array_equal(restored.scores, v.scores)
+
+
+def test_legacy_npz_state_is_converted(tmp_path):
+    scores = np.array([0.1, 0.2, 0.7], dtype=np.float32)
+    np.savez(tmp_path / "state.npz", step=7, scores=scores, hotkeys=np.array(["a", "b", "c"]), ema_scores=scores * 2)
+
+    v = _validator(tmp_path, n=3)
+    v.load_state()
+
+    assert v.step == 7
+    assert np.array_equal(v.ema_scores, scores * 2)
+    assert StateCheckpoint(str(tmp_path)).exists()
+
+    converted = convert_legacy_state(str(tmp_path / "state.npz"), str(tmp_path / "converted"))
+    state, _ = converted.load()
+    assert state["hotkeys"] == ["a", "b", "c"]
+    assert np.array_equal(state["scores"], scores)
@@ -1,6 +1,7 @@
 from unittest.mock import AsyncMock, Mock, patch
 import pytest
 from conversationgenome.task_bundle.SurveyTaggingTaskBundle import SurveyMetadata, SurveyTaggingTaskBundle
+from conversationgenome.llm.LlmLib import LlmLib
 from tests.mocks.DummyData import DummyData
 
 
@@ -33,8 +34,8 @@ async def test_setup_calls_generate_metadata():
 async def test_generate_metadata_parses_json_and_sets_metadata():
     bundle = DummyData.survey_tagging_task_bundle()
     with patch('conversationgenome.task_bundle.SurveyTaggingTaskBundle.get_llm_backend') as mock_llm_factory:
-        mock_llm = Mock()
-        mock_llm.get_vector_embeddings_set.return_value = {"tag1": {"vectors": [0.1]}}
+        mock_llm = Mock(spec=LlmLib)
+        mock_llm.aget_vector_embeddings_set.return_value = {"tag1": {"vectors": [0.1]}}
         mock_llm_factory.return_value = mock_llm
         
         await bundle._generate_metadata()
@@ -69,9 +70,9 @@ async def test_format_results_validates_and_embeds_tags():
     bundle = DummyData.setup_survey_tagging_task_bundle()
     miner_result = {"tags": ["tag1", "tag2"]}
     with patch('conversationgenome.task_bundle.SurveyTaggingTaskBundle.get_llm_backend') as mock_llm_factory:
-        mock_llm = Mock()
-        mock_llm.validate_tag_set.return_value = ["tag1", "tag2"]
-        mock_llm.get_vector_embeddings_set.return_value = {"tag1": [0.1], "tag2": [0.2]}
+        mock_llm = Mock(spec=LlmLib)
+        mock_llm.avalidate_tag_set.return_value = ["tag1", "tag2"]
+        mock_llm.aget_vector_embeddings_set.return_value = {"tag1": [0.1], "tag2": [0.2]}
         mock_llm_factory.return_value = mock_llm
         result = await bundle.format_results(miner_result)
     assert result["original_tags"] == ["tag1", "tag2"]
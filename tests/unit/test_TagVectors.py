@@ -0,0 +1,96 @@
+import base64
+import json
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from conversationgenome.api.models.conversation_metadata import ConversationMetadata
+from conversationgenome.api.models.raw_metadata import RawMetadata
+from conversationgenome.api.models.tag_vectors import PackedTagVectors
+from conversationgenome.api.models.tag_vectors import pack_tag_vectors
+from conversationgenome.api.models.tag_vectors import pack_vector_fields
+
+
+def _vectors(count=3, dimensions=8):
+    rng = np.random.default_rng(0)
+    return {f"tag{i}": {"vectors": rng.normal(size=dimensions).tolist()} for i in range(count)}
+
+
+def test_plain_vectors_still_validate_and_dump_as_lists():
+    vectors = _vectors()
+    metadata = ConversationMetadata(tags=list(vectors), vectors=vectors)
+
+    assert metadata.vectors == vectors
+    assert metadata.model_dump()["vectors"] == vectors
+
+
+def test_packed_payload_round_trips_through_the_model():
+    vectors = _vectors()
+    payload = ConversationMetadata(tags=list(vectors), vectors=vectors).model_dump(context={"vector_encoding": "float32"})
+    assert payload["vectors"]["encoding"] == "packed"
+
+    metadata = ConversationMetadata(**json.loads(json.dumps(payload)))
+
+    assert isinstance(metadata.vectors, PackedTagVectors)
+    assert list(metadata.vectors) == list(vectors)
+    assert "tag1" in metadata.vectors
+    assert np.allclose(metadata.vectors["tag1"]["vectors"], vectors["tag1"]["vectors"], atol=1e-6)
+    assert np.allclose(metadata.model_dump()["vectors"]["tag2"]["vectors"], vectors["tag2"]["vectors"], atol=1e-6)
+
+
+def test_packed_vectors_decode_lazily():
+    vectors = _vectors()
+    packed = PackedTagVectors.from_payload(pack_tag_vectors(vectors, dtype="float16"))
+
+    assert packed._matrix is None
+    assert len(packed) == 3
+    row = packed["tag0"]["vectors"]
+
+    assert packed._matrix is not None
+    assert row.dtype == np.float32
+    assert np.allclose(row, vectors["tag0"]["vectors"], atol=1e-2)
+
+
+def test_raw_bytes_payload():
+    vectors = _vectors()
+    payload = pack_tag_vectors(vectors, as_bytes=True)
+
+    assert isinstance(payload["data"], bytes)
+    assert len(payload["data"]) == 3 * 8 * 4
+    assert PackedTagVectors.from_payload(payload) == PackedTagVectors.from_vector_dict(vectors)
+
+
+def test_packed_payload_with_the_wrong_byte_length_is_rejected():
+    vectors = _vectors()
+    payload = pack_tag_vectors(vectors, dtype="float16")
+    truncated = dict(payload, data=base64.b64encode(base64.b64decode(payload["data"])[:-2]).decode("ascii"))
+
+    with pytest.raises(ValidationError, match="expected 48"):
+        ConversationMetadata(tags=list(vectors), vectors=truncated)
+    with pytest.raises(ValueError, match="expected 96"):
+        PackedTagVectors.from_payload(dict(payload, dimensions=16))
+    with pytest.raises(ValueError, match="not valid base64"):
+        PackedTagVectors.from_payload(dict(payload, data="not base64!"))
+    with pytest.raises(ValueError, match="expected 96"):
+        PackedTagVectors(list(vectors), 8, data=base64.b64encode(b"\x00" * 95)).matrix
+
+
+def test_raw_metadata_accepts_packed_and_missing_vectors():
+    vectors = _vectors()
+
+    assert isinstance(RawMetadata(tags=[], success=True, vectors=pack_tag_vectors(vectors)).vectors, PackedTagVectors)
+    assert RawMetadata(tags=[], success=True, vectors=None).vectors is None
+
+
+def test_pack_vector_fields_packs_nested_vector_dicts_only():
+    vectors = _vectors()
+    data = {"result": {"tags": list(vectors), "vectors": vectors}, "task": {"vectors": {}}, "other": [{"vectors": [1, 2]}]}
+
+    packed = pack_vector_fields(data, dtype="float16")
+
+    assert packed["result"]["vectors"]["encoding"] == "packed"
+    assert packed["result"]["vectors"]["dtype"] == "float16"
+    assert packed["task"]["vectors"] == {}
+    assert packed["other"] == [{"vectors": [1, 2]}]
+    assert data["result"]["vectors"] is vectors
@@ -82,3 +82,73 @@ async def test_mask_task_for_miner_masks_sensitive_fields(monkeypatch):
     assert task.guid == "real-task-guid"
     assert task.bundle_guid == bundle.guid
     assert task.input.guid == "real-task-guid"
+
+
+@pytest.mark.asyncio
+async def test_gather_llm_calls_runs_concurrently_under_the_shared_limit(monkeypatch):
+    import asyncio
+
+    import conversationgenome.task_bundle.TaskBundle as task_bundle_module
+
+    monkeypatch.setattr(task_bundle_module.c, "get", lambda section, key, default=None: 2 if key == "setup_llm_concurrency" else default)
+    bundle = DummyData.conversation_tagging_task_bundle()
+    running = 0
+    max_running = 0
+
+    async def call(value):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return value
+
+    results = await bundle._gather_llm_calls([call(i) for i in range(5)])
+
+    assert results == [0, 1, 2, 3, 4]
+    assert max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_gather_llm_calls_cancels_remaining_calls_on_error():
+    import asyncio
+
+    bundle = DummyData.conversation_tagging_task_bundle()
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def failing():
+        raise ValueError("LLM error")
+
+    with pytest.raises(ValueError):
+        await bundle._gather_llm_calls([slow(), failing()])
+
+    assert cancelled == [True]
+
+
+def test_semantic_neighborhood_is_cached_until_metadata_changes():
+    import numpy as np
+
+    from conversationgenome.api.models.conversation_metadata import ConversationMetadata
+
+    bundle = DummyData.setup_conversation_tagging_task_bundle()
+    expected = np.mean([val["vectors"] for val in bundle.input.metadata.vectors.values()], axis=0)
+
+    neighborhood, norm = bundle.get_semantic_neighborhood()
+
+    assert neighborhood.dtype == np.float32
+    assert np.allclose(neighborhood, expected, atol=1e-6)
+    assert norm == pytest.approx(np.linalg.norm(expected), rel=1e-5)
+    assert bundle.get_semantic_neighborhood()[0] is neighborhood
+
+    bundle.input.metadata = ConversationMetadata(tags=["a", "b"], vectors={"a": {"vectors": [1.0, 0.0]}, "b": {"vectors": [0.0, 1.0]}})
+    new_neighborhood, new_norm = bundle.get_semantic_neighborhood()
+
+    assert new_neighborhood.tolist() == [0.5, 0.5]
+    assert new_norm == pytest.approx(np.sqrt(0.5))
@@ -6,6 +6,7 @@ import pytest
 
 from conversationgenome.task_bundle.TaskBundle import TaskBundle
 from conversationgenome.task_bundle.TaskBundleLib import TaskBundleLib
+from conversationgenome.llm.LlmLib import LlmLib
 from tests.mocks.DummyData import DummyData
 
 hotkey = "hotkey123"
@@ -15,26 +16,24 @@ override_env_variables = {"SYSTEM_MODE": "prod", "CGP_API_READ_HOST": "https://f
 
 
 @pytest.mark.asyncio
-@patch("conversationgenome.api.ApiLib.requests.post")
 @patch("conversationgenome.api.ApiLib.c.get")
-async def test_when_getting_task_bundle_then_max_lines_is_respected(mock_config_get, mock_requests_post):
-    mock_llm_instance = MagicMock()
-    mock_llm_instance.conversation_to_metadata = Mock(return_value=None)
-    mock_llm_instance.validate_conversation_quality = Mock(return_value = DummyData.conversation_quality_metadata_high())
+async def test_when_getting_task_bundle_then_max_lines_is_respected(mock_config_get, cgp_api_server):
+    mock_llm_instance = MagicMock(spec=LlmLib)
+    mock_llm_instance.aconversation_to_metadata = AsyncMock(return_value=None)
+    mock_llm_instance.avalidate_conversation_quality = AsyncMock(return_value = DummyData.conversation_quality_metadata_high())
     with patch("conversationgenome.task_bundle.ConversationTaggingTaskBundle.get_llm_backend", return_value=mock_llm_instance):
         MAX_CONVO_LINES = 1
 
         def config_side_effect(section, key, default=None):
-            overrides = override_env_variables
+            overrides = dict(override_env_variables)
             overrides["MAX_CONVO_LINES"] = MAX_CONVO_LINES
+            overrides["CGP_API_READ_HOST"] = cgp_api_server.host
+            overrides["CGP_API_READ_PORT"] = cgp_api_server.port
             return overrides.get(key, default)
 
         mock_config_get.side_effect = config_side_effect
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = DummyData.conversation_tagging_task_bundle_json()
-        mock_requests_post.return_value = mock_response
+        cgp_api_server.respond("POST", "/api/v1/conversation/reserve", body=DummyData.conversation_tagging_task_bundle_json())
 
         tbl = TaskBundleLib()
         task_bundle: TaskBundle = await tbl.get_task_bundle(hotkey=hotkey, api_key=api_key)
@@ -0,0 +1,119 @@
+import asyncio
+from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
+
+import pytest
+
+from conversationgenome.validator.TaskBundleQueue import TaskBundleQueue
+
+
+def _bundle(ready=True):
+    bundle = MagicMock()
+    bundle.is_ready.return_value = ready
+    return bundle
+
+
+@pytest.mark.asyncio
+async def test_queue_fills_up_to_depth():
+    reserve = AsyncMock(side_effect=lambda: _bundle())
+    queue = TaskBundleQueue(reserve, depth=3, workers=2)
+    queue.start()
+    await asyncio.sleep(0.01)
+
+    assert queue.size() == 3
+    assert reserve.await_count == 3
+
+    assert await queue.get() is not None
+    await asyncio.sleep(0.01)
+
+    assert queue.size() == 3
+    assert queue.stats()["served"] == 1
+    assert queue.stats()["starved"] == 0
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_queue_skips_bundles_that_are_not_ready():
+    bundles = [_bundle(ready=False), _bundle()]
+    reserve = AsyncMock(side_effect=lambda: bundles.pop(0) if bundles else _bundle())
+    queue = TaskBundleQueue(reserve, depth=1, workers=1, retry_delay=0.01)
+
+    task_bundle = await queue.get(timeout=1)
+
+    assert task_bundle.is_ready()
+    assert queue.stats()["not_ready"] == 1
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_worker_survives_errors_and_waits_before_retrying_bundles_that_are_not_ready():
+    broken = _bundle()
+    broken.is_ready.side_effect = ValueError("bad bundle")
+    bundles = [broken]
+    reserve = AsyncMock(side_effect=lambda: bundles.pop(0) if bundles else _bundle(ready=False))
+    queue = TaskBundleQueue(reserve, depth=1, workers=1, retry_delay=0.05)
+    queue.start()
+
+    await asyncio.sleep(0.12)
+
+    assert queue.is_running()
+    # The error and each bundle that was not ready wait retry_delay instead of reserving again right away
+    assert 2 <= reserve.await_count <= 4
+    assert queue.stats()["not_ready"] >= 1
+    await queue.stop()
+    assert not queue.is_running()
+
+
+@pytest.mark.asyncio
+async def test_queue_drops_expired_bundles():
+    reserve = AsyncMock(side_effect=lambda: _bundle())
+    queue = TaskBundleQueue(reserve, depth=2, ttl=0.05, workers=1)
+    queue.start()
+    await asyncio.sleep(0.01)
+    assert queue.size() == 2
+
+    await asyncio.sleep(0.1)
+    assert await queue.get(timeout=1) is not None
+
+    assert queue.stats()["expired"] == 2
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_queue_records_starvation_and_gives_up_after_timeout():
+    async def reserve():
+        return None
+
+    queue = TaskBundleQueue(reserve, depth=1, workers=1, retry_delay=0.01)
+
+    assert await queue.get(timeout=0.05) is None
+
+    stats = queue.stats()
+    assert stats["starved"] == 1
+    assert stats["starved_seconds"] > 0
+    assert stats["failed"] >= 1
+    await queue.stop()
+
+
+def test_validator_stops_the_queue_workers_on_exit():
+    from neurons.validator import Validator
+
+    loop = asyncio.new_event_loop()
+    try:
+        reserve = AsyncMock(side_effect=lambda: _bundle(ready=False))
+        queue = TaskBundleQueue(reserve, depth=1, workers=2, retry_delay=0.01)
+
+        async def start():
+            queue.start()
+
+        loop.run_until_complete(start())
+        v = Validator.__new__(Validator)
+        v.loop = loop
+        v.task_bundle_queue = queue
+
+        v.stop_task_bundle_queue()
+
+        assert not queue.is_running()
+        assert v.task_bundle_queue is None
+    finally:
+        loop.close()
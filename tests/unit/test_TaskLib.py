@@ -22,6 +22,7 @@ async def test_put_task_basic(mock_c, mock_ApiLib):
         ("system", "scoring_version"): "v1",
         ("system", "netuid"): 42,
         ("env", "OPENAI_EMBEDDINGS_MODEL_OVERRIDE"): None,
+        ("env", "VECTOR_ENCODING"): None,
         ("llm", "type"): "openai",
         ("llm", "embeddings_model"): "text-embedding-3-large",
     }[(section, key)]
@@ -71,6 +72,7 @@ async def test_put_task_with_overrides(mock_c, mock_ApiLib):
         ("system", "scoring_version"): "v2",
         ("system", "netuid"): 99,
         ("env", "OPENAI_EMBEDDINGS_MODEL_OVERRIDE"): "custom-embedder",
+        ("env", "VECTOR_ENCODING"): None,
         ("llm", "type"): "openai",
         ("llm", "embeddings_model"): "text-embedding-3-large",
     }[(section, key)]
@@ -97,3 +99,55 @@ async def test_put_task_with_overrides(mock_c, mock_ApiLib):
     assert output["llm_type"] == "anthropic"
     assert output["cgp_version"] == "2.0.0"
     assert output["data"] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+@patch("conversationgenome.task.TaskLib.ApiLib")
+@patch("conversationgenome.task.TaskLib.c")
+async def test_put_task_packs_vectors_when_vector_encoding_is_set(mock_c, mock_ApiLib):
+    mock_c.get.side_effect = lambda section, key, default=None: {
+        ("env", "VECTOR_ENCODING"): "float16",
+        ("llm", "type"): "openai",
+    }.get((section, key), default)
+
+    mock_api_instance = MagicMock()
+    mock_api_instance.put_task_data = AsyncMock(return_value=True)
+    mock_ApiLib.return_value = mock_api_instance
+
+    await TaskLib().put_task(
+        hotkey="hk1",
+        task_bundle_id="tbid1",
+        task_id="tid1",
+        neuron_type="miner",
+        batch_number=1,
+        data={"result": {"tags": ["a", "b"], "vectors": {"a": {"vectors": [0.5, 1.0]}, "b": {"vectors": [1.0, 0.0]}}}},
+    )
+
+    output = mock_api_instance.put_task_data.call_args[0][1]
+    vectors = output["data"]["result"]["vectors"]
+    assert vectors["encoding"] == "packed"
+    assert vectors["dtype"] == "float16"
+    assert vectors["tags"] == ["a", "b"]
+
+
+@pytest.mark.asyncio
+@patch("conversationgenome.task.TaskLib.get_task_upload_queue")
+@patch("conversationgenome.task.TaskLib.ApiLib")
+async def test_put_task_hands_records_to_the_upload_queue_when_enabled(mock_ApiLib, mock_get_queue):
+    upload_queue = MagicMock()
+    mock_get_queue.return_value = upload_queue
+
+    result = await TaskLib().put_task(
+        hotkey="hk1",
+        task_bundle_id="tbid1",
+        task_id="tid1",
+        neuron_type="miner",
+        batch_number=1,
+        data={"foo": "bar"},
+    )
+
+    assert result is True
+    upload_queue.enqueue.assert_called_once()
+    assert upload_queue.enqueue.call_args[0][0] == "tbid1"
+    assert upload_queue.enqueue.call_args[0][1]["data"] == {"foo": "bar"}
+    mock_ApiLib.assert_not_called()
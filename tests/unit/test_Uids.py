@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from conversationgenome.utils.uids import check_uid_availability
+from conversationgenome.utils.uids import get_random_uids
+from conversationgenome.utils.uids import get_uid_availability
+
+
+def _neuron(serving, permit, stake, vpermit_tao_limit=1024):
+    metagraph = SimpleNamespace(
+        n=np.int64(len(serving)),
+        axons=[SimpleNamespace(is_serving=is_serving) for is_serving in serving],
+        validator_permit=np.array(permit),
+        S=np.array(stake, dtype=np.float32),
+    )
+    return SimpleNamespace(metagraph=metagraph, config=SimpleNamespace(neuron=SimpleNamespace(vpermit_tao_limit=vpermit_tao_limit)))
+
+
+def test_uid_availability_matches_per_uid_check():
+    rng = np.random.default_rng(3)
+    neuron = _neuron(rng.random(200) > 0.2, rng.random(200) > 0.7, rng.random(200) * 2048)
+
+    mask = get_uid_availability(neuron.metagraph, 1024)
+
+    assert mask.tolist() == [check_uid_availability(neuron.metagraph, uid, 1024) for uid in range(200)]
+
+
+def test_random_uids_are_distinct_available_and_cached_per_sync():
+    neuron = _neuron([True, False, True, True, True, True], [False, False, True, True, False, False], [0, 0, 10, 5000, 0, 0])
+
+    uids = get_random_uids(neuron, k=10)
+
+    assert sorted(uids.tolist()) == [0, 2, 4, 5]
+    # Availability is not recomputed until the cache is cleared by a metagraph sync
+    neuron.metagraph.axons[1].is_serving = True
+    assert 1 not in get_random_uids(neuron, k=10).tolist()
+    neuron.available_uids_cache = None
+    assert 1 in get_random_uids(neuron, k=10).tolist()
+
+
+def test_random_uids_prefer_uids_not_queried_this_step():
+    neuron = _neuron([True] * 8, [False] * 8, [0] * 8)
+
+    uids = get_random_uids(neuron, k=3, exclude={0, 1, 2, 3, 4})
+    assert sorted(uids.tolist()) == [5, 6, 7]
+
+    # Not enough uids left, excluded ones fill the rest without duplicates
+    uids = get_random_uids(neuron, k=4, exclude={0, 1, 2, 3, 4, 5})
+    assert len(set(uids.tolist())) == 4
+    assert {6, 7} <= set(uids.tolist())
@@ -0,0 +1,77 @@
+import json
+from unittest.mock import patch
+
+from conversationgenome.api.UploadQueue import TaskUploadQueue
+
+
+def test_records_upload_in_background_and_flush_waits_for_them(tmp_path):
+    upload_queue = TaskUploadQueue(journal_path=str(tmp_path / "journal.jsonl"))
+
+    with patch("conversationgenome.api.UploadQueue.ApiLib.send_task_data", return_value=200) as mock_send:
+        upload_queue.enqueue("bundle-1", {"task_id": 1})
+        upload_queue.enqueue("bundle-2", {"task_id": 2})
+        assert upload_queue.flush(timeout=5) is True
+
+    assert [call.args[:2] for call in mock_send.call_args_list] == [("bundle-1", {"task_id": 1}), ("bundle-2", {"task_id": 2})]
+    assert upload_queue.stats()["sent"] == 2
+
+
+def test_failed_uploads_are_retried_with_backoff(tmp_path):
+    upload_queue = TaskUploadQueue(journal_path=str(tmp_path / "journal.jsonl"), backoff=0.01)
+
+    with patch("conversationgenome.api.UploadQueue.ApiLib.send_task_data", side_effect=[None, 503, 201]) as mock_send:
+        upload_queue.enqueue("bundle-1", {"task_id": 1})
+        assert upload_queue.flush(timeout=5) is True
+
+    assert mock_send.call_count == 3
+    assert upload_queue.stats()["retries"] == 2
+    assert upload_queue.stats()["sent"] == 1
+
+
+def test_client_errors_are_not_retried(tmp_path):
+    upload_queue = TaskUploadQueue(journal_path=str(tmp_path / "journal.jsonl"), backoff=0.01)
+
+    with patch("conversationgenome.api.UploadQueue.ApiLib.send_task_data", return_value=400) as mock_send:
+        upload_queue.enqueue("bundle-1", {"task_id": 1})
+        upload_queue.flush(timeout=5)
+
+    assert mock_send.call_count == 1
+    assert upload_queue.stats()["failed"] == 1
+
+
+def test_full_queue_spills_to_journal_and_replays(tmp_path):
+    journal_path = tmp_path / "journal.jsonl"
+    upload_queue = TaskUploadQueue(journal_path=str(journal_path), max_size=1)
+    # Keep the worker from draining the queue while it fills up
+    upload_queue.start = lambda: None
+
+    upload_queue.enqueue("bundle-1", {"task_id": 1})
+    upload_queue.enqueue("bundle-2", {"task_id": 2})
+
+    assert upload_queue.stats()["spilled"] == 1
+    assert json.loads(journal_path.read_text().strip()) == {"id": "bundle-2", "data": {"task_id": 2}}
+
+    del upload_queue.start
+    with patch("conversationgenome.api.UploadQueue.ApiLib.send_task_data", return_value=200) as mock_send:
+        upload_queue.start()
+        assert upload_queue.flush(timeout=5) is True
+
+    assert sorted(call.args[0] for call in mock_send.call_args_list) == ["bundle-1", "bundle-2"]
+    assert journal_path.read_text() == ""
+
+
+def test_batch_path_sends_several_records_per_request(tmp_path):
+    upload_queue = TaskUploadQueue(journal_path=str(tmp_path / "journal.jsonl"), batch_path="/api/v1/conversation/records", batch_size=10, compress=True)
+    upload_queue.start = lambda: None
+    for idx in range(3):
+        upload_queue.enqueue(f"bundle-{idx}", {"task_id": idx})
+
+    del upload_queue.start
+    with patch("conversationgenome.api.UploadQueue.ApiLib.send_task_data", return_value=200) as mock_send:
+        upload_queue.start()
+        assert upload_queue.flush(timeout=5) is True
+
+    mock_send.assert_called_once()
+    args, kwargs = mock_send.call_args
+    assert [record["id"] for record in args[1]] == ["bundle-0", "bundle-1", "bundle-2"]
+    assert kwargs == {"compress": True, "path": "/api/v1/conversation/records"}
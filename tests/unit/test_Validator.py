@@ -4,6 +4,7 @@ from unittest.mock import patch
 
 import pytest
 
+from tests.mocks.DummyData import DummyData
 from tests.mocks.MockTaskBundle import MockTaskBundle
 
 
@@ -213,7 +214,7 @@ async def test_forward_retries_on_status_code(bare_validator, fake_libs, monkeyp
     validator.metagraph.hotkeys = ["hk"]
     validator.update_scores = MagicMock()
 
-    monkeypatch.setattr("conversationgenome.utils.uids.get_random_uids", lambda self, k: [0, 1, 2])
+    monkeypatch.setattr("conversationgenome.utils.uids.get_random_uids", lambda self, k, exclude=None: [0, 1, 2])
     validator.metagraph.axons = [MagicMock(hotkey="hk") for _ in range(3)]
 
     result = await validator.forward(test_mode=True)
@@ -278,3 +279,145 @@ def test_get_burn_uid(bare_validator):
     assert uid == expected_uid
     v.subtensor.query_subtensor.assert_called_once_with("SubnetOwnerHotkey", params=[v.config.netuid])
     v.subtensor.get_uid_for_hotkey_on_subnet.assert_called_once_with(hotkey_ss58=expected_hotkey, netuid=v.config.netuid)
+
+
+class _ProcessingResponse:
+    def __init__(self, hotkey, tags):
+        self.dendrite = MagicMock()
+        self.dendrite.status_code = 200
+        self.axon = MagicMock()
+        self.axon.hotkey = hotkey
+        self.cgp_output = [{"tags": tags}]
+
+
+def _processing_bundle(format_results):
+    bundle = MockTaskBundle(num_tasks=1)
+    bundle.format_results = AsyncMock(side_effect=format_results)
+    bundle.generate_result_logs = MagicMock(return_value="result_logs")
+    return bundle
+
+
+@pytest.mark.asyncio
+async def test_process_miner_responses_runs_concurrently_and_keeps_order(bare_validator, fake_libs, config_override):
+    import asyncio
+
+    config_override({("validator", "response_concurrency"): 3})
+    running = 0
+    max_running = 0
+
+    async def format_results(result):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        result["formatted"] = True
+        return result
+
+    bundle = _processing_bundle(format_results)
+    task = MagicMock(bundle_guid="bundle_guid", guid="task_guid")
+    responses = [_ProcessingResponse(f"hk{i}", [f"tag{i}"]) for i in range(3)]
+
+    await bare_validator.process_miner_responses(fake_libs["vl"], bundle, task, responses, batch_number=1)
+
+    assert max_running == 3
+    assert [response.cgp_output[0]["tags"] for response in responses] == [["tag0"], ["tag1"], ["tag2"]]
+    assert all(response.cgp_output[0]["formatted"] for response in responses)
+    assert fake_libs["vl"].calls["put_task"] == 3
+
+
+@pytest.mark.asyncio
+async def test_process_miner_responses_discards_late_responses(bare_validator, fake_libs, config_override):
+    import asyncio
+
+    config_override({("validator", "response_deadline"): 0.05})
+
+    async def format_results(result):
+        if result["tags"] == ["slow"]:
+            await asyncio.sleep(10)
+        return result
+
+    bundle = _processing_bundle(format_results)
+    task = MagicMock(bundle_guid="bundle_guid", guid="task_guid")
+    responses = [_ProcessingResponse("hk0", ["fast"]), _ProcessingResponse("hk1", ["slow"])]
+
+    await bare_validator.process_miner_responses(fake_libs["vl"], bundle, task, responses, batch_number=1)
+
+    assert responses[0].cgp_output == [{"tags": ["fast"]}]
+    assert responses[1].cgp_output is None
+    assert fake_libs["vl"].calls["put_task"] == 1
+
+
+@pytest.mark.asyncio
+async def test_process_miner_responses_isolates_failures(bare_validator, fake_libs):
+    async def format_results(result):
+        if result["tags"] == ["broken"]:
+            raise ValueError("bad result")
+        return result
+
+    bundle = _processing_bundle(format_results)
+    task = MagicMock(bundle_guid="bundle_guid", guid="task_guid")
+    responses = [_ProcessingResponse("hk0", ["broken"]), _ProcessingResponse("hk1", ["fine"])]
+
+    await bare_validator.process_miner_responses(fake_libs["vl"], bundle, task, responses, batch_number=1)
+
+    assert responses[0].cgp_output is None
+    assert responses[1].cgp_output == [{"tags": ["fine"]}]
+    assert fake_libs["vl"].calls["put_task"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_task_bundle_uses_prefetch_queue_when_enabled(bare_validator, fake_libs, config_override, monkeypatch):
+    import neurons.validator as validator_module
+
+    config_override({("validator", "task_bundle_queue_depth"): 2})
+    bundle = MockTaskBundle(num_tasks=1)
+    queue_vl = MagicMock()
+    queue_vl.reserve_task_bundle = AsyncMock(return_value=bundle)
+    monkeypatch.setattr(validator_module, "ValidatorLib", lambda: queue_vl)
+    inline_vl = MagicMock()
+    inline_vl.reserve_task_bundle = AsyncMock()
+    bare_validator.task_bundle_queue = None
+
+    task_bundle = await bare_validator.get_task_bundle(inline_vl)
+
+    assert task_bundle is bundle
+    inline_vl.reserve_task_bundle.assert_not_awaited()
+    assert bare_validator.task_bundle_queue.stats()["served"] == 1
+    await bare_validator.task_bundle_queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_process_miner_responses_formats_each_distinct_tag_set_once(bare_validator, fake_libs, monkeypatch):
+    monkeypatch.setenv("LLM_TYPE_OVERRIDE", "local_stub")
+    monkeypatch.setenv("LOCAL_STUB_EMBEDDING_DIMENSIONS", "8")
+    bundle = DummyData.setup_conversation_tagging_task_bundle()
+    format_results = type(bundle).format_results
+    formatted = []
+
+    async def counting_format_results(self, result):
+        formatted.append(list(result["tags"]))
+        return await format_results(self, result)
+
+    monkeypatch.setattr(type(bundle), "format_results", counting_format_results)
+    task = MagicMock(bundle_guid="bundle_guid", guid="task_guid")
+    responses = [
+        _ProcessingResponse("hk0", ["music", "travel", "food"]),
+        # Tag validation only keeps exact matches, so different case or whitespace is a different result
+        _ProcessingResponse("hk1", ["Music", "Travel", "food "]),
+        _ProcessingResponse("hk2", ["cooking"]),
+        _ProcessingResponse("hk3", ["travel", "food", "music"]),
+    ]
+
+    grouping = await bare_validator.process_miner_responses(fake_libs["vl"], bundle, task, responses, batch_number=1)
+
+    assert formatted == [["music", "travel", "food"], ["Music", "Travel", "food "], ["cooking"]]
+    assert grouping == {"responses": 4, "groups": 3, "grouping_ratio": 0.25}
+    assert sorted(responses[0].cgp_output[0]["tags"]) == ["food", "music", "travel"]
+    assert responses[1].cgp_output[0]["tags"] == []
+    assert responses[1].cgp_output[0]["original_tags"] == ["Music", "Travel", "food "]
+    assert responses[3].cgp_output[0]["tags"] == responses[0].cgp_output[0]["tags"]
+    assert responses[3].cgp_output[0]["vectors"] is responses[0].cgp_output[0]["vectors"]
+    # Each miner keeps what it submitted
+    assert responses[3].cgp_output[0]["original_tags"] == ["travel", "food", "music"]
+    assert fake_libs["vl"].calls["put_task"] == 4
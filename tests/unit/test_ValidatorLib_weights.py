@@ -113,3 +113,41 @@ def test_get_raw_weights_distribution_with_smaller_burn():
 
     # The burn burn_uid should receive the highest weight
     assert weights[burn_uid] == pytest.approx(np.max(weights))
+
+
+@pytest.mark.parametrize("burn_uid, burn_rate", [(None, 0.0), (7, 0.9), (0, 0.5)])
+def test_get_raw_weights_matches_per_uid_cubic_curve(burn_uid, burn_rate):
+    vl = ValidatorLib()
+    rng = np.random.default_rng(1)
+    scores = rng.random(256)
+    scores[rng.choice(256, size=40, replace=False)] = 0.0
+
+    weights = vl.get_raw_weights(scores, burn_uid=burn_uid, burn_rate=burn_rate)
+
+    # Same math as the original per-UID loop
+    ordered = [uid for uid in np.argsort(scores)[::-1] if scores[uid] != 0 and uid != burn_uid]
+    expected = np.zeros_like(scores)
+    for i, uid in enumerate(ordered):
+        expected[uid] = vl.transposed_cubic_distribution(i, len(ordered))
+    expected = expected * ((1.0 - burn_rate) / float(np.sum(np.abs(expected))))
+    if burn_uid is None:
+        expected = expected / float(np.sum(np.abs(expected)))
+    else:
+        expected[burn_uid] = burn_rate
+
+    assert np.array_equal(weights, expected)
+
+
+def test_get_raw_weights_breaks_ties_randomly():
+    vl = ValidatorLib()
+    scores = np.array([0.5, 0.5, 0.5, 0.1, 0.0])
+
+    orders = set()
+    for _ in range(50):
+        weights = vl.get_raw_weights(scores)
+        assert weights[3] < weights[:3].min()
+        assert weights[4] == 0.0
+        assert sorted(weights[:3]) == sorted(vl.get_raw_weights(scores)[:3])
+        orders.add(tuple(np.argsort(weights[:3])))
+
+    assert len(orders) > 1
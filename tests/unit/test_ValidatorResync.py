@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from conversationgenome.base.validator import BaseValidatorNeuron
+
+
+class _ResyncValidator(BaseValidatorNeuron):
+    async def forward(self):
+        pass
+
+
+class _Metagraph:
+    def __init__(self, hotkeys):
+        self.syncs = []
+        self._set(hotkeys)
+
+    def _set(self, hotkeys):
+        self.hotkeys = list(hotkeys)
+        self.axons = [SimpleNamespace(ip="1.2.3.4", port=8091 + uid, hotkey=hotkey) for uid, hotkey in enumerate(hotkeys)]
+        self.n = len(hotkeys)
+
+    def sync(self, subtensor=None):
+        if self.syncs:
+            self._set(self.syncs.pop(0))
+
+
+def _validator(hotkeys):
+    v = _ResyncValidator.__new__(_ResyncValidator)
+    v.subtensor = None
+    v.metagraph = _Metagraph(hotkeys)
+    v.hotkeys = list(hotkeys)
+    v.scores = np.arange(1, len(hotkeys) + 1, dtype=np.float32)
+    v.ema_scores = np.arange(1, len(hotkeys) + 1, dtype=np.float64) / 10
+    v.state_snapshot_needed = False
+    return v
+
+
+def test_resync_without_metagraph_changes_keeps_state():
+    v = _validator(["a", "b", "c"])
+    scores = v.scores
+
+    v.resync_metagraph()
+
+    assert v.scores is scores
+    assert v.state_snapshot_needed is False
+    assert v.metagraph_fingerprint == v.get_metagraph_fingerprint()
+
+
+def test_resync_zeroes_replaced_hotkeys_and_pads_new_uids():
+    v = _validator(["a", "b", "c"])
+    v.metagraph.syncs.append(["a", "x", "c", "d", "e"])
+
+    v.resync_metagraph()
+
+    assert v.hotkeys == ["a", "x", "c", "d", "e"]
+    assert v.scores.dtype == np.float32
+    assert np.array_equal(v.scores, [1, 0, 3, 0, 0])
+    # EMA history of the miners that stayed is kept
+    assert np.allclose(v.ema_scores, [0.1, 0, 0.3, 0, 0])
+    assert v.state_snapshot_needed is True
+
+
+def test_resync_detects_axon_changes_with_the_same_hotkeys():
+    v = _validator(["a", "b"])
+    v.resync_metagraph()
+    fingerprint = v.metagraph_fingerprint
+
+    v.metagraph.axons[1].port = 9000
+    v.resync_metagraph()
+
+    assert v.metagraph_fingerprint != fingerprint
+    assert v.state_snapshot_needed is True
+    assert np.array_equal(v.scores, [1, 2])
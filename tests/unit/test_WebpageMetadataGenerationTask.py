@@ -5,6 +5,7 @@ import pytest
 
 from conversationgenome.prompt_chain.PromptChainStep import PromptChainStep
 from conversationgenome.task.WebpageMetadataGenerationTask import WebpageMetadataGenerationTask, WebpageMarkdownTaskInput, WebpageMarkdownTaskInputData
+from conversationgenome.llm.LlmLib import LlmLib
 from tests.mocks.DummyData import DummyData
 
 
@@ -41,23 +42,23 @@ async def test_mine_returns_expected_tags_and_vectors():
     )
 
     # Mock the LLM backend
-    mock_llml = MagicMock()
+    mock_llml = MagicMock(spec=LlmLib)
     
     # Mock website_to_metadata for main content
     website_result = Mock()
     website_result.tags = ["webpage", "content"]
-    mock_llml.website_to_metadata = Mock(return_value=website_result)
+    mock_llml.awebsite_to_metadata = AsyncMock(return_value=website_result)
     
     # Mock enrichment_to_metadata for enrichment content
     enrichment_result = Mock()
     enrichment_result.tags = ["enrichment", "metadata"]
-    mock_llml.enrichment_to_metadata = Mock(return_value=enrichment_result)
+    mock_llml.aenrichment_to_metadata = AsyncMock(return_value=enrichment_result)
     
     # Mock combine_metadata_tags
     combined_result = Mock()
     combined_result.tags = ["webpage", "content", "enrichment", "metadata"]
     combined_result.vectors = {"webpage": [0.1, 0.2], "content": [0.3, 0.4], "enrichment": [0.5, 0.6], "metadata": [0.7, 0.8]}
-    mock_llml.combine_metadata_tags = Mock(return_value=combined_result)
+    mock_llml.acombine_metadata_tags = AsyncMock(return_value=combined_result)
 
     with patch("conversationgenome.task.WebpageMetadataGenerationTask.get_llm_backend", return_value=mock_llml):
         result = await task.mine()
@@ -66,13 +67,13 @@ async def test_mine_returns_expected_tags_and_vectors():
         assert result["vectors"] == {"webpage": [0.1, 0.2], "content": [0.3, 0.4], "enrichment": [0.5, 0.6], "metadata": [0.7, 0.8]}
         
         # Verify website_to_metadata was called for main content
-        mock_llml.website_to_metadata.assert_called_once_with("This is webpage content.", generateEmbeddings=False, input_categories=None)
+        mock_llml.awebsite_to_metadata.assert_called_once_with("This is webpage content.", generateEmbeddings=False, input_categories=None)
         
         # Verify enrichment_to_metadata was called for enrichment content
-        mock_llml.enrichment_to_metadata.assert_called_once_with("Enrichment content here.", generateEmbeddings=False, input_categories=None)
+        mock_llml.aenrichment_to_metadata.assert_called_once_with("Enrichment content here.", generateEmbeddings=False, input_categories=None)
         
         # Verify combine_metadata_tags was called with both tag sets
-        mock_llml.combine_metadata_tags.assert_called_once_with([["webpage", "content"], ["enrichment", "metadata"]], generateEmbeddings=False)
+        mock_llml.acombine_metadata_tags.assert_called_once_with([["webpage", "content"], ["enrichment", "metadata"]], generateEmbeddings=False)
 
 
 @pytest.mark.asyncio
@@ -106,11 +107,11 @@ async def test_mine_handles_empty_tags_and_vectors():
         )]
     )
 
-    mock_llml = MagicMock()
+    mock_llml = MagicMock(spec=LlmLib)
     mock_result = Mock()
     mock_result.tags = []
-    mock_llml.website_to_metadata = Mock(return_value=mock_result)
-    mock_llml.combine_metadata_tags = Mock(return_value=None)
+    mock_llml.awebsite_to_metadata = AsyncMock(return_value=mock_result)
+    mock_llml.acombine_metadata_tags = AsyncMock(return_value=None)
 
     with patch("conversationgenome.task.WebpageMetadataGenerationTask.get_llm_backend", return_value=mock_llml):
         result = await task.mine()
@@ -151,18 +152,18 @@ async def test_mine_processes_only_webpage_content():
         )]
     )
 
-    mock_llml = MagicMock()
+    mock_llml = MagicMock(spec=LlmLib)
     
     # Mock website_to_metadata
     website_result = Mock()
     website_result.tags = ["artificial", "intelligence", "webpage"]
-    mock_llml.website_to_metadata = Mock(return_value=website_result)
+    mock_llml.awebsite_to_metadata = AsyncMock(return_value=website_result)
     
     # Mock combine_metadata_tags
     combined_result = Mock()
     combined_result.tags = ["artificial", "intelligence", "webpage"]
     combined_result.vectors = {"artificial": [0.1], "intelligence": [0.2], "webpage": [0.3]}
-    mock_llml.combine_metadata_tags = Mock(return_value=combined_result)
+    mock_llml.acombine_metadata_tags = AsyncMock(return_value=combined_result)
 
     with patch("conversationgenome.task.WebpageMetadataGenerationTask.get_llm_backend", return_value=mock_llml):
         result = await task.mine()
@@ -171,9 +172,9 @@ async def test_mine_processes_only_webpage_content():
         assert result["vectors"] == {"artificial": [0.1], "intelligence": [0.2], "webpage": [0.3]}
         
         # Verify only website_to_metadata was called
-        mock_llml.website_to_metadata.assert_called_once_with("This is webpage content about AI.", generateEmbeddings=False, input_categories=None)
-        mock_llml.enrichment_to_metadata.assert_not_called()
-        mock_llml.combine_metadata_tags.assert_called_once_with([["artificial", "intelligence", "webpage"]], generateEmbeddings=False)
+        mock_llml.awebsite_to_metadata.assert_called_once_with("This is webpage content about AI.", generateEmbeddings=False, input_categories=None)
+        mock_llml.aenrichment_to_metadata.assert_not_called()
+        mock_llml.acombine_metadata_tags.assert_called_once_with([["artificial", "intelligence", "webpage"]], generateEmbeddings=False)
 
 
 @pytest.mark.asyncio
@@ -212,25 +213,25 @@ async def test_mine_processes_webpage_and_enrichment():
         )]
     )
 
-    mock_llml = MagicMock()
+    mock_llml = MagicMock(spec=LlmLib)
     
     # Mock website_to_metadata for main content
     website_result = Mock()
     website_result.tags = ["machine", "learning"]
-    mock_llml.website_to_metadata = Mock(return_value=website_result)
+    mock_llml.awebsite_to_metadata = AsyncMock(return_value=website_result)
     
     # Mock enrichment_to_metadata for both enrichment items
     enrichment_result1 = Mock()
     enrichment_result1.tags = ["ai", "research"]
     enrichment_result2 = Mock()
     enrichment_result2.tags = ["tech", "news"]
-    mock_llml.enrichment_to_metadata = Mock(side_effect=[enrichment_result1, enrichment_result2])
+    mock_llml.aenrichment_to_metadata = AsyncMock(side_effect=[enrichment_result1, enrichment_result2])
     
     # Mock combine_metadata_tags
     combined_result = Mock()
     combined_result.tags = ["machine", "learning", "ai", "research", "tech", "news"]
     combined_result.vectors = {"machine": [0.1], "learning": [0.2], "ai": [0.3], "research": [0.4], "tech": [0.5], "news": [0.6]}
-    mock_llml.combine_metadata_tags = Mock(return_value=combined_result)
+    mock_llml.acombine_metadata_tags = AsyncMock(return_value=combined_result)
 
     with patch("conversationgenome.task.WebpageMetadataGenerationTask.get_llm_backend", return_value=mock_llml):
         result = await task.mine()
@@ -239,16 +240,16 @@ async def test_mine_processes_webpage_and_enrichment():
         assert result["vectors"] == {"machine": [0.1], "learning": [0.2], "ai": [0.3], "research": [0.4], "tech": [0.5], "news": [0.6]}
         
         # Verify website_to_metadata was called once for main content
-        mock_llml.website_to_metadata.assert_called_once_with("Main webpage about machine learning.", generateEmbeddings=False, input_categories=None)
+        mock_llml.awebsite_to_metadata.assert_called_once_with("Main webpage about machine learning.", generateEmbeddings=False, input_categories=None)
         
         # Verify enrichment_to_metadata was called twice
-        assert mock_llml.enrichment_to_metadata.call_count == 2
-        mock_llml.enrichment_to_metadata.assert_any_call("AI Research Breakthrough\nNew developments in ML research.", generateEmbeddings=False, input_categories=None)
-        mock_llml.enrichment_to_metadata.assert_any_call("Tech News Update\nLatest AI advancements announced.", generateEmbeddings=False, input_categories=None)
+        assert mock_llml.aenrichment_to_metadata.call_count == 2
+        mock_llml.aenrichment_to_metadata.assert_any_call("AI Research Breakthrough\nNew developments in ML research.", generateEmbeddings=False, input_categories=None)
+        mock_llml.aenrichment_to_metadata.assert_any_call("Tech News Update\nLatest AI advancements announced.", generateEmbeddings=False, input_categories=None)
         
         # Verify combine_metadata_tags was called with all tag sets
         expected_tag_sets = [["machine", "learning"], ["ai", "research"], ["tech", "news"]]
-        mock_llml.combine_metadata_tags.assert_called_once_with(expected_tag_sets, generateEmbeddings=False)
+        mock_llml.acombine_metadata_tags.assert_called_once_with(expected_tag_sets, generateEmbeddings=False)
 
 
 @pytest.mark.asyncio
@@ -286,21 +287,21 @@ async def test_mine_handles_llm_method_failures():
         )]
     )
 
-    mock_llml = MagicMock()
+    mock_llml = MagicMock(spec=LlmLib)
     
     # Mock website_to_metadata to return None (failure)
-    mock_llml.website_to_metadata = Mock(return_value=None)
+    mock_llml.awebsite_to_metadata = AsyncMock(return_value=None)
     
     # Mock enrichment_to_metadata to return a result
     enrichment_result = Mock()
     enrichment_result.tags = ["enrichment", "tags"]
-    mock_llml.enrichment_to_metadata = Mock(return_value=enrichment_result)
+    mock_llml.aenrichment_to_metadata = AsyncMock(return_value=enrichment_result)
     
     # Mock combine_metadata_tags
     combined_result = Mock()
     combined_result.tags = ["enrichment", "tags"]
     combined_result.vectors = {"enrichment": [0.1], "tags": [0.2]}
-    mock_llml.combine_metadata_tags = Mock(return_value=combined_result)
+    mock_llml.acombine_metadata_tags = AsyncMock(return_value=combined_result)
 
     with patch("conversationgenome.task.WebpageMetadataGenerationTask.get_llm_backend", return_value=mock_llml):
         result = await task.mine()
@@ -310,9 +311,9 @@ async def test_mine_handles_llm_method_failures():
         assert result["vectors"] == {"enrichment": [0.1], "tags": [0.2]}
         
         # Verify methods were called
-        mock_llml.website_to_metadata.assert_called_once()
-        mock_llml.enrichment_to_metadata.assert_called_once_with("Enrichment content.", generateEmbeddings=False, input_categories=None)
-        mock_llml.combine_metadata_tags.assert_called_once_with([["enrichment", "tags"]], generateEmbeddings=False)
+        mock_llml.awebsite_to_metadata.assert_called_once()
+        mock_llml.aenrichment_to_metadata.assert_called_once_with("Enrichment content.", generateEmbeddings=False, input_categories=None)
+        mock_llml.acombine_metadata_tags.assert_called_once_with([["enrichment", "tags"]], generateEmbeddings=False)
 
 
 @pytest.mark.asyncio
@@ -346,9 +347,9 @@ async def test_mine_handles_none_result():
         )]
     )
 
-    mock_llml = MagicMock()
-    mock_llml.website_to_metadata = Mock(return_value=None)
-    mock_llml.combine_metadata_tags = Mock(return_value=None)
+    mock_llml = MagicMock(spec=LlmLib)
+    mock_llml.awebsite_to_metadata = AsyncMock(return_value=None)
+    mock_llml.acombine_metadata_tags = AsyncMock(return_value=None)
 
     with patch("conversationgenome.task.WebpageMetadataGenerationTask.get_llm_backend", return_value=mock_llml):
         result = await task.mine()
@@ -388,8 +389,8 @@ async def test_mine_handles_exception_from_llm():
         )]
     )
 
-    mock_llml = MagicMock()
-    mock_llml.website_to_metadata = Mock(side_effect=Exception("LLM Error"))
+    mock_llml = MagicMock(spec=LlmLib)
+    mock_llml.awebsite_to_metadata = AsyncMock(side_effect=Exception("LLM Error"))
 
     with patch("conversationgenome.task.WebpageMetadataGenerationTask.get_llm_backend", return_value=mock_llml):
         with pytest.raises(Exception, match="LLM Error"):
@@ -427,7 +428,7 @@ async def test_mine_handles_empty_window():
         )]
     )
 
-    mock_llml = MagicMock()
+    mock_llml = MagicMock(spec=LlmLib)
 
     with patch("conversationgenome.task.WebpageMetadataGenerationTask.get_llm_backend", return_value=mock_llml):
         result = await task.mine()
@@ -435,9 +436,9 @@ async def test_mine_handles_empty_window():
         assert result["tags"] == []
         assert result["vectors"] is None
         # Empty window should not call any LLM methods
-        mock_llml.website_to_metadata.assert_not_called()
-        mock_llml.enrichment_to_metadata.assert_not_called()
-        mock_llml.combine_metadata_tags.assert_not_called()
+        mock_llml.awebsite_to_metadata.assert_not_called()
+        mock_llml.aenrichment_to_metadata.assert_not_called()
+        mock_llml.acombine_metadata_tags.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -475,23 +476,23 @@ async def test_mine_constructs_conversation_correctly():
         )]
     )
 
-    mock_llml = MagicMock()
+    mock_llml = MagicMock(spec=LlmLib)
     
     # Mock website_to_metadata for first line
     website_result = Mock()
     website_result.tags = ["webpage"]
-    mock_llml.website_to_metadata = Mock(return_value=website_result)
+    mock_llml.awebsite_to_metadata = AsyncMock(return_value=website_result)
     
     # Mock enrichment_to_metadata for second and third lines
     enrichment_result = Mock()
     enrichment_result.tags = ["content"]
-    mock_llml.enrichment_to_metadata = Mock(return_value=enrichment_result)
+    mock_llml.aenrichment_to_metadata = AsyncMock(return_value=enrichment_result)
     
     # Mock combine_metadata_tags
     combined_result = Mock()
     combined_result.tags = ["webpage", "content"]
     combined_result.vectors = {"webpage": [0.1], "content": [0.2]}
-    mock_llml.combine_metadata_tags = Mock(return_value=combined_result)
+    mock_llml.acombine_metadata_tags = AsyncMock(return_value=combined_result)
 
     with patch("conversationgenome.task.WebpageMetadataGenerationTask.get_llm_backend", return_value=mock_llml):
         result = await task.mine()
@@ -500,13 +501,87 @@ async def test_mine_constructs_conversation_correctly():
         assert result["vectors"] == {"webpage": [0.1], "content": [0.2]}
         
         # Verify website_to_metadata was called with the first line
-        mock_llml.website_to_metadata.assert_called_once_with("First line of webpage.", generateEmbeddings=False, input_categories=None)
+        mock_llml.awebsite_to_metadata.assert_called_once_with("First line of webpage.", generateEmbeddings=False, input_categories=None)
         
         # Verify enrichment_to_metadata was called for the other two lines
-        assert mock_llml.enrichment_to_metadata.call_count == 2
-        mock_llml.enrichment_to_metadata.assert_any_call("Second line with content.", generateEmbeddings=False, input_categories=None)
-        mock_llml.enrichment_to_metadata.assert_any_call("Third line here.", generateEmbeddings=False, input_categories=None)
+        assert mock_llml.aenrichment_to_metadata.call_count == 2
+        mock_llml.aenrichment_to_metadata.assert_any_call("Second line with content.", generateEmbeddings=False, input_categories=None)
+        mock_llml.aenrichment_to_metadata.assert_any_call("Third line here.", generateEmbeddings=False, input_categories=None)
         
         # Verify combine_metadata_tags was called with all tag sets
         expected_tag_sets = [["webpage"], ["content"], ["content"]]
-        mock_llml.combine_metadata_tags.assert_called_once_with(expected_tag_sets, generateEmbeddings=False)
\ No newline at end of file
+        mock_llml.acombine_metadata_tags.assert_called_once_with(expected_tag_sets, generateEmbeddings=False)
+
+@pytest.mark.asyncio
+async def test_mine_returns_uncombined_line_tags_when_the_deadline_is_close(monkeypatch):
+    import asyncio
+
+    from conversationgenome.utils.Deadline import Deadline
+
+    monkeypatch.setenv("MINER_COMBINE_RESERVE", "0.1")
+    task = WebpageMetadataGenerationTask(
+        mode="local",
+        guid="test-guid",
+        type="webpage_metadata_generation",
+        input=WebpageMarkdownTaskInput(
+            guid="input-guid",
+            input_type="webpage_markdown",
+            data=WebpageMarkdownTaskInputData(window=[(0, "Webpage."), (1, "Enrichment."), (2, "Slow enrichment.")]),
+        ),
+    )
+
+    async def enrichment_to_metadata(content, generateEmbeddings=False, input_categories=None):
+        await asyncio.sleep(5 if content.startswith("Slow") else 0)
+        return Mock(tags=["enrichment", "webpage"])
+
+    async def slow_combine(all_tags, generateEmbeddings=False):
+        await asyncio.sleep(5)
+
+    mock_llml = MagicMock(spec=LlmLib)
+    mock_llml.awebsite_to_metadata = AsyncMock(return_value=Mock(tags=["webpage", "content"]))
+    mock_llml.aenrichment_to_metadata = enrichment_to_metadata
+    mock_llml.acombine_metadata_tags = slow_combine
+
+    deadline = Deadline.from_timeout(0.3)
+    with patch("conversationgenome.task.WebpageMetadataGenerationTask.get_llm_backend", return_value=mock_llml):
+        started_at = asyncio.get_running_loop().time()
+        result = await task.mine(deadline=deadline)
+
+    assert asyncio.get_running_loop().time() - started_at < 1
+    assert result == {"tags": ["webpage", "content", "enrichment"], "vectors": None}
+    assert deadline.partial
+
+
+@pytest.mark.asyncio
+async def test_mine_returns_no_tags_when_every_line_times_out(monkeypatch):
+    import asyncio
+
+    from conversationgenome.utils.Deadline import Deadline
+
+    monkeypatch.setenv("MINER_COMBINE_RESERVE", "0.1")
+    task = WebpageMetadataGenerationTask(
+        mode="local",
+        guid="test-guid",
+        type="webpage_metadata_generation",
+        input=WebpageMarkdownTaskInput(
+            guid="input-guid",
+            input_type="webpage_markdown",
+            data=WebpageMarkdownTaskInputData(window=[(0, "Webpage."), (1, "Enrichment.")]),
+        ),
+    )
+
+    async def slow_to_metadata(content, generateEmbeddings=False, input_categories=None):
+        await asyncio.sleep(5)
+
+    mock_llml = MagicMock(spec=LlmLib)
+    mock_llml.awebsite_to_metadata = slow_to_metadata
+    mock_llml.aenrichment_to_metadata = slow_to_metadata
+    mock_llml.acombine_metadata_tags = AsyncMock()
+
+    deadline = Deadline.from_timeout(0.3)
+    with patch("conversationgenome.task.WebpageMetadataGenerationTask.get_llm_backend", return_value=mock_llml):
+        result = await task.mine(deadline=deadline)
+
+    assert result == {"tags": [], "vectors": None}
+    assert deadline.partial
+    mock_llml.acombine_metadata_tags.assert_not_called()
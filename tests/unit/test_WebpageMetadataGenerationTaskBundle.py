@@ -1,6 +1,7 @@
 from unittest.mock import AsyncMock, Mock, patch
 import pytest
 from conversationgenome.task_bundle.WebpageMetadataGenerationTaskBundle import WebpageMetadataGenerationTaskBundle
+from conversationgenome.llm.LlmLib import LlmLib
 from tests.mocks.DummyData import DummyData
 
 
@@ -67,8 +68,8 @@ async def test_format_results_validates_and_embeds_tags():
     bundle = DummyData.setup_webpage_metadata_generation_task_bundle()
     miner_result = {"tags": ["tag1", "tag2"]}
     with patch('conversationgenome.task_bundle.WebpageMetadataGenerationTaskBundle.get_llm_backend') as mock_llm_factory:
-        mock_llm = Mock()
-        mock_llm.validate_tag_set.return_value = ["tag1", "tag2"]
+        mock_llm = Mock(spec=LlmLib)
+        mock_llm.avalidate_tag_set.return_value = ["tag1", "tag2"]
         mock_llm_factory.return_value = mock_llm
         with patch.object(bundle, '_get_vector_embeddings_set', AsyncMock(return_value={"tag1": [0.1], "tag2": [0.2]})):
             result = await bundle.format_results(miner_result)
@@ -122,19 +123,19 @@ async def test_generate_metadata_calls_llm_and_sets_metadata():
     bundle.input.guid = DummyData.guid()
     
     with patch('conversationgenome.task_bundle.WebpageMetadataGenerationTaskBundle.get_llm_backend') as mock_llm_factory:
-        mock_llm = Mock()
+        mock_llm = Mock(spec=LlmLib)
         
         # Mock website_to_metadata
         website_result = Mock()
         website_result.tags = ["tag1", "tag2"]
-        mock_llm.website_to_metadata.return_value = website_result
+        mock_llm.awebsite_to_metadata.return_value = website_result
         
         # Mock combine_metadata_tags
         combine_result = Mock()
         combine_result.success = True
         combine_result.tags = ["tag1", "tag2"]
         combine_result.vectors = {"tag1": {"vectors": [0.1]}}
-        mock_llm.combine_metadata_tags.return_value = combine_result
+        mock_llm.acombine_metadata_tags.return_value = combine_result
         
         mock_llm_factory.return_value = mock_llm
         
@@ -144,10 +145,10 @@ async def test_generate_metadata_calls_llm_and_sets_metadata():
         assert bundle.input.metadata.vectors == {"tag1": {"vectors": [0.1]}}
         
         # Verify website_to_metadata was called
-        mock_llm.website_to_metadata.assert_called_once_with("Main webpage content", input_categories=None)
+        mock_llm.awebsite_to_metadata.assert_called_once_with("Main webpage content", input_categories=None)
         
         # Verify combine_metadata_tags was called
-        mock_llm.combine_metadata_tags.assert_called_once_with([["tag1", "tag2"]], generateEmbeddings=True)
+        mock_llm.acombine_metadata_tags.assert_called_once_with([["tag1", "tag2"]], generateEmbeddings=True)
 
 
 @pytest.mark.asyncio
@@ -157,12 +158,12 @@ async def test_generate_metadata_handles_failure():
     bundle.input.data.lines = [(0, '{"website_markdown": "Main webpage content", "enrichment": null}')]
     bundle.input.metadata = None  # Clear existing metadata
     with patch('conversationgenome.task_bundle.WebpageMetadataGenerationTaskBundle.get_llm_backend') as mock_llm_factory:
-        mock_llm = Mock()
+        mock_llm = Mock(spec=LlmLib)
         
         # Mock combine_metadata_tags to return failure
         combine_result = Mock()
         combine_result.success = False
-        mock_llm.combine_metadata_tags.return_value = combine_result
+        mock_llm.acombine_metadata_tags.return_value = combine_result
         
         mock_llm_factory.return_value = mock_llm
         
@@ -174,8 +175,8 @@ async def test_generate_metadata_handles_failure():
 @pytest.mark.asyncio
 async def test_get_vector_embeddings_set_calls_llm():
     bundle = DummyData.setup_webpage_metadata_generation_task_bundle()
-    mock_llm = Mock()
-    mock_llm.get_vector_embeddings_set.return_value = {"tag": [0.1]}
+    mock_llm = Mock(spec=LlmLib)
+    mock_llm.aget_vector_embeddings_set.return_value = {"tag": [0.1]}
     result = await bundle._get_vector_embeddings_set(llml=mock_llm, tags=["tag"])
     assert result == {"tag": [0.1]}
 
@@ -187,37 +188,37 @@ async def test_generate_metadata_with_enrichment():
     bundle.input.data.lines = [(0, '{"website_markdown": "Main webpage about AI", "enrichment": {"search_results": {"query1": [{"title": "AI News", "snippet": "Latest AI developments"}]}}}')]
     
     with patch('conversationgenome.task_bundle.WebpageMetadataGenerationTaskBundle.get_llm_backend') as mock_llm_factory:
-        mock_llm = Mock()
+        mock_llm = Mock(spec=LlmLib)
         
         # Mock website_to_metadata
         website_result = Mock()
         website_result.tags = ["artificial intelligence"]
-        mock_llm.website_to_metadata.return_value = website_result
+        mock_llm.awebsite_to_metadata.return_value = website_result
         
         # Mock enrichment_to_metadata
         enrichment_result = Mock()
         enrichment_result.tags = ["machine learning"]
-        mock_llm.enrichment_to_metadata.return_value = enrichment_result
+        mock_llm.aenrichment_to_metadata.return_value = enrichment_result
         
         # Mock combine_metadata_tags
         combine_result = Mock()
         combine_result.success = True
         combine_result.tags = ["artificial intelligence", "machine learning"]
         combine_result.vectors = {"artificial intelligence": {"vectors": [0.1]}}
-        mock_llm.combine_metadata_tags.return_value = combine_result
+        mock_llm.acombine_metadata_tags.return_value = combine_result
         
         mock_llm_factory.return_value = mock_llm
         
         await bundle._generate_metadata()
         
         # Verify website_to_metadata was called for main content
-        mock_llm.website_to_metadata.assert_called_with("Main webpage about AI", input_categories=None)
+        mock_llm.awebsite_to_metadata.assert_called_with("Main webpage about AI", input_categories=None)
         
         # Verify enrichment_to_metadata was called for enrichment content
-        mock_llm.enrichment_to_metadata.assert_called_with("AI News\nLatest AI developments", input_categories=None)
+        mock_llm.aenrichment_to_metadata.assert_called_with("AI News\nLatest AI developments", input_categories=None)
         
         # Verify combine_metadata_tags was called with both tag sets
-        mock_llm.combine_metadata_tags.assert_called_with([["artificial intelligence"], ["machine learning"]], generateEmbeddings=True)
+        mock_llm.acombine_metadata_tags.assert_called_with([["artificial intelligence"], ["machine learning"]], generateEmbeddings=True)
         
         # Verify input data lines were updated
         assert len(bundle.input.data.lines) == 2
@@ -225,6 +226,36 @@ async def test_generate_metadata_with_enrichment():
         assert bundle.input.data.lines[1] == (0, "AI News\nLatest AI developments")
 
 
+@pytest.mark.asyncio
+async def test_generate_metadata_runs_enrichment_calls_concurrently():
+    import asyncio
+
+    bundle = DummyData.webpage_metadata_generation_task_bundle()
+    bundle.input.data.lines = [(0, '{"website_markdown": "Main webpage about AI", "enrichment": {"search_results": {"query1": [{"title": "AI News", "snippet": "Latest AI developments"}], "query2": [{"title": "ML News", "snippet": "Latest ML developments"}]}}}')]
+    running = 0
+    max_running = 0
+
+    async def metadata(text, input_categories=None):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return Mock(tags=[text.split()[0].lower()])
+
+    with patch('conversationgenome.task_bundle.WebpageMetadataGenerationTaskBundle.get_llm_backend') as mock_llm_factory:
+        mock_llm = Mock(spec=LlmLib)
+        mock_llm.awebsite_to_metadata.side_effect = metadata
+        mock_llm.aenrichment_to_metadata.side_effect = metadata
+        mock_llm.acombine_metadata_tags.return_value = Mock(success=True, tags=["main"], vectors={})
+        mock_llm_factory.return_value = mock_llm
+
+        await bundle._generate_metadata()
+
+    assert max_running == 3
+    mock_llm.acombine_metadata_tags.assert_called_with([["main"], ["ai"], ["ml"]], generateEmbeddings=True)
+
+
 @pytest.mark.asyncio
 async def test_generate_metadata_without_enrichment():
     bundle = DummyData.webpage_metadata_generation_task_bundle()
@@ -232,32 +263,32 @@ async def test_generate_metadata_without_enrichment():
     bundle.input.data.lines = [(0, '{"website_markdown": "Main webpage about AI", "enrichment": null}')]
     
     with patch('conversationgenome.task_bundle.WebpageMetadataGenerationTaskBundle.get_llm_backend') as mock_llm_factory:
-        mock_llm = Mock()
+        mock_llm = Mock(spec=LlmLib)
         
         # Mock website_to_metadata
         website_result = Mock()
         website_result.tags = ["artificial intelligence"]
-        mock_llm.website_to_metadata.return_value = website_result
+        mock_llm.awebsite_to_metadata.return_value = website_result
         
         # Mock combine_metadata_tags
         combine_result = Mock()
         combine_result.success = True
         combine_result.tags = ["artificial intelligence"]
         combine_result.vectors = {"artificial intelligence": {"vectors": [0.1]}}
-        mock_llm.combine_metadata_tags.return_value = combine_result
+        mock_llm.acombine_metadata_tags.return_value = combine_result
         
         mock_llm_factory.return_value = mock_llm
         
         await bundle._generate_metadata()
         
         # Verify website_to_metadata was called
-        mock_llm.website_to_metadata.assert_called_with("Main webpage about AI", input_categories=None)
+        mock_llm.awebsite_to_metadata.assert_called_with("Main webpage about AI", input_categories=None)
         
         # Verify enrichment_to_metadata was not called
-        mock_llm.enrichment_to_metadata.assert_not_called()
+        mock_llm.aenrichment_to_metadata.assert_not_called()
         
         # Verify combine_metadata_tags was called with only website tags
-        mock_llm.combine_metadata_tags.assert_called_with([["artificial intelligence"]], generateEmbeddings=True)
+        mock_llm.acombine_metadata_tags.assert_called_with([["artificial intelligence"]], generateEmbeddings=True)
         
         # Verify input data lines contain only main content
         assert len(bundle.input.data.lines) == 1
@@ -278,24 +309,24 @@ async def test_generate_metadata_randomly_selects_enrichment_results():
         mock_randint.return_value = 2
         mock_sample.return_value = [{"title": "AI News 1", "snippet": "Snippet 1"}, {"title": "AI News 2", "snippet": "Snippet 2"}]
         
-        mock_llm = Mock()
+        mock_llm = Mock(spec=LlmLib)
         
         # Mock website_to_metadata
         website_result = Mock()
         website_result.tags = ["artificial intelligence"]
-        mock_llm.website_to_metadata.return_value = website_result
+        mock_llm.awebsite_to_metadata.return_value = website_result
         
         # Mock enrichment_to_metadata
         enrichment_result = Mock()
         enrichment_result.tags = ["machine learning"]
-        mock_llm.enrichment_to_metadata.return_value = enrichment_result
+        mock_llm.aenrichment_to_metadata.return_value = enrichment_result
         
         # Mock combine_metadata_tags
         combine_result = Mock()
         combine_result.success = True
         combine_result.tags = ["artificial intelligence", "machine learning"]
         combine_result.vectors = {"artificial intelligence": {"vectors": [0.1]}}
-        mock_llm.combine_metadata_tags.return_value = combine_result
+        mock_llm.acombine_metadata_tags.return_value = combine_result
         
         mock_llm_factory.return_value = mock_llm
         
@@ -315,12 +346,12 @@ async def test_generate_metadata_handles_llm_failure():
     bundle.input.metadata = None  # Clear existing metadata
     
     with patch('conversationgenome.task_bundle.WebpageMetadataGenerationTaskBundle.get_llm_backend') as mock_llm_factory:
-        mock_llm = Mock()
+        mock_llm = Mock(spec=LlmLib)
         
         # Mock combine_metadata_tags to return failure
         combine_result = Mock()
         combine_result.success = False
-        mock_llm.combine_metadata_tags.return_value = combine_result
+        mock_llm.acombine_metadata_tags.return_value = combine_result
         
         mock_llm_factory.return_value = mock_llm
         
@@ -337,10 +368,10 @@ async def test_generate_metadata_handles_no_result():
     bundle.input.metadata = None  # Clear existing metadata
     
     with patch('conversationgenome.task_bundle.WebpageMetadataGenerationTaskBundle.get_llm_backend') as mock_llm_factory:
-        mock_llm = Mock()
+        mock_llm = Mock(spec=LlmLib)
         
         # Mock combine_metadata_tags to return None
-        mock_llm.combine_metadata_tags.return_value = None
+        mock_llm.acombine_metadata_tags.return_value = None
         
         mock_llm_factory.return_value = mock_llm
         